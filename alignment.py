@@ -0,0 +1,130 @@
+"""Mixed-frequency alignment: monthly / quarterly macro series on the trading calendar.
+
+Each observation becomes available on a known day: the last day of its
+period plus a publication lag in calendar days (a March CPI print with a
+14-day lag shows from 14 Apr). Nothing is available before its period has
+ended, whatever its date says. The convention only sets how an observation is
+labelled (``what="obs"`` and ``releases``):
+
+* ``end``: the last day of its period;
+* ``start``: its first day;
+* ``obs``: the date as given, unchanged.
+
+Frequencies are ``D`` (no anchoring), ``M``, ``Q`` and ``Y``. On a trading day
+a series shows its most recent available observation. The value is dropped
+(NaN) once it is more than ``limit`` trading days past the day it first
+appeared.
+
+Every series goes through one pass. All observations are flattened into
+(series, available day) keys, and every (series, trading day) pair is found
+with one ``np.searchsorted``. This replaces a ``resample`` / ``merge_asof``
+per series. When real release dates are known, ``vintage.VintageStore.panel``
+gives the same kind of panel from them.
+"""
+import numpy as np
+import pandas as pd
+
+MONTHS = {"M": 1, "Q": 3, "Y": 12}
+CONVENTIONS = ("end", "start", "obs")
+
+
+def _per_series(value, names: list[str], default) -> list:
+    """Broadcast a scalar or ``{series: value}`` mapping over ``names``."""
+    if isinstance(value, dict):
+        return [value.get(n, default) for n in names]
+    return [value] * len(names)
+
+
+def anchor(days: np.ndarray, freq: str, convention: str) -> np.ndarray:
+    """datetime64[D] period labels (``end`` / ``start`` / ``obs``) of observation dates."""
+    days = np.asarray(days, "datetime64[D]")
+    if convention == "obs" or freq == "D":
+        return days
+    if freq not in MONTHS:
+        raise ValueError(f"unknown frequency: {freq}")
+    if convention not in CONVENTIONS:
+        raise ValueError(f"unknown convention: {convention}")
+    months = MONTHS[freq]
+    m = days.astype("datetime64[M]").astype(np.int64)
+    first = m - m % months                   # epoch month (Jan 1970) starts every quarter / year
+    if convention == "start":
+        return first.astype("datetime64[M]").astype("datetime64[D]")
+    return (first + months).astype("datetime64[M]").astype("datetime64[D]") - np.timedelta64(1, "D")
+
+
+def _flatten(series: dict, freq, lag, convention) -> tuple[np.ndarray, ...]:
+    """(series code, obs label, available day, value) of every non-NaN observation, series-major."""
+    names = list(series)
+    if not names:
+        return (np.empty(0, np.int64),) * 3 + (np.empty(0),)
+    if isinstance(series, pd.DataFrame):
+        v = series.to_numpy(float).T
+        ok = np.isfinite(v)
+        code, row = np.nonzero(ok)
+        obs = series.index.to_numpy("datetime64[D]")[row]
+        value = v[ok]
+    else:
+        parts = [s.dropna() for s in series.values()]
+        code = np.repeat(np.arange(len(parts)), [len(p) for p in parts])
+        obs = np.concatenate([p.index.to_numpy("datetime64[D]") for p in parts])
+        value = np.concatenate([p.to_numpy(float) for p in parts])
+    freqs = np.array(_per_series(freq, names, "M"), object)
+    convs = np.array(_per_series(convention, names, "end"), object)
+    lags = np.array(_per_series(lag, names, 0), np.int64)
+    avail, label = obs.copy(), obs.copy()
+    for f, c in {(f, c) for f, c in zip(freqs, convs)}:         # one pass per distinct convention
+        rows = ((freqs == f) & (convs == c))[code]
+        avail[rows] = anchor(obs[rows], f, "end")               # available only once the period is over
+        label[rows] = anchor(obs[rows], f, c)
+    avail = avail.astype(np.int64) + lags[code]
+    return code, label.astype(np.int64), avail, value
+
+
+def releases(data, freq="M", lag=0, convention="end") -> pd.DataFrame:
+    """Long table of every observation and the day it became available."""
+    series = data if isinstance(data, pd.DataFrame) else dict(data)
+    code, obs, avail, value = _flatten(series, freq, lag, convention)
+    return pd.DataFrame({
+        "series": np.asarray(list(series), object)[code] if len(code) else [],
+        "obs": obs.astype("datetime64[D]"),
+        "available": avail.astype("datetime64[D]"),
+        "value": value,
+    })
+
+
+def align(data, calendar, freq="M", lag=0, limit=None, convention="end", what: str = "value") -> pd.DataFrame:
+    """(trading days x series) panel of the latest available observation of each series.
+
+    ``data`` is a DataFrame indexed by observation date, or ``{name: Series}``.
+    ``freq`` / ``lag`` (calendar days) / ``limit`` (trading days, None = no limit) /
+    ``convention`` are scalars or ``{series: value}`` mappings. ``what`` is
+    ``value`` or ``obs`` (the label of the observation being shown).
+    """
+    series = data if isinstance(data, pd.DataFrame) else dict(data)
+    names = list(series)
+    cal = pd.DatetimeIndex(pd.to_datetime(calendar))
+    days = cal.to_numpy("datetime64[D]").astype(np.int64)
+    code, obs, avail, value = _flatten(series, freq, lag, convention)
+
+    # (series, available, obs) order: the last key <= (series, day) is the newest print
+    order = np.lexsort((obs, avail, code))
+    code, avail, obs, value = code[order], avail[order], obs[order], value[order]
+    key = (code << 32) | (avail + (1 << 31))
+
+    q = ((np.arange(len(names), dtype=np.int64)[:, None] << 32) | (days[None, :] + (1 << 31))).ravel()
+    pos = np.searchsorted(key, q, "right") - 1
+    hit = pos >= 0
+    hit[hit] = code[pos[hit]] == (q[hit] >> 32)
+
+    limits = np.array([np.inf if v is None else v for v in _per_series(limit, names, None)], float)
+    if np.isfinite(limits).any():
+        first = np.searchsorted(days, avail, "left")            # first trading day showing each print
+        age = np.tile(np.arange(len(days)), len(names)) - first[np.where(hit, pos, 0)]
+        hit &= age <= np.repeat(limits, len(days))
+
+    safe = np.where(hit, pos, 0)
+    if what == "obs":
+        out = np.where(hit, obs[safe] if len(obs) else 0, np.iinfo(np.int64).min).astype("datetime64[D]")
+    else:
+        out = np.where(hit, value[safe] if len(value) else np.nan, np.nan)
+    return pd.DataFrame(out.reshape(len(names), len(days)).T, index=cal, columns=names)
@@ -0,0 +1,195 @@
+"""Historical analogs: the past days whose cross-asset snapshot looks most like today.
+
+Each trading day is embedded as one vector holding every asset's snapshot
+readings (MAD 20/50, Stoch %D, 63-day rolling CAGR; see ``percentiles``). The
+vectors are z-scored per feature with the history's mean and std, and a
+missing reading becomes 0; days missing more than half their readings are
+never returned as analogs. The matrix and its row norms are kept in float32
+and grow by a row per new day. A query computes squared distances as
+``|x|² + |q|² - 2·X q`` in blocks of ``BLOCK`` rows, keeping the k best from
+each block. Days within ``EXCLUDE`` of the query are skipped, because the
+last few weeks always look like today. Neighbouring days look alike too, so
+analogs are at least ``SPACING`` trading days apart (the nearest day of each
+stretch wins) and one episode gets one vote. The analogs' consensus quads
+(from the regime store) are combined with 1/distance weights into a vote for
+the quad the market is pricing in.
+
+30 years x 900 features is about 27 MB and a query takes a few milliseconds.
+"""
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import indicators
+import percentiles
+from datastore import MarketStore
+from paths import REGIMES, STORE
+
+K = 10
+BLOCK = 4096        # rows per distance block
+EXCLUDE = 63        # trading days before the query that can't be analogs
+SPACING = EXCLUDE   # minimum trading days between two analogs
+MIN_COVERAGE = 0.5  # share of features a day needs to be an analog (early rows are mostly NaN)
+
+
+@dataclass
+class Analogs:
+    asof: pd.Timestamp
+    dates: pd.DatetimeIndex
+    distance: np.ndarray
+    quad: np.ndarray            # consensus quad of each analog (NaN if unknown)
+    vote: pd.Series             # quad -> weighted share
+
+
+def knn(X: np.ndarray, norms: np.ndarray, q: np.ndarray, k: int, stop: int,
+        valid: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """Indices and distances of the ``k`` rows of ``X[:stop]`` nearest to ``q`` (blocked matmul)."""
+    best_i = np.empty(0, np.int64)
+    best_d = np.empty(0, np.float32)
+    qq = float(q @ q)
+    for lo in range(0, stop, BLOCK):
+        hi = min(lo + BLOCK, stop)
+        d = norms[lo:hi] + qq - 2 * (X[lo:hi] @ q)
+        if valid is not None:
+            d = np.where(valid[lo:hi], d, np.inf)
+        if len(d) > k:
+            keep = np.argpartition(d, k)[:k]
+            d, idx = d[keep], keep + lo
+        else:
+            idx = np.arange(lo, hi)
+        best_i = np.concatenate([best_i, idx])
+        best_d = np.concatenate([best_d, d])
+        if len(best_d) > k:
+            keep = np.argpartition(best_d, k)[:k]
+            best_i, best_d = best_i[keep], best_d[keep]
+    order = np.argsort(best_d, kind="stable")
+    order = order[np.isfinite(best_d[order])]
+    return best_i[order], np.sqrt(np.maximum(best_d[order], 0))
+
+
+def spaced(idx: np.ndarray, k: int, spacing: int) -> np.ndarray:
+    """Positions of the first ``k`` of ``idx`` (sorted by distance) at least ``spacing`` rows from each other."""
+    keep = []
+    for j, i in enumerate(idx):
+        if all(abs(i - idx[t]) >= spacing for t in keep):
+            keep.append(j)
+            if len(keep) == k:
+                break
+    return np.asarray(keep, np.int64)
+
+
+class Engine:
+    """Standardised daily feature matrix over the market store, extended as rows land."""
+
+    def __init__(self, market: MarketStore, regimes: MarketStore):
+        self.market = market
+        self.regimes = regimes
+        self.specs = percentiles.specs()
+        self.rows = 0
+        self.assets = 0
+        self.X = np.empty((0, 0), np.float32)
+        self.norms = np.empty(0, np.float32)
+        self.valid = np.empty(0, bool)
+        self.mu = self.sd = None
+        self._quads = (None, None)     # (regime store version, labels by day)
+        self._lock = threading.Lock()
+
+    def _embed(self, parts: dict[str, np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+        raw = np.hstack([p[:, :self.assets] for p in parts.values()])
+        z = (raw - self.mu) / self.sd
+        coverage = np.isfinite(raw).mean(axis=1)
+        return np.nan_to_num(z, nan=0.0, posinf=0.0, neginf=0.0).astype(np.float32), coverage >= MIN_COVERAGE
+
+    def refresh(self) -> bool:
+        """Embed rows committed since the last call; True if there were any."""
+        with self._lock:
+            self.market.refresh()
+            n = len(self.market)
+            if n == self.rows:
+                return False
+            if self.mu is None or len(self.market.tickers) != self.assets:
+                # first build, or new assets (the feature layout changes): start over
+                self.assets = len(self.market.tickers)
+                self.rows = 0
+                parts = percentiles.tail_values(self.market, self.specs, 0)
+                raw = np.hstack(list(parts.values()))
+                self.mu = np.nan_to_num(np.nanmean(raw, axis=0))
+                sd = np.nanstd(raw, axis=0)
+                self.sd = np.where(np.isfinite(sd) & (sd > 0), sd, 1.0)
+                self.X = np.empty((0, raw.shape[1]), np.float32)
+                self.norms = np.empty(0, np.float32)
+                self.valid = np.empty(0, bool)
+            else:
+                parts = percentiles.tail_values(self.market, self.specs, self.rows)
+            new, valid = self._embed(parts)
+            self.X = np.vstack([self.X, new])
+            self.valid = np.concatenate([self.valid, valid])
+            self.norms = np.concatenate([self.norms, np.einsum("ij,ij->i", new, new)])
+            self.rows = n
+            return True
+
+    def quads(self) -> pd.Series:
+        """Consensus quad per market day (NaN where the regime store has none)."""
+        self.regimes.refresh()
+        v = self.regimes.version
+        if self._quads[0] != v:
+            labels = indicators.quad_labels(self.regimes.frame("quad")) if len(self.regimes) else pd.Series(dtype=float)
+            self._quads = (v, labels)
+        return self._quads[1]
+
+    def query(self, row: int = -1, k: int = K, spacing: int = SPACING) -> Analogs | None:
+        """The ``k`` analogs of market day ``row`` (default: the latest), ``spacing`` days apart."""
+        self.refresh()
+        row = row % self.rows if self.rows else 0
+        stop = row - EXCLUDE
+        if stop < k:
+            return None
+        # each analog rules out fewer than 2 x spacing rows, so the greedy pick
+        # over this many nearest rows is the same as over all of them
+        idx, dist = knn(self.X, self.norms, self.X[row], k * (2 * max(spacing, 1) - 1), stop, self.valid)
+        keep = spaced(idx, k, spacing)
+        idx, dist = idx[keep], dist[keep]
+        if not len(idx):
+            return None
+        days = self.market.dates
+        quad = self.quads().reindex(days[idx]).to_numpy()
+        w = 1 / (dist + 1e-9)
+        ok = np.isfinite(quad)
+        vote = pd.Series({q: w[ok & (quad == q)].sum() for q in indicators.QUADS})
+        vote = vote / vote.sum() if vote.sum() else vote
+        return Analogs(days[row], days[idx], dist, quad, vote)
+
+
+def available() -> bool:
+    return (STORE / "dates.i4").exists() and (REGIMES / "dates.i4").exists()
+
+
+@st.cache_resource(show_spinner=False)
+def get_engine() -> Engine:
+    return Engine(MarketStore(STORE), MarketStore(REGIMES))
+
+
+def section():
+    """Dashboards expander: today's nearest historical analogs and their quad vote."""
+    if not available():
+        return
+    with st.expander("Historical analogs — which quad is the market pricing in?"):
+        a = get_engine().query()
+        if a is None:
+            st.caption("Not enough history yet.")
+            return
+        if not a.vote.sum():
+            st.caption("No regime labels for the analog dates.")
+            return
+        top = int(a.vote.idxmax())
+        st.markdown(f"As of **{a.asof:%Y-%m-%d}**, the {len(a.dates)} closest past snapshots vote "
+                    f"**Quad {top} ({indicators.QUAD_NAMES[top]})** with {a.vote[top]:.0%} of the weight.")
+        st.bar_chart(a.vote.rename(lambda q: f"Quad {q}"), height=180)
+        st.dataframe(pd.DataFrame({
+            "Date": a.dates.strftime("%Y-%m-%d"),
+            "Distance": a.distance.round(2),
+            "Quad": [f"Quad {int(q)}" if np.isfinite(q) else "—" for q in a.quad],
+        }), hide_index=True, width="stretch")
@@ -0,0 +1,301 @@
+"""Incremental rebuild of the dashboard artifacts.
+
+Each artifact records the hashes of the files it read, its parameters and the
+source of its recipe in ``assets/html/.build.json``; only artifacts whose key
+changed (or whose upstream artifact was rebuilt) are regenerated. Outputs are
+written to a temp file and renamed into place, so the app never reads a
+half-written chart.
+
+    python build.py                 # rebuild what is stale
+    python build.py --force         # rebuild everything
+    python build.py --jobs 8        # render stale artifacts in parallel
+    python build.py Snapshot_Stoch_D --dry-run
+
+Artifacts whose store is missing or empty (e.g. a fresh clone, where
+``data/store`` doesn't exist yet) are skipped and their committed outputs are
+left alone.
+"""
+import argparse
+import hashlib
+import inspect
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+import plotly.graph_objects as go
+
+import charts
+import figures
+import indicators
+from datastore import MarketStore, atomic_write_text
+from paths import APP_DIR, ASSETS, DATA, REGIMES, STORE
+
+HTML_DIR = ASSETS / "html"
+MANIFEST = HTML_DIR / ".build.json"
+QUAD_STATS = DATA / "quad_stats.csv"
+
+
+# ──────────────────────────────────────────────────────────────
+# INPUTS
+# ──────────────────────────────────────────────────────────────
+class Inputs:
+    """Lazily opened stores / frames shared by every recipe in one process."""
+
+    def __init__(self, store_root: Path = STORE, regimes_root: Path = REGIMES):
+        self.store_root = Path(store_root)
+        self.regimes_root = Path(regimes_root)
+        self._market = None
+        self._regimes = None
+        self._frames: dict[tuple, pd.DataFrame] = {}
+
+    @property
+    def market(self) -> MarketStore:
+        if self._market is None:
+            self._market = MarketStore(self.store_root)
+        return self._market
+
+    @property
+    def regimes(self) -> MarketStore:
+        if self._regimes is None:
+            self._regimes = MarketStore(self.regimes_root)
+        return self._regimes
+
+    def frame(self, field: str, last: int | None = None) -> pd.DataFrame:
+        """Market field as (dates x tickers); ``last`` reads only the trailing rows."""
+        key = (field, last)
+        if key not in self._frames:
+            days = self.market.dates
+            start = days[-last] if last and len(days) > last else None
+            self._frames[key] = self.market.frame(field, start=start)
+        return self._frames[key]
+
+    def votes(self) -> pd.DataFrame:
+        if ("votes",) not in self._frames:
+            self._frames[("votes",)] = self.regimes.frame("quad")
+        return self._frames[("votes",)]
+
+
+# ──────────────────────────────────────────────────────────────
+# RECIPES
+# ──────────────────────────────────────────────────────────────
+def _quad_stats(ctx: Inputs) -> pd.DataFrame:
+    quads = indicators.quad_labels(ctx.votes())
+    return indicators.quad_stats(ctx.frame("close"), quads, ctx.market.assets)
+
+
+def _quad_treemap(ctx: Inputs, quad: int, height: int) -> go.Figure:
+    return charts.quad_treemap(pd.read_csv(QUAD_STATS), quad, height=height)
+
+
+def _consensus(ctx: Inputs) -> go.Figure:
+    return charts.consensus_figure(indicators.quad_counts(ctx.votes()))
+
+
+def _snapshot(ctx: Inputs, indicator: str, title: str, colorbar: str, fmt: str,
+              tickformat: str | None = None, lookback: int = 260, **kw) -> go.Figure:
+    close = ctx.frame("close", last=lookback)
+    hl = {f: ctx.frame(f, last=lookback) for f in ("high", "low")} if indicator == "stoch_d" else {}
+    values = indicators.compute(indicator, close, **hl, **kw)
+    asof = values.index[-1].strftime("%Y-%m-%d")
+    return charts.snapshot_treemap(values.iloc[-1], ctx.market.assets, f"{title} — {asof}", colorbar, fmt, tickformat)
+
+
+# ──────────────────────────────────────────────────────────────
+# GRAPH
+# ──────────────────────────────────────────────────────────────
+@dataclass
+class Artifact:
+    name: str
+    output: Path
+    recipe: Callable
+    params: dict = field(default_factory=dict)
+    fields: tuple[str, ...] = ()      # market-store fields read
+    regimes: bool = False             # reads the quad-vote store
+    deps: tuple[str, ...] = ()        # upstream artifacts
+
+
+ARTIFACTS: dict[str, Artifact] = {a.name: a for a in [
+    Artifact("quad_stats", QUAD_STATS, _quad_stats, fields=("close",), regimes=True),
+    *[
+        Artifact(f"CAGR_per_quad_nophase_Q{q}", HTML_DIR / f"CAGR_per_quad_nophase_Q{q}.html", _quad_treemap,
+                 params={"quad": q, "height": 640}, deps=("quad_stats",))
+        for q in indicators.QUADS
+    ],
+    Artifact("Daily_Quad_Consensus_Counts", HTML_DIR / "Daily_Quad_Consensus_Counts.html", _consensus, regimes=True),
+    Artifact("Snapshot_63d_RollingCAGR", HTML_DIR / "Snapshot_63d_RollingCAGR.html", _snapshot,
+             params={"indicator": "rolling_cagr", "window": 63, "title": "Snapshot 63-Day Rolling CAGR",
+                     "colorbar": "RollingCAGR", "fmt": ".2%", "tickformat": ".0%"},
+             fields=("close",)),
+    Artifact("Snapshot_MAD_20_50", HTML_DIR / "Snapshot_MAD_20_50.html", _snapshot,
+             params={"indicator": "mad", "fast": 20, "slow": 50, "title": "Snapshot MAD 20/50",
+                     "colorbar": "MAD_20_50", "fmt": ".3f"},
+             fields=("close",)),
+    Artifact("Snapshot_Stoch_D", HTML_DIR / "Snapshot_Stoch_D.html", _snapshot,
+             params={"indicator": "stoch_d", "k": 14, "d": 3, "title": "Snapshot Stoch %D",
+                     "colorbar": "Stoch_D", "fmt": ".3f"},
+             fields=("close", "high", "low")),
+]}
+
+
+def order(names=None) -> list[str]:
+    """Requested artifacts plus their upstream deps, in dependency order."""
+    seen, out = set(), []
+
+    def visit(n):
+        if n in seen:
+            return
+        seen.add(n)
+        for d in ARTIFACTS[n].deps:
+            visit(d)
+        out.append(n)
+
+    for n in names or ARTIFACTS:
+        if n not in ARTIFACTS:
+            raise KeyError(f"unknown artifact: {n}")
+        visit(n)
+    return out
+
+
+def missing(a: Artifact, store_root: Path = STORE, regimes_root: Path = REGIMES) -> str | None:
+    """Why ``a`` can't be built from these stores, or None when it can."""
+    needs = [(Path(store_root), a.fields)] + ([(Path(regimes_root), ("quad",))] if a.regimes else [])
+    for root, fields in needs:
+        if not fields:
+            continue
+        store = MarketStore(root)
+        if not len(store):
+            return f"no data in {_rel(root)}"
+        absent = sorted(set(fields) - set(store.fields))
+        if absent:
+            return f"no {', '.join(absent)} in {_rel(root)}"
+    return None
+
+
+def blocked(names=None, **roots) -> dict[str, str]:
+    """Artifacts (with everything downstream) that can't be built, and why."""
+    out = {}
+    for n in order(names):
+        a = ARTIFACTS[n]
+        why = missing(a, **roots) or next((f"{d} is skipped" for d in a.deps if d in out), None)
+        if why:
+            out[n] = why
+    return out
+
+
+def input_paths(a: Artifact, store_root: Path = STORE, regimes_root: Path = REGIMES) -> list[Path]:
+    paths = []
+    roots = [(Path(store_root), a.fields)] + ([(Path(regimes_root), ("quad",))] if a.regimes else [])
+    for root, fields in roots:
+        if not fields:
+            continue
+        paths += [root / "dates.i4", root / "assets.json"]
+        for f in fields:
+            paths += sorted((root / f).glob("*.f8"))
+    paths += [ARTIFACTS[d].output for d in a.deps]
+    paths += [APP_DIR / "charts.py", APP_DIR / "figures.py", APP_DIR / "indicators.py", APP_DIR / "theme.py"]
+    return paths
+
+
+def file_hash(path: Path, memo: dict) -> str | None:
+    """sha256 of a file, reusing the memo entry while size + mtime are unchanged."""
+    if not path.exists():
+        return None
+    st = path.stat()
+    key = _rel(path)
+    hit = memo.get(key)
+    if hit and hit["size"] == st.st_size and hit["mtime_ns"] == st.st_mtime_ns:
+        return hit["sha256"]
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    memo[key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": h.hexdigest()}
+    return memo[key]["sha256"]
+
+
+def artifact_key(a: Artifact, memo: dict, **roots) -> str:
+    spec = {
+        "inputs": {_rel(p): file_hash(p, memo) for p in input_paths(a, **roots)},
+        "params": a.params,
+        "recipe": hashlib.sha256(inspect.getsource(a.recipe).encode()).hexdigest(),
+    }
+    return hashlib.sha256(json.dumps(spec, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def write_output(obj, path: Path) -> figures.EmitReport | None:
+    """Serialize a recipe result; figures go through the compact emitter."""
+    if isinstance(obj, pd.DataFrame):
+        atomic_write_text(path, obj.to_csv(index=False))
+        return None
+    text, rep = figures.to_html(obj, path.stem)
+    atomic_write_text(path, text)
+    return rep
+
+
+def load_manifest() -> dict:
+    if MANIFEST.exists():
+        return json.loads(MANIFEST.read_text(encoding="utf-8"))
+    return {"files": {}, "artifacts": {}}
+
+
+def stale(names=None, force: bool = False, **roots) -> list[str]:
+    """Artifacts (in build order) whose inputs changed, plus everything downstream of them.
+
+    Artifacts in ``blocked`` are never stale: their outputs are kept as they are.
+    """
+    manifest = load_manifest()
+    skip = blocked(names, **roots)
+    out = []
+    for n in order(names):
+        a = ARTIFACTS[n]
+        if n in skip:
+            continue
+        if (force or not a.output.exists() or any(d in out for d in a.deps)
+                or manifest["artifacts"].get(n) != artifact_key(a, manifest["files"], **roots)):
+            out.append(n)
+    return out
+
+
+def build(names=None, force: bool = False, jobs: int | None = 1,
+          store_root: Path = STORE, regimes_root: Path = REGIMES) -> list:
+    """Rebuild stale artifacts (``jobs`` as in ``render.render``); returns their ``Timing``s."""
+    from render import render  # render imports this module
+
+    todo = stale(names, force, store_root=store_root, regimes_root=regimes_root)
+    if not todo:
+        return []
+    timings = render(todo, jobs, store_root=store_root, regimes_root=regimes_root)
+    manifest = load_manifest()
+    for n in todo:
+        manifest["artifacts"][n] = artifact_key(ARTIFACTS[n], manifest["files"],
+                                                store_root=store_root, regimes_root=regimes_root)
+    atomic_write_text(MANIFEST, json.dumps(manifest, indent=1, sort_keys=True))
+    return timings
+
+
+def _rel(p: Path) -> str:
+    p = Path(p).resolve()
+    return str(p.relative_to(APP_DIR)) if p.is_relative_to(APP_DIR) else str(p)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("names", nargs="*", help="artifacts to build (default: all)")
+    ap.add_argument("--force", action="store_true", help="rebuild even if inputs are unchanged")
+    ap.add_argument("--dry-run", action="store_true", help="list stale artifacts and exit")
+    ap.add_argument("--jobs", type=int, default=1, help="worker processes (0 = CPU count)")
+    args = ap.parse_args()
+    for n, why in blocked(args.names).items():
+        print(f"skipping {n}: {why}")
+    if args.dry_run:
+        for n in stale(args.names, args.force):
+            print(n)
+    else:
+        from render import report
+
+        t0 = time.perf_counter()
+        timings = build(args.names, args.force, jobs=args.jobs or None)
+        print(report(timings, time.perf_counter() - t0) if timings else "up to date")
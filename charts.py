@@ -0,0 +1,133 @@
+"""Plotly figure builders for the dashboard artifacts in assets/html."""
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from indicators import QUAD_NAMES
+
+COLORSCALE = "RdYlGn"
+
+
+def _color_range(values) -> tuple[float, float]:
+    v = np.asarray(values, dtype=float)
+    v = v[np.isfinite(v)]
+    if not len(v):
+        return 0.0, 1.0
+    return float(np.quantile(v, 0.05)), float(np.quantile(v, 0.95))
+
+
+def snapshot_treemap(
+    values: pd.Series, assets: list[dict], title: str, colorbar: str,
+    fmt: str = ".3f", tickformat: str | None = None,
+) -> go.Figure:
+    """Category -> ticker treemap colored by one reading per asset."""
+    meta = {a["ticker"]: a for a in assets}
+    values = values.dropna()
+    cats = pd.Series({t: meta.get(t, {}).get("category") or "Other" for t in values.index})
+    groups = values.groupby(cats)
+
+    labels, parents, sizes, colors, custom = [], [], [], [], []
+    for cat, g in groups:
+        labels.append(cat)
+        parents.append("")
+        sizes.append(len(g))
+        colors.append(float(g.median()))
+        custom.append(["", float(g.median())])
+    for cat, g in groups:
+        for t, v in g.items():
+            labels.append(t)
+            parents.append(cat)
+            sizes.append(1)
+            colors.append(float(v))
+            custom.append([meta.get(t, {}).get("name", t), float(v)])
+
+    cmin, cmax = _color_range(values)
+    fig = go.Figure(go.Treemap(
+        labels=labels,
+        parents=parents,
+        values=sizes,
+        branchvalues="total",
+        customdata=custom,
+        marker=dict(colors=colors, colorscale=COLORSCALE, cmin=cmin, cmax=cmax,
+                    colorbar=dict(title=dict(text=colorbar), tickformat=tickformat or fmt)),
+        texttemplate=f"<b>%{{label}}<br>%{{customdata[1]:{fmt}}}</b>",
+        hovertemplate=f"%{{customdata[0]}}<br>%{{customdata[1]:{fmt}}}<extra></extra>",
+    ))
+    fig.update_layout(title=dict(text=title), height=600)
+    return fig
+
+
+def consensus_figure(counts: pd.DataFrame) -> go.Figure:
+    """One line per quad: number of signals voting for it each day."""
+    fig = go.Figure([
+        go.Scatter(x=counts.index, y=counts[c].to_numpy(), mode="lines", name=c)
+        for c in counts.columns
+    ])
+    fig.update_layout(
+        title=dict(text="Daily Quad Consensus Counts"),
+        xaxis=dict(title=dict(text="Date")),
+        yaxis=dict(title=dict(text="Count")),
+        height=450,
+    )
+    return fig
+
+
+def quad_treemap(stats: pd.DataFrame, quad: int, height: int = 640) -> go.Figure:
+    """Category x ticker treemap of per-quad CAGR, sized by observations."""
+    s = stats[stats["quad"] == quad].sort_values(["category", "ticker"])
+    ids, labels, parents, sizes, colors, custom = [], [], [], [], [], []
+    for cat, g in s.groupby("category", sort=True):
+        ids.append(f"cat|{cat}")
+        labels.append(cat)
+        parents.append("")
+        sizes.append(int(g["n_obs"].sum()))
+        colors.append(float(g["cagr"].median()))
+        custom.append(["", None, None, None, None])
+        for r in g.itertuples():
+            ids.append(f"t|{cat}|{r.ticker}")
+            labels.append(r.ticker)
+            parents.append(f"cat|{cat}")
+            sizes.append(int(r.n_obs))
+            colors.append(float(r.cagr))
+            custom.append([r.name if r.name != r.ticker else "", r.cagr, r.vol, r.sharpe, int(r.n_obs)])
+
+    cmin, cmax = _color_range(s["cagr"])
+    fig = go.Figure(go.Treemap(
+        ids=ids,
+        labels=labels,
+        parents=parents,
+        values=sizes,
+        branchvalues="total",
+        customdata=custom,
+        marker=dict(colors=colors, colorscale=COLORSCALE, cmin=cmin, cmax=cmax,
+                    colorbar=dict(title=dict(text="CAGR per quad"), tickformat=".0%")),
+        texttemplate="<b>%{label}<br>%{customdata[1]:.2%}</b>",
+        hovertemplate=(
+            "%{customdata[0]}<br>CAGR: %{customdata[1]:.2%}<br>Ann Vol: %{customdata[2]:.2%}"
+            "<br>Sharpe: %{customdata[3]:.2f}<br>Daily Observations: %{customdata[4]:d}<extra></extra>"
+        ),
+    ))
+    fig.update_layout(
+        title=dict(text=f"CAGR per quad — Category × Ticker (Quad {quad})"),
+        height=height,
+    )
+    return fig
+
+
+def quad_stats_from_treemap(fig: dict, quad: int) -> pd.DataFrame:
+    """Inverse of ``quad_treemap``: the stats rows behind a saved treemap figure dict."""
+    t = fig["data"][0]
+    rows = []
+    for id_, cd in zip(t["ids"], t["customdata"]):
+        kind, *path = id_.split("|")
+        if kind != "t":
+            continue
+        cat, ticker = path
+        name, cagr, vol, sharpe, n_obs = cd
+        rows.append({"quad": quad, "ticker": ticker, "name": name or ticker, "category": cat,
+                     "cagr": cagr, "vol": vol, "sharpe": sharpe, "n_obs": int(n_obs)})
+    return pd.DataFrame(rows, columns=["quad", "ticker", "name", "category", "cagr", "vol", "sharpe", "n_obs"])
+
+
+def quad_title(quad: int) -> str:
+    return f"Quad {quad} ({QUAD_NAMES[quad]})"
@@ -0,0 +1,274 @@
+"""Walk-forward composite leading index.
+
+The target is the equal-weight basket's log return over the next ``HORIZON``
+trading days. The base features come from the stores:
+
+* per asset category, the mean of each snapshot indicator;
+* the share of regime signals voting for each quad.
+
+Each base feature is taken at every lag in ``LAGS``. That lagged matrix is
+built once and memory-mapped under ``data/composite`` (a float32 ``.npy`` plus a JSON
+sidecar). It is rebuilt only when the stores or the feature set change.
+
+Folds are walk-forward. Fold k trains on every day that ends at least
+``HORIZON`` days before its test year starts, so no training label overlaps
+the test window. It then predicts the test year. Folds are fitted in worker
+processes, which map the matrix read-only instead of receiving a copy. Each
+fold's models are saved as ``models/<feature-set hash>/<fold>.npz`` with a
+digest of the rows it was trained on. A rerun skips any fold whose digest
+still matches, so appending a day refits only the last fold.
+
+Two models are fitted per fold, on features standardised with that fold's
+training rows. One is ridge regression. The other is ridge on random Fourier
+features, a kernel approximation that adds the nonlinear part without an ML
+dependency. The composite is the mean of the two out-of-sample predictions.
+
+    python composite.py                 # fit stale folds, write data/composite/composite.csv
+    python composite.py --jobs 0        # ... with one worker per core
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import indicators
+import percentiles
+from datastore import MarketStore, atomic_write_text
+from paths import DATA, REGIMES, STORE
+
+ROOT = DATA / "composite"
+HORIZON = 63                  # trading days ahead
+LAGS = (0, 5, 21, 63)
+MIN_TRAIN = 756               # rows before the first test fold (3 years)
+FOLD = 252                    # test rows per fold
+RIDGE = 10.0                  # L2 penalty (features are standardised)
+RFF_DIM = 256                 # random Fourier features
+RFF_GAMMA = 0.02              # kernel width: exp(-gamma |x - x'|^2)
+SEED = 7
+
+_X: np.ndarray | None = None  # worker's read-only view of the feature matrix
+_Y: np.ndarray | None = None
+
+
+@dataclass
+class Fold:
+    index: int
+    train_end: int            # rows [0, train_end) train
+    start: int                # rows [start, stop) are predicted
+    stop: int
+
+
+# ──────────────────────────────────────────────────────────────
+# FEATURES
+# ──────────────────────────────────────────────────────────────
+def base_features(market: MarketStore, regimes: MarketStore) -> pd.DataFrame:
+    """Category-mean snapshot readings and regime vote shares, one row per market day."""
+    series = percentiles.specs()
+    parts = percentiles.tail_values(market, series, 0)
+    cats = pd.Series([a.get("category") or "Other" for a in market.assets])
+    cols = {}
+    for name, v in parts.items():
+        frame = pd.DataFrame(v, index=market.dates)
+        for cat, idx in cats.groupby(cats).groups.items():
+            cols[f"{series[name].label}|{cat}"] = frame[list(idx)].mean(axis=1)
+    if len(regimes):
+        counts = indicators.quad_counts(regimes.frame("quad")).reindex(market.dates).ffill()
+        shares = counts.div(counts.sum(axis=1).replace(0, np.nan), axis=0)
+        cols.update({f"votes|{c}": shares[c] for c in shares})
+    return pd.DataFrame(cols, index=market.dates)
+
+
+def target(market: MarketStore, horizon: int = HORIZON) -> pd.Series:
+    """Forward ``horizon``-day log return of the equal-weight basket (NaN at the end)."""
+    r = np.log(market.frame("close")).diff().mean(axis=1)
+    return r[::-1].rolling(horizon).sum()[::-1].shift(-1).rename("target")
+
+
+def lagged(base: pd.DataFrame, lags=LAGS) -> pd.DataFrame:
+    return pd.concat({f"{c}@{k}": base[c].shift(k) for k in lags for c in base}, axis=1)
+
+
+def feature_set(columns, horizon: int = HORIZON, lags=LAGS) -> str:
+    """Hash of everything that defines the matrix and the models (not the data)."""
+    spec = {"columns": list(columns), "horizon": horizon, "lags": list(lags), "ridge": RIDGE,
+            "rff": [RFF_DIM, RFF_GAMMA, SEED], "min_train": MIN_TRAIN, "fold": FOLD}
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def build_matrix(market: MarketStore, regimes: MarketStore, root: Path = ROOT) -> dict:
+    """Write (or reuse) the memory-mapped matrix for the stores' current version; returns its meta."""
+    market.refresh()
+    regimes.refresh()
+    versions = [list(market.version), list(regimes.version)]
+    meta_path = root / "matrix.json"
+    if meta_path.exists():
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta["versions"] == json.loads(json.dumps(versions)) and (root / meta["file"]).exists():
+            return meta
+    X = lagged(base_features(market, regimes))
+    y = target(market)
+    fset = feature_set(X.columns)
+    root.mkdir(parents=True, exist_ok=True)
+    data = np.column_stack([X.to_numpy(np.float32), y.to_numpy(np.float32)])
+    tmp = root / f".{fset}.npy.tmp"
+    out = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.float32, shape=data.shape)
+    out[:] = data
+    out.flush()
+    del out
+    os.replace(tmp, root / f"{fset}.npy")
+    meta = {"file": f"{fset}.npy", "fset": fset, "columns": list(X.columns), "versions": versions,
+            "dates": [int(d) for d in market.days]}
+    atomic_write_text(meta_path, json.dumps(meta))
+    return meta
+
+
+def load_matrix(meta: dict, root: Path = ROOT) -> tuple[np.ndarray, np.ndarray]:
+    """Read-only (X, y) views of the memory-mapped matrix."""
+    data = np.load(root / meta["file"], mmap_mode="r")
+    return data[:, :-1], data[:, -1]
+
+
+def folds(n_rows: int, horizon: int = HORIZON) -> list[Fold]:
+    return [Fold(k, max(0, start - horizon), start, min(start + FOLD, n_rows))
+            for k, start in enumerate(range(MIN_TRAIN, n_rows, FOLD))]
+
+
+def digest(X: np.ndarray, y: np.ndarray, f: Fold) -> str:
+    """Hash of the fold's training rows: a fold is refitted only when these change."""
+    h = hashlib.sha256()
+    h.update(np.ascontiguousarray(X[:f.train_end]).tobytes())
+    h.update(np.ascontiguousarray(y[:f.train_end]).tobytes())
+    return h.hexdigest()
+
+
+# ──────────────────────────────────────────────────────────────
+# MODELS
+# ──────────────────────────────────────────────────────────────
+def _ridge(A: np.ndarray, y: np.ndarray, lam: float) -> np.ndarray:
+    """Coefficients (intercept last) of ridge regression; the intercept isn't penalised."""
+    A1 = np.column_stack([A, np.ones(len(A))])
+    G = A1.T @ A1
+    G[np.diag_indices(A.shape[1])] += lam
+    return np.linalg.solve(G, A1.T @ y)
+
+
+def _standardise(X: np.ndarray, mu: np.ndarray, sd: np.ndarray) -> np.ndarray:
+    return np.nan_to_num((np.asarray(X, np.float64) - mu) / sd)
+
+
+def _rff(Z: np.ndarray, W: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.sqrt(2.0 / W.shape[1]) * np.cos(Z @ W + b)
+
+
+def fit(X: np.ndarray, y: np.ndarray, seed: int = SEED) -> dict[str, np.ndarray]:
+    """Both models on rows with a known target."""
+    ok = np.isfinite(y)
+    X, y = np.asarray(X[ok], np.float64), np.asarray(y[ok], np.float64)
+    with np.errstate(invalid="ignore"):
+        mu = np.nan_to_num(np.nanmean(X, axis=0))
+        sd = np.nanstd(X, axis=0)
+    sd = np.where(np.isfinite(sd) & (sd > 0), sd, 1.0)
+    Z = _standardise(X, mu, sd)
+    rng = np.random.default_rng(seed)
+    W = rng.normal(0, np.sqrt(2 * RFF_GAMMA), (Z.shape[1], RFF_DIM))
+    b = rng.uniform(0, 2 * np.pi, RFF_DIM)
+    return {"mu": mu, "sd": sd, "W": W, "b": b,
+            "ridge": _ridge(Z, y, RIDGE), "rff": _ridge(_rff(Z, W, b), y, RIDGE)}
+
+
+def predict(m: dict[str, np.ndarray], X: np.ndarray) -> dict[str, np.ndarray]:
+    Z = _standardise(X, m["mu"], m["sd"])
+    return {"ridge": Z @ m["ridge"][:-1] + m["ridge"][-1],
+            "rff": _rff(Z, m["W"], m["b"]) @ m["rff"][:-1] + m["rff"][-1]}
+
+
+# ──────────────────────────────────────────────────────────────
+# WALK-FORWARD
+# ──────────────────────────────────────────────────────────────
+def _init_worker(path: str):
+    global _X, _Y
+    data = np.load(path, mmap_mode="r")
+    _X, _Y = data[:, :-1], data[:, -1]
+
+
+def _fit_fold(f: Fold, key: str, out: str) -> int:
+    model = fit(_X[:f.train_end], _Y[:f.train_end], SEED + f.index)
+    tmp = f"{out}.tmp.npz"
+    np.savez(tmp, digest=key, **model)
+    os.replace(tmp, out)
+    return f.index
+
+
+def _model_path(root: Path, fset: str, f: Fold) -> Path:
+    return root / "models" / fset / f"{f.index:03d}.npz"
+
+
+def run(jobs: int | None = 1, root: Path = ROOT, store_root: Path = STORE,
+        regimes_root: Path = REGIMES) -> tuple[pd.DataFrame, int]:
+    """Fit stale folds (``jobs`` workers; None = CPU count) and return (out-of-sample frame, folds fitted).
+
+    The frame also carries the consensus quad on each day (``quad``) and ``HORIZON``
+    days later (``quad_fwd``), for scoring the forecasts against realized quads.
+    """
+    regimes = MarketStore(regimes_root)
+    meta = build_matrix(MarketStore(store_root), regimes, root)
+    X, y = load_matrix(meta, root)
+    todo = []
+    for f in folds(len(X)):
+        path = _model_path(root, meta["fset"], f)
+        key = digest(X, y, f)
+        stale = not path.exists()
+        if not stale:
+            with np.load(path) as z:
+                stale = str(z["digest"]) != key
+        if stale:
+            todo.append((f, key, str(path)))
+    if todo:
+        (root / "models" / meta["fset"]).mkdir(parents=True, exist_ok=True)
+        jobs = max(1, min(jobs or os.cpu_count() or 1, len(todo)))
+        if jobs == 1:
+            _init_worker(str(root / meta["file"]))
+            for t in todo:
+                _fit_fold(*t)
+        else:
+            with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(str(root / meta["file"]),)) as pool:
+                list(pool.map(_fit_fold, *zip(*todo)))
+
+    days = pd.to_datetime(np.asarray(meta["dates"], "int64"), unit="D")
+    out = pd.DataFrame(np.nan, index=days, columns=["ridge", "rff", "composite", "target"])
+    out["target"] = np.asarray(y, np.float64)
+    for f in folds(len(X)):
+        with np.load(_model_path(root, meta["fset"], f)) as z:
+            p = predict(dict(z), X[f.start:f.stop])
+        out.iloc[f.start:f.stop, 0] = p["ridge"]
+        out.iloc[f.start:f.stop, 1] = p["rff"]
+    out["composite"] = out[["ridge", "rff"]].mean(axis=1, skipna=False)
+    quads = indicators.quad_labels(regimes.frame("quad")).reindex(days)
+    out["quad"] = quads.to_numpy()
+    out["quad_fwd"] = quads.shift(-HORIZON).to_numpy()
+    return out, len(todo)
+
+
+def score(out: pd.DataFrame) -> dict[str, float]:
+    """Out-of-sample correlation of each prediction with the realised target."""
+    ok = out.dropna(subset=["ridge", "rff", "composite", "target"])
+    return {c: float(ok[c].corr(ok["target"])) for c in ("ridge", "rff", "composite")}
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--jobs", type=int, default=1, help="worker processes (0 = CPU count)")
+    ap.add_argument("--out", default=str(ROOT / "composite.csv"), help="CSV of the out-of-sample predictions")
+    args = ap.parse_args()
+    t0 = time.perf_counter()
+    out, fitted = run(args.jobs or None)
+    atomic_write_text(Path(args.out), out.dropna(subset=["composite"]).to_csv(index_label="date"))
+    corr = ", ".join(f"{k} {v:+.2f}" for k, v in score(out).items())
+    print(f"{fitted} of {len(folds(len(out)))} folds fitted in {time.perf_counter() - t0:.1f}s; OOS corr: {corr}")
@@ -0,0 +1,249 @@
+"""Memory-mapped columnar market data store.
+
+Layout under ``root``::
+
+    dates.i4           int32 trading-day index (days since 1970-01-01), append-only
+    assets.json        asset dictionary: code -> ticker / name / category
+    <field>/<code>.f8  one float64 column per (field, asset), one value per trading day
+
+``dates.i4`` is written last on every append and is the commit marker: readers
+size every column by it, so a half-finished write is never visible. Columns are
+opened as read-only memmaps, so slicing by date range or asset subset only
+touches the pages that are actually read.
+"""
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from paths import STORE
+
+try:  # POSIX advisory lock for writers; readers never lock
+    import fcntl
+except ImportError:  # pragma: no cover - windows
+    fcntl = None
+
+DAY_DTYPE = np.dtype("<i4")
+VALUE_DTYPE = np.dtype("<f8")
+
+
+def to_day(d) -> int:
+    """Date-like -> int32 trading-day code (days since epoch)."""
+    return int(np.datetime64(pd.Timestamp(d).date(), "D").astype(np.int64))
+
+
+def atomic_write_text(path: Path, text: str):
+    """Write ``text`` to ``path`` via temp file + rename."""
+    atomic_write_bytes(path, text.encode("utf-8"))
+
+
+def atomic_write_bytes(path: Path, data: bytes):
+    """Write ``data`` to ``path`` via temp file + rename."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class MarketStore:
+    """Append-only columnar store of daily (field x asset) series."""
+
+    def __init__(self, root: Path | str = STORE):
+        self.root = Path(root)
+        self._maps: dict[tuple[str, int], np.memmap] = {}
+        self._dates = np.empty(0, DAY_DTYPE)
+        self._assets: list[dict] = []
+        self._codes: dict[str, int] = {}
+        self._stamp = None
+        self.refresh()
+
+    # ── reading ──────────────────────────────────────────────
+    def refresh(self):
+        """Pick up rows / assets committed by a writer since the last call."""
+        dates_path = self.root / "dates.i4"
+        assets_path = self.root / "assets.json"
+        stamp = tuple(
+            (p.stat().st_size, p.stat().st_mtime_ns) if p.exists() else None
+            for p in (dates_path, assets_path)
+        )
+        if stamp == self._stamp:
+            return
+        if assets_path.exists():
+            self._assets = json.loads(assets_path.read_text(encoding="utf-8"))["assets"]
+            self._codes = {a["ticker"]: i for i, a in enumerate(self._assets)}
+        if dates_path.exists() and dates_path.stat().st_size:
+            n = dates_path.stat().st_size // DAY_DTYPE.itemsize
+            self._dates = np.memmap(dates_path, dtype=DAY_DTYPE, mode="r", shape=(n,))
+        self._stamp = stamp
+
+    def __len__(self) -> int:
+        return len(self._dates)
+
+    @property
+    def days(self) -> np.ndarray:
+        """Raw int32 trading-day index (zero-copy)."""
+        return self._dates
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(self._dates.astype("datetime64[D]"))
+
+    @property
+    def assets(self) -> list[dict]:
+        return list(self._assets)
+
+    @property
+    def tickers(self) -> list[str]:
+        return [a["ticker"] for a in self._assets]
+
+    @property
+    def fields(self) -> list[str]:
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir())
+
+    @property
+    def version(self) -> tuple:
+        """Cheap data version for cache keys: (rows, last day, assets)."""
+        last = int(self._dates[-1]) if len(self._dates) else None
+        return len(self._dates), last, len(self._assets)
+
+    def code(self, ticker: str) -> int:
+        return self._codes[ticker]
+
+    def rows(self, start=None, end=None) -> slice:
+        """Row slice covering [start, end] (inclusive) on the trading-day index."""
+        lo = 0 if start is None else int(np.searchsorted(self._dates, to_day(start), "left"))
+        hi = len(self._dates) if end is None else int(np.searchsorted(self._dates, to_day(end), "right"))
+        return slice(lo, hi)
+
+    def column(self, field: str, ticker: str) -> np.ndarray:
+        """Full committed column for one asset (memmap view, NaN-padded if short)."""
+        n = len(self._dates)
+        code = self._codes[ticker]
+        path = self.root / field / f"{code}.f8"
+        have = path.stat().st_size // VALUE_DTYPE.itemsize if path.exists() else 0
+        if have == 0:
+            return np.full(n, np.nan)
+        mm = self._maps.get((field, code))
+        if mm is None or len(mm) < min(have, n):
+            mm = np.memmap(path, dtype=VALUE_DTYPE, mode="r", shape=(have,))
+            self._maps[(field, code)] = mm
+        if len(mm) >= n:
+            return mm[:n]
+        return np.concatenate([mm, np.full(n - len(mm), np.nan)])
+
+    def read(self, field: str, tickers=None, start=None, end=None) -> dict[str, np.ndarray]:
+        """{ticker: values} for a date range; each value is a zero-copy memmap slice."""
+        sl = self.rows(start, end)
+        tickers = self.tickers if tickers is None else tickers
+        return {t: self.column(field, t)[sl] for t in tickers if t in self._codes}
+
+    def panel(self, field: str, tickers=None, start=None, end=None) -> np.ndarray:
+        """Stacked (days x assets) float64 array; copies only the requested bytes."""
+        cols = self.read(field, tickers, start, end)
+        sl = self.rows(start, end)
+        if not cols:
+            return np.empty((sl.stop - sl.start, 0))
+        return np.column_stack(list(cols.values()))
+
+    def frame(self, field: str, tickers=None, start=None, end=None) -> pd.DataFrame:
+        cols = self.read(field, tickers, start, end)
+        return pd.DataFrame(cols, index=self.dates[self.rows(start, end)])
+
+    # ── writing ──────────────────────────────────────────────
+    @contextmanager
+    def _locked(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / ".lock", "a+") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                self._stamp = None
+                self.refresh()
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def register(self, ticker: str, name: str | None = None, category: str | None = None) -> int:
+        """Add an asset to the dictionary (or update its metadata); returns its code."""
+        with self._locked():
+            return self._register({ticker: {"name": name, "category": category}})[ticker]
+
+    def _register(self, meta: dict[str, dict]) -> dict[str, int]:
+        changed = False
+        for ticker, info in meta.items():
+            info = {k: v for k, v in (info or {}).items() if v is not None}
+            if ticker not in self._codes:
+                self._codes[ticker] = len(self._assets)
+                self._assets.append({"ticker": ticker, "name": ticker, "category": None})
+                changed = True
+            entry = self._assets[self._codes[ticker]]
+            if any(entry.get(k) != v for k, v in info.items()):
+                entry.update(info)
+                changed = True
+        if changed:
+            atomic_write_text(self.root / "assets.json", json.dumps({"assets": self._assets}, indent=1))
+        return {t: self._codes[t] for t in meta}
+
+    def append(self, dates, values: dict[str, pd.DataFrame], meta: dict[str, dict] | None = None):
+        """Append trading days.
+
+        ``values`` maps field -> DataFrame indexed by ``dates`` with one column per
+        ticker. Dates must be strictly after the last stored day. ``meta`` may carry
+        ``{ticker: {"name": ..., "category": ...}}`` for new assets.
+        """
+        new_days = np.array([to_day(d) for d in dates], dtype=DAY_DTYPE)
+        if len(new_days) == 0:
+            return
+        if np.any(np.diff(new_days) <= 0):
+            raise ValueError("dates must be strictly increasing")
+        with self._locked():
+            n = len(self._dates)
+            if n and new_days[0] <= self._dates[-1]:
+                last = np.datetime64(int(self._dates[-1]), "D")
+                raise ValueError(f"cannot append {np.datetime64(int(new_days[0]), 'D')} on or before last stored day {last}")
+            tickers = {t for df in values.values() for t in df.columns}
+            codes = self._register({t: (meta or {}).get(t) for t in sorted(tickers)})
+            for field, df in values.items():
+                folder = self.root / field
+                folder.mkdir(exist_ok=True)
+                block = df.reindex(pd.DatetimeIndex(pd.to_datetime(list(dates))))
+                for ticker in df.columns:
+                    self._write_column(folder / f"{codes[ticker]}.f8", n, block[ticker].to_numpy(VALUE_DTYPE))
+            with open(self.root / "dates.i4", "ab") as f:
+                f.truncate(n * DAY_DTYPE.itemsize)  # drop an uncommitted tail, if any
+                f.write(new_days.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            self._stamp = None
+            self.refresh()
+
+    def append_day(self, date, values: dict[str, dict[str, float]], meta: dict[str, dict] | None = None):
+        """Convenience for the nightly job: ``{field: {ticker: value}}`` for one day."""
+        idx = pd.DatetimeIndex([pd.Timestamp(date)])
+        self.append(idx, {f: pd.DataFrame([v], index=idx) for f, v in values.items()}, meta)
+
+    @staticmethod
+    def _write_column(path: Path, n_rows: int, values: np.ndarray):
+        with open(path, "ab") as f:
+            have = f.tell() // VALUE_DTYPE.itemsize
+            if have > n_rows:  # uncommitted tail from an interrupted write
+                f.truncate(n_rows * VALUE_DTYPE.itemsize)
+                f.seek(0, os.SEEK_END)
+            elif have < n_rows:  # asset/field first seen after day 0
+                f.write(np.full(n_rows - have, np.nan, VALUE_DTYPE).tobytes())
+            f.write(values.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
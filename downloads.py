@@ -0,0 +1,108 @@
+"""PDF download buttons that don't copy file bytes into every session.
+
+Modes (``PDF_DOWNLOAD_MODE`` env var):
+
+- ``deferred`` (default): the button carries a callable; bytes are produced only
+  when a user clicks, from one process-wide buffer per file.
+- ``static``: a plain link to ``ASSET_BASE_URL`` (CDN or the ``static_assets``
+  server); Streamlit never touches the bytes.
+- ``inline``: bytes passed up front, still from the shared buffer.
+
+``pdf_preview`` shows one page at a time from the per-page split written by
+``pdf_pages.py``, so opening a slide costs that page rather than the document.
+A document without a split is split on its first preview.
+"""
+import importlib.util
+import json
+import os
+from functools import partial
+from pathlib import Path
+
+import streamlit as st
+
+import metrics
+from paths import ASSETS, resolve
+from pdf_pages import HAS_PYPDF, INDEX, out_dir, split
+from static_assets import load_manifest, url_for
+
+MODE = os.environ.get("PDF_DOWNLOAD_MODE", "deferred")
+ASSET_BASE_URL = os.environ.get("ASSET_BASE_URL", "").rstrip("/")
+HAS_PDF_VIEWER = importlib.util.find_spec("streamlit_pdf") is not None   # st.pdf needs streamlit[pdf]
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def shared_bytes(path: str, mtime_ns: int) -> bytes:
+    """One immutable copy of a file per process (``mtime_ns`` keys out stale copies)."""
+    return Path(path).read_bytes()
+
+
+def static_url(p: Path) -> str:
+    """Content-addressed URL on the precompressed asset server (see static_assets)."""
+    rel = p.resolve().relative_to(ASSETS.resolve()).as_posix()
+    return url_for(rel, static_manifest(), base=ASSET_BASE_URL)
+
+
+@st.cache_resource(show_spinner=False)
+def static_manifest() -> dict:
+    return load_manifest()
+
+
+@metrics.timed()
+def pdf_button(label: str, file_path: str, key: str, mode: str | None = None):
+    p = resolve(file_path)
+    if not p.exists():
+        st.caption(f"⚠ {label} not found: `{file_path}`")
+        return
+    mode = mode or MODE
+    if mode == "static" and ASSET_BASE_URL:
+        st.link_button(f"📄 {label}", static_url(p))
+        return
+    load = partial(shared_bytes, str(p), p.stat().st_mtime_ns)
+    st.download_button(
+        label=f"📄 {label}",
+        data=load if mode != "inline" else load(),
+        file_name=p.name,
+        mime="application/pdf",
+        key=key,
+        on_click="ignore",
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _page_index(path: str, mtime_ns: int) -> dict:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+@st.cache_resource(show_spinner="Splitting pages…", max_entries=16)
+def _split(path: str, mtime_ns: int) -> dict:
+    return split(Path(path))
+
+
+def page_index(src: Path) -> dict | None:
+    """Page index of ``src``, splitting it first if its split is missing or stale."""
+    if HAS_PYPDF and src.exists():
+        return _split(str(src), src.stat().st_mtime_ns)
+    p = out_dir(src) / INDEX
+    return _page_index(str(p), p.stat().st_mtime_ns) if p.exists() else None
+
+
+@st.fragment
+def pdf_preview(docs: dict[str, str], key: str):
+    """Page-by-page preview; nothing is read until the user switches it on."""
+    docs = {label: fp for label, fp in docs.items()
+            if (out_dir(resolve(fp)) / INDEX).exists() or (HAS_PYPDF and resolve(fp).exists())}
+    if not docs or not st.toggle("Preview individual pages", key=f"{key}-on"):
+        return
+    label = st.selectbox("Document", list(docs), key=f"{key}-doc")
+    src = resolve(docs[label])
+    idx = page_index(src)
+    pages = {p["n"]: p for p in idx["pages"]}
+    n = st.selectbox("Page", list(pages), format_func=lambda n: f"{n}. {pages[n]['title']}", key=f"{key}-page-{src.stem}")
+    page = pages[n]
+    path = out_dir(src) / page["file"]
+    if HAS_PDF_VIEWER:
+        st.pdf(shared_bytes(str(path), path.stat().st_mtime_ns), height=560, key=f"{key}-view")
+    if page["text"]:
+        with st.container(height=220):
+            st.text(page["text"])
+    pdf_button(f"Page {n} of {label} ({page['size'] / 1024:.0f} KB)", str(path), key=f"{key}-dl")
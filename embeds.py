@@ -0,0 +1,79 @@
+"""Cached HTML / image embeds.
+
+The chart HTML rewrites and the base64 image encoding are pure functions of
+the file contents, so each is computed once per process and file version
+(``mtime_ns``) and shared by every session. ``warmup`` pre-runs them at start.
+"""
+import base64
+import re
+from pathlib import Path
+
+import streamlit as st
+
+import styles
+from paths import resolve
+
+TIGHTEN_CSS = """
+            <style>
+              html, body { margin:0!important; padding:0!important; background:transparent!important; }
+              .plot-container, .svg-container, .main-svg, .plotly, .plotly-graph-div {
+                margin:0!important; padding:0!important;
+              }
+            </style>
+            """
+# every chart iframe is its own document and needs its own copy; send it minified
+styles.register("tighten", TIGHTEN_CSS)
+
+
+def _version(path) -> tuple[str, int]:
+    p = resolve(path)
+    return str(p), p.stat().st_mtime_ns
+
+
+def _fluid(raw: str, height: int) -> str:
+    # common fixed-width patterns -> make fluid
+    for w in ("width: 1600px", "width:1500px", "width:1200px"):
+        raw = raw.replace(w, "width: 100%")
+    return (raw
+            .replace('width="1600"', 'width="100%"')
+            .replace('width="1500"', 'width="100%"')
+            .replace('width="1200"', 'width="100%"')
+            .replace('height="900"', f'height="{height}"')
+            .replace("height: 900px", f"height: {height}px"))
+
+
+def tighten(raw: str, height: int) -> str:
+    """Chart HTML with fluid width, page chrome stripped and a bordered card around it."""
+    raw = _fluid(raw, height)
+    # strip outer <html>/<body> wrappers if present to avoid their margins
+    raw = re.sub(r"<!DOCTYPE html>.*?<body[^>]*>", "", raw, flags=re.S)
+    raw = re.sub(r"</body>\s*</html>\s*$", "", raw, flags=re.S)
+    # trailing whitespace blocks commonly found at the end
+    raw = re.sub(r"(\s|&nbsp;|<br\s*/?>|<p>\s*</p>)+$", "", raw, flags=re.S)
+    # inline bottom margins/paddings that add gap
+    raw = re.sub(r"margin-bottom\s*:\s*\d+px;?", "margin-bottom:0;", raw, flags=re.I)
+    raw = re.sub(r"padding-bottom\s*:\s*\d+px;?", "padding-bottom:0;", raw, flags=re.I)
+    return (
+        f'<style>{styles.stylesheet("tighten")}</style>'
+        f'<div style="overflow-x:auto; margin:0; border:1px solid rgba(139,94,60,.2);'
+        f' border-radius:12px; box-shadow:0 6px 18px rgba(0,0,0,.08);">{raw}</div>'
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _tight_html(path: str, mtime_ns: int, height: int) -> str:
+    return tighten(Path(path).read_text(encoding="utf-8"), height)
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _image_b64(path: str, mtime_ns: int) -> str:
+    return base64.b64encode(Path(path).read_bytes()).decode()
+
+
+def tight_html(path, height: int = 520) -> str:
+    """Saved Plotly HTML made fluid, page chrome stripped and a bordered card (Dashboards)."""
+    return _tight_html(*_version(path), height)
+
+
+def image_b64(path) -> str:
+    return _image_b64(*_version(path))
@@ -0,0 +1,225 @@
+"""Compact emission of Plotly figures.
+
+Every numeric array in a figure is written as a base64 typed array (``bdata``)
+and downcast to the narrowest dtype that keeps it exact (ints) or within
+display precision (floats). Values shown through hover/text templates are
+rounded to the precision the template prints; ISO date arrays become epoch
+milliseconds on a ``date`` axis. The template is stripped (see ``theme``) and
+only re-attached, pruned, when HTML is rendered.
+
+    spec, rep = emit(fig, "Snapshot_MAD_20_50")
+    print(rep)   # Snapshot_MAD_20_50: <before> KB -> <after> KB (<pct>%)
+"""
+import base64
+import json
+import re
+from dataclasses import dataclass
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+import theme
+
+MIN_LEN = 8          # shorter arrays stay as JSON text
+FLOAT_RTOL = 1e-6    # float32 allowed when relative error stays below this
+INT_DTYPES = [np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32]
+_CODES = {np.dtype(t): c for t, c in [
+    (np.int8, "i1"), (np.uint8, "u1"), (np.int16, "i2"), (np.uint16, "u2"),
+    (np.int32, "i4"), (np.uint32, "u4"), (np.float32, "f4"), (np.float64, "f8"),
+]}
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}([ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?$")
+_FMT = re.compile(r"%\{([a-z]+(?:\[\d+\])?)(?::([^}]*))?\}")
+
+
+@dataclass
+class EmitReport:
+    name: str
+    before: int
+    after: int
+
+    def __str__(self) -> str:
+        pct = 100 * self.after / self.before if self.before else 100
+        return f"{self.name}: {self.before / 1024:.1f} KB -> {self.after / 1024:.1f} KB ({pct:.0f}%)"
+
+
+# ──────────────────────────────────────────────────────────────
+# ARRAYS
+# ──────────────────────────────────────────────────────────────
+def typed_array(a, decimals: int | None = None) -> dict:
+    """Numeric array -> plotly typed-array spec in the narrowest safe dtype."""
+    a = np.asarray(a, dtype=float) if np.asarray(a).dtype == object else np.asarray(a)
+    if decimals is not None and a.dtype.kind == "f":
+        a = np.round(a, decimals)
+    a = _downcast(a, decimals)
+    spec = {"dtype": _CODES[a.dtype], "bdata": base64.b64encode(np.ascontiguousarray(a).tobytes()).decode()}
+    if a.ndim > 1:
+        spec["shape"] = ", ".join(map(str, a.shape))
+    return spec
+
+
+def decode(spec: dict) -> np.ndarray:
+    dtype = {c: t for t, c in _CODES.items()}[spec["dtype"]]
+    a = np.frombuffer(base64.b64decode(spec["bdata"]), dtype=dtype)
+    if "shape" in spec:
+        a = a.reshape([int(s) for s in str(spec["shape"]).split(",")])
+    return a
+
+
+def _downcast(a: np.ndarray, decimals: int | None) -> np.ndarray:
+    if a.dtype.kind in "iub" or (a.dtype.kind == "f" and np.isfinite(a).all() and (a == np.round(a)).all()):
+        if a.size == 0:
+            return a.astype(np.int8)
+        lo, hi = a.min(), a.max()
+        for t in INT_DTYPES:
+            info = np.iinfo(t)
+            if info.min <= lo and hi <= info.max:
+                return a.astype(t)
+        return a.astype(np.float64)
+    a = a.astype(np.float64)
+    a32 = a.astype(np.float32)
+    finite = np.isfinite(a)
+    err = np.abs(a32[finite].astype(np.float64) - a[finite])
+    scale = np.abs(a[finite]).max() if finite.any() else 0.0
+    tol = 0.5 * 10.0 ** -decimals if decimals is not None else FLOAT_RTOL * scale
+    if not len(err) or err.max() <= tol:
+        return a32
+    return a
+
+
+def _numeric(v) -> bool:
+    if isinstance(v, dict):
+        return "bdata" in v
+    if not isinstance(v, list) or len(v) < MIN_LEN:
+        return False
+    flat = v if not isinstance(v[0], list) else [x for row in v if isinstance(row, list) for x in row]
+    if isinstance(v[0], list) and len({len(r) for r in v if isinstance(r, list)}) != 1:
+        return False
+    return all(x is None or (isinstance(x, (int, float)) and not isinstance(x, bool)) for x in flat)
+
+
+def _dates(v) -> bool:
+    return isinstance(v, list) and len(v) >= MIN_LEN and all(isinstance(x, str) and _ISO_DATE.match(x) for x in v)
+
+
+def _as_array(v) -> np.ndarray:
+    if isinstance(v, dict):
+        return decode(v)
+    return np.array([[np.nan if x is None else x for x in r] for r in v] if isinstance(v[0], list)
+                    else [np.nan if x is None else x for x in v], dtype=float)
+
+
+# ──────────────────────────────────────────────────────────────
+# PRECISION
+# ──────────────────────────────────────────────────────────────
+def _decimals(fmt: str | None) -> int | None:
+    """d3-format spec -> number of decimals in the underlying value."""
+    if not fmt:
+        return None
+    m = re.search(r"\.(\d+)([a-z%]?)", fmt)
+    if m:
+        d = int(m.group(1))
+        return d + 2 if m.group(2) == "%" else d
+    return 0 if fmt.endswith("d") else None
+
+
+def display_precision(trace: dict) -> dict[str, int]:
+    """{'y': 2, 'customdata[1]': 4, ...} from the trace's hover/text templates.
+
+    A variable printed with several formats keeps the finest one; a variable
+    printed without a format is left alone.
+    """
+    out: dict[str, int | None] = {}
+    for key in ("hovertemplate", "texttemplate"):
+        for var, fmt in _FMT.findall(trace.get(key) or ""):
+            d = _decimals(fmt)
+            if var in out and (out[var] is None or d is None):
+                out[var] = None
+            else:
+                out[var] = max(d, out.get(var, d)) if d is not None else None
+    return {k: v for k, v in out.items() if v is not None}
+
+
+def _round_customdata(cd: list, prec: dict[str, int]) -> list:
+    cols = {int(k[11:-1]): d for k, d in prec.items() if k.startswith("customdata[")}
+    if not cols or not isinstance(cd, list):
+        return cd
+    out = []
+    for row in cd:
+        if isinstance(row, list):
+            row = [round(x, cols[i]) if i in cols and isinstance(x, float) else x for i, x in enumerate(row)]
+        out.append(row)
+    return out
+
+
+# ──────────────────────────────────────────────────────────────
+# FIGURES
+# ──────────────────────────────────────────────────────────────
+def _pack(obj, prec: dict[str, int], path: str = ""):
+    if isinstance(obj, dict) and "bdata" not in obj:
+        return {k: _pack(v, prec, f"{path}.{k}" if path else k) for k, v in obj.items()}
+    if _numeric(obj):
+        a = _as_array(obj)
+        return typed_array(a, prec.get(path))
+    return obj
+
+
+_VAR_PATHS = {"x": ["x"], "y": ["y"], "z": ["z"], "value": ["values"], "color": ["marker.color", "marker.colors"]}
+
+
+def compact(spec: dict) -> dict:
+    """Copy of a JSON figure dict with typed arrays, downcasts and rounded hover values."""
+    spec = json.loads(json.dumps(spec))
+    layout = spec.setdefault("layout", {})
+    for trace in spec.get("data", []):
+        prec = display_precision(trace)
+        paths = {p: d for var, d in prec.items() for p in _VAR_PATHS.get(var, [])}
+        for ax in ("x", "y"):
+            if _dates(trace.get(ax)):
+                ms = np.array(trace[ax], dtype="datetime64[ms]").astype(np.int64).astype(np.float64)
+                trace[ax] = typed_array(ms)
+                ref = trace.get(f"{ax}axis", ax)
+                layout.setdefault(ref.replace(ax, f"{ax}axis", 1), {})["type"] = "date"
+        for key, val in list(trace.items()):
+            if key == "customdata":
+                val = _round_customdata(val, prec)
+                trace[key] = typed_array(_as_array(val)) if _numeric(val) else val
+            else:
+                trace[key] = _pack(val, paths, key)
+    return spec
+
+
+def emit(fig: go.Figure | dict, name: str = "figure") -> tuple[dict, EmitReport]:
+    """Compact figure dict plus a before/after JSON size report."""
+    raw = fig.to_json() if isinstance(fig, go.Figure) else json.dumps(fig)
+    spec = compact(theme.strip(json.loads(raw)))
+    return spec, EmitReport(name, len(raw.encode()), len(json.dumps(spec, separators=(",", ":")).encode()))
+
+
+def to_html(fig: go.Figure | dict, name: str = "figure", **kw) -> tuple[str, EmitReport]:
+    """Standalone HTML for ``fig`` built from the compact spec."""
+    spec, rep = emit(fig, name)
+    spec = theme.apply(spec)
+    kw.setdefault("include_plotlyjs", "cdn")
+    kw.setdefault("full_html", True)
+    kw.setdefault("config", {"responsive": True})
+    html = pio.to_html(spec, validate=False, **kw)
+    return html, rep
+
+
+def from_html(html: str) -> list[dict]:
+    """Figure dicts (``data`` / ``layout``) embedded in a saved Plotly HTML page."""
+    dec = json.JSONDecoder()
+    figs = []
+    for m in re.finditer(r"Plotly\.newPlot\(\s*", html):
+        try:
+            _, i = dec.raw_decode(html, m.end())            # div id
+            parts = []
+            for _ in range(2):                                # data, layout
+                i = re.compile(r"\s*,\s*").match(html, i).end()
+                obj, i = dec.raw_decode(html, i)
+                parts.append(obj)
+        except (ValueError, AttributeError):
+            continue
+        figs.append({"data": parts[0], "layout": parts[1]})
+    return figs
@@ -0,0 +1,95 @@
+"""Indicator math behind the dashboard snapshots and quad treemaps.
+
+Everything takes / returns wide DataFrames (dates x tickers) so results line up
+with ``MarketStore.frame``.
+"""
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+QUADS = (1, 2, 3, 4)
+QUAD_NAMES = {1: "Goldilocks", 2: "Reflation", 3: "Stagflation", 4: "Deflation"}
+
+
+def mad(close: pd.DataFrame, fast: int = 20, slow: int = 50) -> pd.DataFrame:
+    """Moving-average distance: SMA(fast) / SMA(slow) - 1."""
+    return close.rolling(fast).mean() / close.rolling(slow).mean() - 1
+
+
+def stoch_d(high: pd.DataFrame, low: pd.DataFrame, close: pd.DataFrame, k: int = 14, d: int = 3) -> pd.DataFrame:
+    """Stochastic %D: d-day SMA of %K over a k-day high/low range."""
+    hh = high.rolling(k).max()
+    ll = low.rolling(k).min()
+    pct_k = 100 * (close - ll) / (hh - ll).replace(0, np.nan)
+    return pct_k.rolling(d).mean()
+
+
+def rolling_cagr(close: pd.DataFrame, window: int = 63) -> pd.DataFrame:
+    """Annualized growth rate over a trailing window of trading days."""
+    return (close / close.shift(window)) ** (TRADING_DAYS / window) - 1
+
+
+def compute(indicator: str, close: pd.DataFrame, high: pd.DataFrame | None = None,
+            low: pd.DataFrame | None = None, **kw) -> pd.DataFrame:
+    """One of the snapshot indicators by name (``mad`` / ``stoch_d`` / ``rolling_cagr``)."""
+    if indicator == "mad":
+        return mad(close, **kw)
+    if indicator == "stoch_d":
+        return stoch_d(high, low, close, **kw)
+    if indicator == "rolling_cagr":
+        return rolling_cagr(close, **kw)
+    raise ValueError(f"unknown indicator: {indicator}")
+
+
+def quad_from_directions(growth, inflation) -> np.ndarray:
+    """Quad for growth / inflation momentum directions (+1 accelerating, -1 decelerating, 0 unknown -> NaN)."""
+    g, i = np.asarray(growth), np.asarray(inflation)
+    q = np.where(g > 0, np.where(i > 0, 2.0, 1.0), np.where(i > 0, 3.0, 4.0))
+    return np.where((g == 0) | (i == 0), np.nan, q)
+
+
+def quad_counts(votes: pd.DataFrame) -> pd.DataFrame:
+    """Daily number of signals voting for each quad (votes hold 1..4 or NaN)."""
+    v = votes.to_numpy()
+    counts = (v[:, :, None] == np.array(QUADS)).sum(axis=1).astype(np.int16)
+    return pd.DataFrame(counts, index=votes.index, columns=[f"Quad{q}" for q in QUADS])
+
+
+def quad_labels(votes: pd.DataFrame) -> pd.Series:
+    """Consensus quad per day (most votes; earliest quad wins ties, NaN if no votes)."""
+    counts = quad_counts(votes).to_numpy()
+    label = counts.argmax(axis=1) + 1.0
+    label[counts.sum(axis=1) == 0] = np.nan
+    return pd.Series(label, index=votes.index, name="quad")
+
+
+def quad_stats(close: pd.DataFrame, quads: pd.Series, assets: list[dict]) -> pd.DataFrame:
+    """Per-quad CAGR / vol / Sharpe / n_obs for every asset.
+
+    Returns a long table with columns
+    ``quad, ticker, name, category, cagr, vol, sharpe, n_obs``.
+    """
+    rets = close.pct_change()
+    quads = quads.reindex(rets.index)
+    meta = {a["ticker"]: a for a in assets}
+    rows = []
+    for q in QUADS:
+        r = rets[quads == q]
+        n = r.count()
+        growth = np.log1p(r).sum()
+        cagr = np.expm1(growth * TRADING_DAYS / n.replace(0, np.nan))
+        vol = r.std() * np.sqrt(TRADING_DAYS)
+        for t in close.columns:
+            if n[t] == 0:
+                continue
+            rows.append({
+                "quad": q,
+                "ticker": t,
+                "name": meta.get(t, {}).get("name", t),
+                "category": meta.get(t, {}).get("category") or "Other",
+                "cagr": cagr[t],
+                "vol": vol[t],
+                "sharpe": cagr[t] / vol[t] if vol[t] else np.nan,
+                "n_obs": int(n[t]),
+            })
+    return pd.DataFrame(rows, columns=["quad", "ticker", "name", "category", "cagr", "vol", "sharpe", "n_obs"])
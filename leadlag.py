@@ -0,0 +1,164 @@
+"""Lead–lag: which indicators lead which assets, from full cross-correlation functions.
+
+For every (indicator i, asset j) pair and every lag k in ``-max_lag..max_lag``
+the correlation of ``x_i[t]`` with ``y_j[t + k]`` is computed, so a peak at
+k > 0 means the indicator leads the asset by k days. Shifting pairs one at a
+time in pandas costs pairs x lags x N. Here the days are cut into segments
+of ``4 x max_lag``. Each indicator segment and each asset segment widened by
+``max_lag`` on both sides is transformed once (``np.fft.rfft``, float32). For
+every frequency the products summed over segments are one batched complex
+matmul, indicators x segments @ segments x assets. A short inverse transform
+per pair then gives every lag (overlap-save).
+
+Missing data is masked. Each series is standardised over its valid days and
+its gaps are set to 0, and the per-lag count of days where both are valid
+comes from the same transform applied to the masks. The correlation at lag k
+is the sum of products divided by that count; lags where it is below
+``MIN_OVERLAP`` are NaN. Transforms of at least segment + ``2 x max_lag``
+points keep the circular correlation from wrapping.
+
+500 indicators x 200 assets x 30 years of days at ±63 lags takes seconds on one
+core, in ``BLOCK_BYTES`` of working memory:
+
+    python leadlag.py --max-lag 63     # snapshot indicators vs. daily returns, top pairs
+"""
+import argparse
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+import percentiles
+from datastore import MarketStore
+from paths import STORE
+
+MAX_LAG = 63
+MIN_OVERLAP = 60              # days both series must share for a lag to count
+BLOCK_BYTES = 64 << 20        # frequency-domain products per indicator block
+
+
+@dataclass
+class LeadLag:
+    lags: np.ndarray              # -max_lag..max_lag
+    peak_lag: np.ndarray          # (indicators x assets); > 0: the indicator leads
+    peak_corr: np.ndarray         # signed correlation at the peak (NaN: no valid lag)
+    xcf: np.ndarray | None        # (indicators x assets x lags) when asked for
+
+
+def _fast_len(n: int) -> int:
+    """Smallest 2^a 3^b 5^c >= n (cheap sizes for the FFT)."""
+    best = 1 << (n - 1).bit_length()
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            m = p35
+            while m < n:
+                m *= 2
+            best = min(best, m)
+            p35 *= 3
+        p5 *= 5
+    return best
+
+
+def _prepare(a: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(days x series) -> standardised values with gaps at 0, and the validity mask."""
+    a = np.asarray(a, np.float64)
+    ok = np.isfinite(a)
+    n = ok.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mu = np.where(ok, a, 0).sum(axis=0) / n
+        sd = np.sqrt(np.where(ok, (a - mu) ** 2, 0).sum(axis=0) / n)
+        z = np.where(ok, (a - mu) / sd, 0)
+    z[:, ~(sd > 0)] = 0
+    return z.astype(np.float32), ok.astype(np.float32)
+
+
+def _segments(a: np.ndarray, seg: int, size: int, pad: int, count: int) -> np.ndarray:
+    """Spectra of ``count`` windows ``a[s*seg - pad : s*seg + seg + pad]`` (zero outside),
+    transformed to ``size`` points: (frequencies x windows x series), complex64."""
+    full = np.zeros((pad + count * seg + pad, a.shape[1]), np.float32)
+    full[pad:pad + len(a)] = a
+    width = seg + 2 * pad
+    idx = np.arange(count)[:, None] * seg + np.arange(width)
+    return np.ascontiguousarray(np.fft.rfft(full[idx], size, axis=1).transpose(1, 0, 2))
+
+
+def xcorr(X, Y, max_lag: int = MAX_LAG, min_overlap: int = MIN_OVERLAP, full: bool = False) -> LeadLag:
+    """Cross-correlation functions of every column of ``X`` against every column of ``Y``.
+
+    ``X`` (days x indicators) and ``Y`` (days x assets) share one calendar; NaN is
+    missing. ``xcf[i, j, k]`` is the correlation of ``X[t, i]`` with ``Y[t + lags[k], j]``.
+    """
+    xz, xm = _prepare(X)
+    yz, ym = _prepare(Y)
+    days, m = xz.shape
+    n = yz.shape[1]
+    K = max(0, min(max_lag, days - 1))
+    seg = max(4 * K, 64)
+    size = _fast_len(seg + 2 * K)            # no wrap-around for lags within ±K
+    count = -(-days // seg)
+    lags = np.arange(-K, K + 1)
+
+    # sum over segments of conj(X_s) * Y_s, per frequency: one batched matmul
+    Xs, Xms = _segments(xz, seg, size, 0, count), _segments(xm, seg, size, 0, count)
+    Ys, Yms = _segments(yz, seg, size, K, count), _segments(ym, seg, size, K, count)
+    np.conjugate(Xs, out=Xs)
+    np.conjugate(Xms, out=Xms)
+    XsT, XmsT = Xs.transpose(0, 2, 1), Xms.transpose(0, 2, 1)      # (freq x indicators x segments)
+
+    peak_lag = np.zeros((m, n), np.int64)
+    peak_corr = np.full((m, n), np.nan, np.float32)
+    xcf = np.full((m, n, len(lags)), np.nan, np.float32) if full else None
+    step = max(1, BLOCK_BYTES // (Xs.shape[0] * n * Xs.itemsize * 2))
+    for lo in range(0, m, step):
+        hi = min(lo + step, m)
+        num = np.fft.irfft(XsT[:, lo:hi] @ Ys, size, axis=0)[:2 * K + 1]
+        cnt = np.rint(np.fft.irfft(XmsT[:, lo:hi] @ Yms, size, axis=0)[:2 * K + 1])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            c = np.where(cnt >= min_overlap, num / cnt, np.nan)             # (lags x block x assets)
+        c = np.clip(c, -1, 1)
+        best = np.where(np.isfinite(c), np.abs(c), -1).argmax(axis=0)
+        peak_lag[lo:hi] = lags[best]
+        peak_corr[lo:hi] = np.take_along_axis(c, best[None], axis=0)[0]
+        if full:
+            xcf[lo:hi] = np.moveaxis(c, 0, -1)
+    peak_lag[~np.isfinite(peak_corr)] = 0
+    return LeadLag(lags, peak_lag, peak_corr, xcf)
+
+
+def table(X: pd.DataFrame, Y: pd.DataFrame, max_lag: int = MAX_LAG, min_overlap: int = MIN_OVERLAP) -> pd.DataFrame:
+    """Long table of every pair's peak: indicator, asset, lag, corr (strongest first)."""
+    Y = Y.reindex(X.index)
+    r = xcorr(X.to_numpy(), Y.to_numpy(), max_lag, min_overlap)
+    out = pd.DataFrame({
+        "indicator": np.repeat(X.columns.to_numpy(), Y.shape[1]),
+        "asset": np.tile(Y.columns.to_numpy(), X.shape[1]),
+        "lag": r.peak_lag.ravel(),
+        "corr": r.peak_corr.ravel(),
+    })
+    return out.dropna().sort_values("corr", key=np.abs, ascending=False, ignore_index=True)
+
+
+def market_inputs(store: MarketStore) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Snapshot indicator readings (one column per indicator x asset) and daily returns."""
+    series = percentiles.specs()
+    parts = percentiles.tail_values(store, series, 0)
+    cols = {f"{series[name].label}|{t}": v[:, i] for name, v in parts.items() for i, t in enumerate(store.tickers)}
+    X = pd.DataFrame(cols, index=store.dates).diff()        # changes, not levels: levels trend
+    Y = store.frame("close").pct_change()
+    return X, Y
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--max-lag", type=int, default=MAX_LAG)
+    ap.add_argument("--min-overlap", type=int, default=MIN_OVERLAP)
+    ap.add_argument("--top", type=int, default=25, help="pairs to print")
+    ap.add_argument("--out", help="write the full pair table to this CSV")
+    args = ap.parse_args()
+    X, Y = market_inputs(MarketStore(STORE))
+    t = table(X, Y, args.max_lag, args.min_overlap)
+    if args.out:
+        t.to_csv(args.out, index=False)
+    print(t.head(args.top).to_string(index=False))
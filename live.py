@@ -0,0 +1,215 @@
+"""Live mode for the Dashboards charts.
+
+When the market and regime stores are present (``data/store``,
+``data/regimes``), each Dashboards chart is drawn from them with the same
+recipe ``build`` uses for the saved HTML. Each chart sits in its own fragment,
+which re-runs every ``POLL_SECONDS`` without rerunning the rest of the page. A
+tick that finds newly committed rows sends only the change to the chart the
+browser already has:
+
+* consensus lines: the new days are appended (``Plotly.extendTraces``);
+* snapshot treemaps: tile colours and values and the as-of title are replaced
+  (``Plotly.restyle`` / ``relayout``). A tick only redraws a treemap when the
+  asset list changed. Treemaps are drawn from the compact spec
+  (``figures.emit``); their patches carry the same rounded values as lists.
+
+The chart iframe is re-emitted unchanged on every tick, so the browser keeps it
+and Streamlit sends it as a cached reference. Patches travel from a small
+script in the fragment to the iframe over a ``BroadcastChannel``. Every patch
+describes the whole change since the version the iframe was drawn at (an
+append carries every row since then), so a missed patch is made up by the
+next one, and the iframe skips the part of an append it already has. The page
+keeps the latest patch per chart and answers an iframe that starts listening
+after it was sent; patches for an older drawing are ignored.
+"""
+import json
+import threading
+
+import plotly.io as pio
+import streamlit as st
+import streamlit.components.v1 as components
+
+import build
+import embeds
+import figures
+import indicators
+import metrics
+import theme
+from datastore import MarketStore
+from paths import REGIMES, STORE
+
+POLL_SECONDS = 5.0
+CHANNEL = "live-charts"
+CHARTS = ("Daily_Quad_Consensus_Counts", "Snapshot_63d_RollingCAGR", "Snapshot_MAD_20_50", "Snapshot_Stoch_D")
+EXTEND = {"Daily_Quad_Consensus_Counts"}     # time series: new rows are appended
+
+# runs inside the chart iframe once the plot exists ({plot_id} is filled in by plotly)
+_LISTENER = """
+const gd = document.getElementById('{plot_id}');
+const ch = new BroadcastChannel(%(channel)s);
+ch.onmessage = (e) => {
+  const m = e.data;
+  if (!m || m.chart !== %(chart)s || m.base !== %(base)s) return;
+  if (m.op === "extend") {
+    const skip = gd.data[0].x.length - m.start;
+    if (skip < 0 || skip >= m.x.length) return;   // already applied
+    const idx = m.y.map((_, i) => i);
+    Plotly.extendTraces(gd, {x: idx.map(() => m.x.slice(skip)), y: m.y.map((col) => col.slice(skip))}, idx);
+  } else if (m.op === "restyle") {
+    Plotly.restyle(gd, m.data, [0]);
+    Plotly.relayout(gd, m.layout);
+  }
+};
+ch.postMessage({op: "hello", chart: %(chart)s});   // catch up on a patch sent before this listener existed
+"""
+# runs in the page: keeps the latest patch per chart and replays it to iframes that say hello
+_SEND = """<script>(() => {
+  const live = window.__livePatches = window.__livePatches || {};
+  if (!window.__liveChannel) {
+    window.__liveChannel = new BroadcastChannel(%s);
+    window.__liveChannel.onmessage = (e) => {
+      const m = e.data;
+      if (m && m.op === "hello" && live[m.chart]) window.__liveChannel.postMessage(live[m.chart]);
+    };
+  }
+  const m = %s;
+  live[m.chart] = m;
+  window.__liveChannel.postMessage(m);
+})();</script>"""
+
+_lock = threading.Lock()     # the stores are shared by every session
+
+
+# ──────────────────────────────────────────────────────────────
+# DATA
+# ──────────────────────────────────────────────────────────────
+def available() -> bool:
+    return (STORE / "dates.i4").exists() and (REGIMES / "dates.i4").exists()
+
+
+@st.cache_resource(show_spinner=False)
+def _stores() -> dict[str, MarketStore]:
+    return {"market": MarketStore(STORE), "regimes": MarketStore(REGIMES)}
+
+
+def _store(name: str) -> MarketStore:
+    return _stores()["regimes" if build.ARTIFACTS[name].regimes else "market"]
+
+
+def _version(name: str) -> tuple:
+    with _lock:
+        s = _store(name)
+        s.refresh()
+        return s.version
+
+
+def _tag(version: tuple) -> str:
+    """Version a chart was drawn at, as patches and the iframe carry it."""
+    return "-".join(map(str, version))
+
+
+def _plain(obj):
+    """Typed arrays back to lists: ``extendTraces`` / ``restyle`` take plain arrays."""
+    if isinstance(obj, dict):
+        if "bdata" in obj:
+            return figures.decode(obj).tolist()
+        return {k: _plain(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_plain(v) for v in obj]
+    return obj
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _figure(name: str, version: tuple) -> dict:
+    a = build.ARTIFACTS[name]
+    fig = a.recipe(build.Inputs(STORE, REGIMES), **a.params)
+    if name in EXTEND:      # appended to in the browser, so its arrays stay plain
+        return theme.apply(_plain(json.loads(fig.to_json())))
+    spec, _ = figures.emit(fig, name)
+    return theme.apply(spec)
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _html(name: str, version: tuple, height: int) -> str:
+    spec = _figure(name, version)
+    spec = {**spec, "layout": {**spec["layout"], "height": height}}
+    raw = pio.to_html(
+        spec, validate=False, include_plotlyjs="cdn", full_html=True, config={"responsive": True},
+        post_script=_LISTENER % {"channel": json.dumps(CHANNEL), "chart": json.dumps(name),
+                                 "base": json.dumps(_tag(version))},
+    )
+    return embeds.tighten(raw, height)
+
+
+# ──────────────────────────────────────────────────────────────
+# PATCHES
+# ──────────────────────────────────────────────────────────────
+def _base(name: str) -> dict:
+    """Per-session chart state: version drawn, version last patched to, rows drawn / sent."""
+    v = _version(name)
+    rows = len(_figure(name, v)["data"][0]["x"]) if name in EXTEND else None
+    return {"base": v, "seen": v, "drawn": rows, "rows": rows}
+
+
+def _extend(name: str, state: dict) -> dict | None:
+    """Every row since the drawn version, so a patch the iframe missed is made up by this one."""
+    s = _store(name)
+    with _lock:
+        if len(s) <= state["rows"]:
+            return None
+        votes = s.frame("quad", start=s.dates[state["drawn"]])
+    counts = indicators.quad_counts(votes)
+    patch = {
+        "chart": name, "op": "extend", "base": _tag(state["base"]), "start": state["drawn"],
+        "x": list(counts.index.strftime("%Y-%m-%d")),
+        "y": [counts[c].tolist() for c in counts.columns],
+    }
+    state["rows"] = state["drawn"] + len(counts)
+    return patch
+
+
+def _restyle(name: str, state: dict, version: tuple) -> dict | None:
+    new = _plain(_figure(name, version)["data"][0])
+    if new["labels"] != _plain(_figure(name, state["base"])["data"][0]["labels"]):
+        state.update(_base(name))     # asset list changed: redraw instead
+        return None
+    return {
+        "chart": name, "op": "restyle", "base": _tag(state["base"]),
+        "data": {
+            "marker.colors": [new["marker"]["colors"]],
+            "marker.cmin": new["marker"]["cmin"],
+            "marker.cmax": new["marker"]["cmax"],
+            "customdata": [new["customdata"]],
+        },
+        "layout": {"title.text": _figure(name, version)["layout"]["title"]["text"]},
+    }
+
+
+def _patch(name: str, state: dict, version: tuple) -> dict | None:
+    patch = _extend(name, state) if name in EXTEND else _restyle(name, state, version)
+    state["seen"] = version
+    return patch
+
+
+# ──────────────────────────────────────────────────────────────
+# FRAGMENTS
+# ──────────────────────────────────────────────────────────────
+@st.fragment(run_every=POLL_SECONDS)
+def _live(name: str, height: int):
+    state = st.session_state[f"live-{name}"]
+    version = _version(name)
+    patch = None
+    if version != state["seen"]:
+        with metrics.section(f"live:{name}"):
+            patch = _patch(name, state, version)
+    # gap=None: the (invisible) patch script must not push the page around
+    with st.container(gap=None):
+        components.html(_html(name, state["base"], height), height=height + 20, scrolling=False)
+        body = _SEND % (json.dumps(CHANNEL), json.dumps(patch).replace("</", "<\\/")) if patch else "<script></script>"
+        st.html(body, unsafe_allow_javascript=True)
+
+
+def chart(name: str, height: int = 520):
+    """Draw ``name`` at the stores' current version and keep it updated in place."""
+    st.session_state[f"live-{name}"] = _base(name)   # a full run redraws from scratch
+    _live(name, height)
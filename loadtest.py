@@ -0,0 +1,392 @@
+"""Concurrent-session load test for the Streamlit apps.
+
+Starts an app locally (headless, free port), opens N websocket sessions that
+speak Streamlit's own protocol, and replays a navigation walk over the sidebar
+``Navigate`` radio, clicking PDF downloads along the way. Records rerun
+latency (rerun request -> script_finished), server RSS and bytes received per
+session, for each session count in ``--sessions``. Everything runs against
+127.0.0.1; nothing leaves the machine.
+
+    python loadtest.py app.py app2.py app3.py --sessions 1,5,10,25
+    python loadtest.py app.py --sessions 1,10 --steps 8 --think 0.2
+    python loadtest.py app.py --query v=3          # one variant of the single-process site
+
+Results go to ``loadtest-results/<app>.json`` plus a text report per app.
+Needs the dev requirements (``pip install -r requirements-dev.txt``).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+from datastore import atomic_write_text
+from paths import APP_DIR
+
+OUT_DIR = APP_DIR / "loadtest-results"
+NAV_LABEL = "Navigate"
+QUANTILES = (0.5, 0.95, 0.99)
+RSS_INTERVAL = 0.25        # seconds between server RSS samples
+READY_TIMEOUT = 60.0
+RERUN_TIMEOUT = 120.0
+
+
+# ──────────────────────────────────────────────────────────────
+# SERVER
+# ──────────────────────────────────────────────────────────────
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def rss_bytes(pid: int) -> int | None:
+    """Resident set size of ``pid`` (Linux /proc; None elsewhere)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+class Server:
+    """``streamlit run <app>`` on a private port for the duration of a ``with`` block."""
+
+    def __init__(self, app: str, env: dict | None = None):
+        self.app = app
+        self.port = _free_port()
+        self.base = f"http://127.0.0.1:{self.port}"
+        self.env = {**os.environ, **(env or {})}
+        self.proc: subprocess.Popen | None = None
+
+    def __enter__(self):
+        cmd = [
+            sys.executable, "-m", "streamlit", "run", self.app,
+            "--server.headless", "true",
+            "--server.address", "127.0.0.1",
+            "--server.port", str(self.port),
+            "--browser.gatherUsageStats", "false",
+            "--server.fileWatcherType", "none",
+        ]
+        self.proc = subprocess.Popen(cmd, cwd=APP_DIR, env=self.env,
+                                     stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        deadline = time.monotonic() + READY_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.proc.poll() is not None:
+                raise RuntimeError(f"{self.app} exited: {self.proc.stderr.read().decode(errors='replace')[-2000:]}")
+            try:
+                with urllib.request.urlopen(f"{self.base}/_stcore/health", timeout=1) as r:
+                    if r.status == 200:
+                        return self
+            except OSError:
+                time.sleep(0.2)
+        self.__exit__()
+        raise TimeoutError(f"{self.app} not healthy after {READY_TIMEOUT:.0f}s")
+
+    def __exit__(self, *exc):
+        if self.proc and self.proc.poll() is None:
+            self.proc.terminate()
+            try:
+                self.proc.wait(10)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+
+    def rss(self) -> int | None:
+        return rss_bytes(self.proc.pid) if self.proc else None
+
+
+# ──────────────────────────────────────────────────────────────
+# SESSION
+# ──────────────────────────────────────────────────────────────
+@dataclass
+class SessionStats:
+    reruns: list = field(default_factory=list)      # (page, seconds, bytes)
+    downloads: list = field(default_factory=list)   # (label, seconds, bytes)
+    bytes_in: int = 0
+    errors: list = field(default_factory=list)
+
+
+class Session:
+    """One browser tab: a websocket plus the widget state the frontend would send."""
+
+    def __init__(self, base: str, query: str = ""):
+        self.base = base
+        self.query = query
+        self.ws = None
+        self.session_id = ""
+        self.nav: tuple[str, list[str]] | None = None   # (widget id, options)
+        self.buttons: list[tuple[str, str, str]] = []    # (label, url, deferred_file_id)
+        self.stats = SessionStats()
+
+    async def __aenter__(self):
+        url = self.base.replace("http://", "ws://") + "/_stcore/stream"
+        self.ws = await websockets.connect(url, subprotocols=["streamlit"], max_size=None,
+                                           compression=None, open_timeout=READY_TIMEOUT)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.ws.close()
+
+    async def _send(self, msg: BackMsg):
+        await self.ws.send(msg.SerializeToString())
+
+    async def _recv(self) -> ForwardMsg:
+        raw = await asyncio.wait_for(self.ws.recv(), RERUN_TIMEOUT)
+        self.stats.bytes_in += len(raw)
+        msg = ForwardMsg()
+        msg.ParseFromString(raw)
+        return msg
+
+    def _scan(self, msg: ForwardMsg):
+        if msg.WhichOneof("type") == "new_session":
+            self.session_id = msg.new_session.initialize.session_id
+        if msg.WhichOneof("type") != "delta" or msg.delta.WhichOneof("type") != "new_element":
+            return
+        el = msg.delta.new_element
+        kind = el.WhichOneof("type")
+        if kind == "radio" and el.radio.label == NAV_LABEL:
+            self.nav = (el.radio.id, list(el.radio.options))
+        elif kind == "download_button":
+            b = el.download_button
+            self.buttons.append((b.label, b.url, b.deferred_file_id))
+
+    async def rerun(self, page: str | None = None) -> float:
+        """Request a rerun (optionally switching page) and wait for it to finish."""
+        back = BackMsg()
+        back.rerun_script.query_string = self.query
+        if page is not None and self.nav:
+            back.rerun_script.widget_states.widgets.append(WidgetState(id=self.nav[0], string_value=page))
+        self.buttons = []
+        start_bytes = self.stats.bytes_in
+        t0 = time.perf_counter()
+        await self._send(back)
+        while True:
+            msg = await self._recv()
+            self._scan(msg)
+            if msg.WhichOneof("type") == "script_finished":
+                if msg.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    continue
+                break
+        dt = time.perf_counter() - t0
+        shown = page or (self.nav[1][0] if self.nav else "")
+        self.stats.reruns.append((shown, dt, self.stats.bytes_in - start_bytes))
+        if msg.script_finished != ForwardMsg.FINISHED_SUCCESSFULLY:
+            self.stats.errors.append(f"rerun {shown}: {ForwardMsg.ScriptFinishedStatus.Name(msg.script_finished)}")
+        return dt
+
+    async def download(self, label: str, url: str, deferred_id: str):
+        """Click a download button: resolve a deferred file if needed, then GET it."""
+        t0 = time.perf_counter()
+        if deferred_id:
+            back = BackMsg()
+            req = back.backend_operation_request
+            req.request_id = uuid.uuid4().hex
+            req.session_id = self.session_id
+            req.deferred_file.file_id = deferred_id
+            await self._send(back)
+            while True:
+                msg = await self._recv()
+                if msg.WhichOneof("type") == "backend_operation_response" \
+                        and msg.backend_operation_response.request_id == req.request_id:
+                    break
+            resp = msg.backend_operation_response
+            if resp.error_msg:
+                self.stats.errors.append(f"download {label}: {resp.error_msg}")
+                return
+            url = resp.deferred_file.url
+        n = await asyncio.to_thread(_fetch, self.base + url if url.startswith("/") else url)
+        self.stats.downloads.append((label, time.perf_counter() - t0, n))
+
+
+def _fetch(url: str) -> int:
+    n = 0
+    with urllib.request.urlopen(url, timeout=RERUN_TIMEOUT) as r:
+        while chunk := r.read(1 << 16):
+            n += len(chunk)
+    return n
+
+
+async def _walk(base: str, seed: int, steps: int, think: float, p_download: float,
+                query: str, stagger: float) -> SessionStats:
+    """Land on the app, then hop between pages at random, sometimes downloading."""
+    rng = random.Random(seed)
+    await asyncio.sleep(rng.uniform(0, stagger))
+    async with Session(base, query) as s:
+        try:
+            await s.rerun()
+            if not s.nav:
+                s.stats.errors.append(f"no '{NAV_LABEL}' radio found")
+                return s.stats
+            current = s.nav[1][0]
+            for _ in range(steps):
+                await asyncio.sleep(rng.uniform(0.5, 1.5) * think)
+                current = rng.choice([o for o in s.nav[1] if o != current] or s.nav[1])
+                await s.rerun(current)
+                if s.buttons and rng.random() < p_download:
+                    await s.download(*rng.choice(s.buttons))
+        except (asyncio.TimeoutError, websockets.ConnectionClosed, OSError) as e:
+            s.stats.errors.append(f"{type(e).__name__}: {e}")
+        return s.stats
+
+
+# ──────────────────────────────────────────────────────────────
+# RUN
+# ──────────────────────────────────────────────────────────────
+async def _sample_rss(server: Server, out: list, stop: asyncio.Event):
+    while not stop.is_set():
+        rss = server.rss()
+        if rss is not None:
+            out.append(rss)
+        try:
+            await asyncio.wait_for(stop.wait(), RSS_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_level(server: Server, n: int, steps: int, think: float, p_download: float,
+                    query: str, seed: int) -> dict:
+    rss, stop = [], asyncio.Event()
+    sampler = asyncio.create_task(_sample_rss(server, rss, stop))
+    rss_before = server.rss()
+    t0 = time.perf_counter()
+    stats = await asyncio.gather(*[
+        _walk(server.base, seed * 100_003 + i, steps, think, p_download, query, stagger=think)
+        for i in range(n)
+    ])
+    wall = time.perf_counter() - t0
+    stop.set()
+    await sampler
+    return summarize(n, stats, wall, rss_before, rss)
+
+
+def _q_ms(values) -> dict:
+    if not len(values):
+        return {f"p{int(q * 100)}_ms": None for q in QUANTILES}
+    return {f"p{int(q * 100)}_ms": float(x) for q, x in zip(QUANTILES, np.quantile(np.asarray(values) * 1e3, QUANTILES))}
+
+
+def summarize(n: int, stats: list[SessionStats], wall: float, rss_before: int | None, rss: list) -> dict:
+    lat = [dt for s in stats for _, dt, _ in s.reruns]
+    by_page = {}
+    for s in stats:
+        for page, dt, _ in s.reruns:
+            by_page.setdefault(page, []).append(dt)
+    dl = [dt for s in stats for _, dt, _ in s.downloads]
+    return {
+        "sessions": n,
+        "wall_s": wall,
+        "reruns": len(lat),
+        "reruns_per_s": len(lat) / wall if wall else None,
+        "rerun": {**_q_ms(lat), "mean_ms": float(np.mean(lat) * 1e3) if lat else None},
+        "rerun_by_page": {p: _q_ms(v) for p, v in sorted(by_page.items())},
+        "downloads": len(dl),
+        "download": _q_ms(dl),
+        "download_bytes": sum(b for s in stats for *_, b in s.downloads),
+        "bytes_per_session": {
+            "mean": float(np.mean([s.bytes_in for s in stats])),
+            "max": max(s.bytes_in for s in stats),
+        },
+        "bytes_per_rerun_mean": float(np.mean([b for s in stats for *_, b in s.reruns])) if lat else None,
+        "rss_mb": {
+            "before": rss_before / 2**20 if rss_before else None,
+            "peak": max(rss) / 2**20 if rss else None,
+            "end": rss[-1] / 2**20 if rss else None,
+        },
+        "errors": [e for s in stats for e in s.errors],
+    }
+
+
+def run_app(app: str, levels: list[int], steps: int, think: float, p_download: float,
+            query: str, seed: int, env: dict | None = None) -> dict:
+    with Server(app, env) as server:
+        # one throwaway session so imports / caches are warm for every level alike
+        asyncio.run(run_level(server, 1, 0, 0.0, 0.0, query, seed))
+        results = [asyncio.run(run_level(server, n, steps, think, p_download, query, seed)) for n in levels]
+    return {
+        "app": app,
+        "query": query,
+        "config": {"steps": steps, "think_s": think, "p_download": p_download, "seed": seed,
+                   "pdf_download_mode": (env or {}).get("PDF_DOWNLOAD_MODE", os.environ.get("PDF_DOWNLOAD_MODE", "deferred"))},
+        "levels": results,
+    }
+
+
+def capacity(result: dict, slo_ms: float) -> int | None:
+    """Largest tested session count whose p95 rerun latency is within ``slo_ms``."""
+    ok = [lv["sessions"] for lv in result["levels"] if lv["rerun"]["p95_ms"] is not None
+          and lv["rerun"]["p95_ms"] <= slo_ms and not lv["errors"]]
+    return max(ok) if ok else None
+
+
+def report(result: dict, slo_ms: float) -> str:
+    def f(x, spec=".0f"):
+        return "-" if x is None else format(x, spec)
+
+    lines = [
+        f"{result['app']}{'?' + result['query'] if result['query'] else ''}  "
+        f"(steps {result['config']['steps']}, think {result['config']['think_s']}s, "
+        f"downloads {result['config']['pdf_download_mode']})",
+        f"{'sessions':>8}  {'reruns/s':>8}  {'p50 ms':>7}  {'p95 ms':>7}  {'p99 ms':>7}  "
+        f"{'KB/session':>10}  {'KB/rerun':>8}  {'RSS MB':>13}  {'dl p95 ms':>9}  errors",
+    ]
+    for lv in result["levels"]:
+        r, m = lv["rerun"], lv["rss_mb"]
+        lines.append(
+            f"{lv['sessions']:>8}  {f(lv['reruns_per_s'], '.1f'):>8}  {f(r['p50_ms']):>7}  {f(r['p95_ms']):>7}  "
+            f"{f(r['p99_ms']):>7}  {f(lv['bytes_per_session']['mean'] / 1024):>10}  "
+            f"{f(lv['bytes_per_rerun_mean'] and lv['bytes_per_rerun_mean'] / 1024):>8}  "
+            f"{f(m['before']) + ' -> ' + f(m['peak']):>13}  {f(lv['download']['p95_ms']):>9}  {len(lv['errors'])}"
+        )
+    cap = capacity(result, slo_ms)
+    lines.append(f"capacity at p95 <= {slo_ms:.0f} ms: {cap if cap is not None else 'none of the tested levels'}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("apps", nargs="*", default=["app.py", "app2.py", "app3.py"])
+    ap.add_argument("--sessions", default="1,5,10,25", help="comma-separated concurrent session counts")
+    ap.add_argument("--steps", type=int, default=12, help="page changes per session")
+    ap.add_argument("--think", type=float, default=1.0, help="mean think time between clicks (s)")
+    ap.add_argument("--download", type=float, default=0.25, help="chance of a download after a page change")
+    ap.add_argument("--query", default="", help="query string sent with every rerun")
+    ap.add_argument("--mode", choices=["deferred", "static", "inline"], default=None,
+                    help="PDF_DOWNLOAD_MODE for the server (default: inherit)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--slo", type=float, default=1000.0, help="p95 rerun latency budget (ms)")
+    ap.add_argument("--out", type=Path, default=OUT_DIR)
+    args = ap.parse_args()
+
+    levels = [int(x) for x in args.sessions.split(",") if x.strip()]
+    env = {"PDF_DOWNLOAD_MODE": args.mode} if args.mode else None
+    args.out.mkdir(parents=True, exist_ok=True)
+    caps = []
+    for app in args.apps:
+        result = run_app(app, levels, args.steps, args.think, args.download, args.query, args.seed, env)
+        result["capacity"] = {"slo_p95_ms": args.slo, "sessions": capacity(result, args.slo)}
+        caps.append((app, result["capacity"]["sessions"]))
+        stem = "-".join(filter(None, [Path(app).stem, re.sub(r"\W+", "_", args.query), args.mode]))
+        atomic_write_text(args.out / f"{stem}.json", json.dumps(result, indent=1))
+        text = report(result, args.slo)
+        atomic_write_text(args.out / f"{stem}.txt", text + "\n")
+        print(text, end="\n\n")
+    if len(caps) > 1:
+        print(f"capacity at p95 <= {args.slo:.0f} ms: " + ", ".join(f"{a} {c if c is not None else '-'}" for a, c in caps))
@@ -0,0 +1,175 @@
+"""Per-section render timing.
+
+Wrap a page block in ``section(name)`` (or a helper in ``@timed(name)``) to
+record its wall time and the bytes it emitted into a process-wide ring buffer.
+Inside a Streamlit script run the outermost open section taps the session's
+message queue, so every element sent counts towards every open section;
+``count_bytes`` covers anything sent another way.
+
+``summary`` gives p50/p95/p99 per section, and ``render_admin`` shows them on
+the ``?admin=<key>`` page. That page exists only when ``METRICS_ADMIN_KEY`` is
+set, and only for that key. If ``METRICS_PROM_FILE`` is set the same numbers are
+written there in Prometheus text format.
+"""
+import functools
+import hmac
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from datastore import atomic_write_text
+
+RING_SIZE = 20_000
+PROM_FILE = os.environ.get("METRICS_PROM_FILE")
+ADMIN_KEY = os.environ.get("METRICS_ADMIN_KEY")   # unset: no admin page
+PROM_INTERVAL = 15.0  # seconds between Prometheus file rewrites
+QUANTILES = (0.5, 0.95, 0.99)
+
+_ring: deque = deque(maxlen=RING_SIZE)   # (t_end, section, seconds, bytes)
+_lock = threading.Lock()
+_active: ContextVar[tuple] = ContextVar("metrics_active", default=())
+_last_prom = 0.0
+
+
+class _Record:
+    __slots__ = ("name", "bytes")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.bytes = 0
+
+
+def count_bytes(n: int):
+    """Attribute ``n`` emitted bytes to every section currently open."""
+    for rec in _active.get():
+        rec.bytes += n
+
+
+def _script_ctx():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx if ctx is not None and hasattr(ctx, "_enqueue") else None
+
+
+@contextmanager
+def section(name: str):
+    rec = _Record(name)
+    outermost = not _active.get()
+    ctx = _script_ctx() if outermost else None
+    if ctx is not None:
+        send = ctx._enqueue
+
+        def tapped(msg):
+            count_bytes(msg.ByteSize())
+            send(msg)
+        ctx._enqueue = tapped
+    token = _active.set(_active.get() + (rec,))
+    t0 = time.perf_counter()
+    try:
+        yield rec
+    finally:
+        elapsed = time.perf_counter() - t0
+        _active.reset(token)
+        if ctx is not None:
+            ctx._enqueue = send
+        with _lock:
+            _ring.append((time.time(), name, elapsed, rec.bytes))
+        if PROM_FILE:
+            _maybe_write_prom()
+
+
+def timed(name: str | None = None):
+    """Decorator form of ``section``."""
+    def deco(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with section(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+def samples() -> pd.DataFrame:
+    with _lock:
+        rows = list(_ring)
+    return pd.DataFrame(rows, columns=["t", "section", "seconds", "bytes"])
+
+
+def summary() -> pd.DataFrame:
+    """One row per section: count, p50/p95/p99 ms, mean / p95 bytes."""
+    df = samples()
+    cols = ["section", "count", "p50_ms", "p95_ms", "p99_ms", "mean_bytes", "p95_bytes"]
+    if df.empty:
+        return pd.DataFrame(columns=cols)
+    rows = []
+    for name, g in df.groupby("section", sort=True):
+        ms = np.quantile(g["seconds"].to_numpy() * 1e3, QUANTILES)
+        rows.append([name, len(g), *ms, g["bytes"].mean(), np.quantile(g["bytes"], 0.95)])
+    return pd.DataFrame(rows, columns=cols).sort_values("p95_ms", ascending=False, ignore_index=True)
+
+
+def prometheus_text() -> str:
+    df = samples()
+    out = [
+        "# HELP app_section_seconds Wall time spent rendering a page section.",
+        "# TYPE app_section_seconds summary",
+    ]
+    byte_lines = [
+        "# HELP app_section_bytes Bytes emitted by a page section.",
+        "# TYPE app_section_bytes summary",
+    ]
+    for name, g in df.groupby("section", sort=True):
+        label = name.replace("\\", "\\\\").replace('"', '\\"')
+        for lines, col in ((out, "seconds"), (byte_lines, "bytes")):
+            v = g[col].to_numpy(dtype=float)
+            metric = f"app_section_{col}"
+            for q, x in zip(QUANTILES, np.quantile(v, QUANTILES)):
+                lines.append(f'{metric}{{section="{label}",quantile="{q}"}} {x:.6g}')
+            lines.append(f'{metric}_sum{{section="{label}"}} {v.sum():.6g}')
+            lines.append(f'{metric}_count{{section="{label}"}} {len(v)}')
+    return "\n".join(out + byte_lines) + "\n"
+
+
+def _maybe_write_prom():
+    global _last_prom
+    now = time.monotonic()
+    with _lock:
+        if now - _last_prom < PROM_INTERVAL:
+            return
+        _last_prom = now
+    atomic_write_text(Path(PROM_FILE), prometheus_text())
+
+
+def is_admin(key: str | None) -> bool:
+    """True only when ``METRICS_ADMIN_KEY`` is set and ``key`` matches it."""
+    return bool(ADMIN_KEY) and key is not None and hmac.compare_digest(key.encode(), ADMIN_KEY.encode())
+
+
+def render_admin():
+    """Metrics page (``?admin=<METRICS_ADMIN_KEY>``)."""
+    import streamlit as st
+
+    st.subheader("Render metrics")
+    df = summary()
+    st.caption(f"{len(samples())} samples in a {RING_SIZE}-entry ring buffer, process-wide.")
+    import warmup
+    w = warmup.start()
+    if w.ready.is_set():
+        st.caption(f"Cache warm-up: ready in {w.seconds:.2f}s, {len(w.done)} items"
+                   + (f", {len(w.errors)} failed: {w.errors}" if w.errors else ""))
+    else:
+        st.caption(f"Cache warm-up: running ({len(w.done)} items so far)")
+    st.dataframe(df, width="stretch", hide_index=True)
+    st.download_button("Prometheus text", prometheus_text(), file_name="metrics.prom", mime="text/plain")
@@ -0,0 +1,541 @@
+# microsite.py
+"""The microsite, rendered from a layout spec (see ``variants``).
+
+``serve`` runs in app.py / app2.py / app3.py. One process serves every
+variant: ``?v=<name>`` or the ``/v<name>`` route picks one, otherwise the
+script's default is shown. All variants share the process-wide caches (PDF
+buffers, chart HTML, images, search index), so extra variants cost no extra
+memory or warm-up.
+"""
+from functools import partial
+from pathlib import Path
+import streamlit as st
+import streamlit.components.v1 as components  # for embedding saved HTMLs
+
+import analogs
+import embeds
+import live
+import metrics
+import percentiles
+import quads
+import regime
+import scoreboard
+import search
+import styles
+import variants
+import warmup
+from downloads import pdf_button, pdf_preview
+
+# ──────────────────────────────────────────────────────────────
+# CONFIG
+# ──────────────────────────────────────────────────────────────
+PAGE_TITLE = "Dylan Sturdevant — Investment Research & Analytics"
+
+CASE_CARD_CSS = """
+    <style>
+
+    .case-card {
+        background-color: rgba(255,255,255,0.04);
+        border: 1px solid rgba(255,255,255,0.12);
+        border-radius: 12px;
+        padding: 18px 20px;
+        margin-bottom: 26px;
+        transition: all 0.2s ease-in-out;
+    }
+
+    .case-card:hover {
+        border-color: rgba(255,255,255,0.25);
+        background-color: rgba(255,255,255,0.06);
+        transform: translateY(-2px);
+    }
+
+    .case-card h4 {
+        margin-top: 0;
+        margin-bottom: 10px;
+        font-weight: 700;
+        font-size: 18px;
+    }
+
+    .case-card ul {
+        margin-top: 10px;
+        padding-left: 20px;
+    }
+
+    .case-card li {
+        margin-bottom: 6px;
+        font-size: 15px;
+    }
+
+    </style>
+    """
+
+THEME_CSS = """
+    <style>
+      :root { --bg:#0B1220; --card:#0f172a; --muted:#9fb3c8; }
+      .stApp { background: var(--bg) !important; color: #fff !important; }
+      .card {
+        background: var(--card); border-radius: 16px; padding: 16px;
+        border: 1px solid rgba(255,255,255,0.08); box-shadow: 0 10px 30px rgba(0,0,0,0.25);
+      }
+      .muted { color: var(--muted); }
+      .kpi {
+        background: rgba(255,255,255,0.04); border: 1px solid rgba(255,255,255,0.12);
+        padding: 14px; border-radius: 14px;
+      }
+      .pill {
+        display:inline-block; padding: 4px 10px; border-radius: 999px;
+        background: rgba(59,130,246,0.15); border: 1px solid rgba(59,130,246,0.35);
+        color: #cfe0ff; font-size: 12px; margin-right: 8px;
+      }
+      hr { border: none; height: 1px; background: rgba(255,255,255,0.08); margin: 12px 0; }
+    </style>
+    """
+
+BULLET_CSS = """
+    <style>
+      .bullet-wrap h4{
+        margin:0 0 10px 0;
+        font-weight:700;          /* heading weight */
+        font-size:18px;           /* heading size */
+      }
+      .bullet-wrap ul{
+        margin:0;
+        padding-left:22px;
+        line-height:1.65;         /* line spacing */
+      }
+      .bullet-wrap ul li{
+        font-size:16px;           /* <<< bullet size */
+        font-weight:600;          /* <<< 400=normal, 600=semibold, 700=bold */
+        color:#f3f6fa;            /* <<< bullet color */
+        margin-bottom:6px;        /* space between bullets */
+      }
+    </style>
+    """
+
+# the Framework and Dashboards notes share one rule (the side margin only shows
+# when two pills sit on a line)
+TOOLTIP_CSS = """
+    <style>
+    .tooltip {
+      position: relative;
+      display: inline-block;
+      cursor: help;
+      color: #cfe0ff;
+      border: 1px solid rgba(255,255,255,.18);
+      border-radius: 999px;
+      padding: 6px 12px;
+      font-size: 13px;
+      margin: 0 6px;
+    }
+    .tooltip .tooltiptext {
+      visibility: hidden;
+      width: 280px;
+      background-color: #1f2937;
+      color: #f9fafb;
+      text-align: left;
+      border-radius: 6px;
+      padding: 8px 10px;
+      position: absolute;
+      z-index: 1;
+      bottom: 125%;
+      left: 50%;
+      margin-left: -140px;
+      opacity: 0;
+      transition: opacity 0.25s;
+      border: 1px solid rgba(255,255,255,.15);
+      box-shadow: 0 4px 12px rgba(0,0,0,0.3);
+    }
+    .tooltip:hover .tooltiptext {
+      visibility: visible;
+      opacity: 1;
+    }
+    </style>
+    """
+
+styles.register("theme", THEME_CSS)
+styles.register("case-card", CASE_CARD_CSS)
+styles.register("bullet-wrap", BULLET_CSS)
+styles.register("tooltip", TOOLTIP_CSS)
+
+LINK_HTML = """
+    <a href="{url}" target="_blank"
+       style="display:inline-block; background-color:rgba(255,255,255,0.05);
+              border:1px solid rgba(255,255,255,0.25);
+              border-radius:8px; padding:10px 16px;
+              text-decoration:none; color:#cfe0ff;
+              font-weight:500; font-size:14px; margin-bottom:10px;">
+       {label}
+    </a>
+    """
+
+HERO_IMG = Path("assets/img/Dorian_Road_Investment_Strategy.jpg")
+QUAD_TREEMAPS = [Path(f"assets/html/CAGR_per_quad_nophase_Q{q}.html") for q in range(1, 5)]
+DASHBOARD_HTML = [
+    Path("assets/html/Daily_Quad_Consensus_Counts.html"),
+    Path("assets/html/Snapshot_63d_RollingCAGR.html"),
+    Path("assets/html/Snapshot_MAD_20_50.html"),
+    Path("assets/html/Snapshot_Stoch_D.html"),
+]
+
+
+def fw_preview(pdfs: dict) -> dict:
+    return {
+        "Strategy Snapshot": pdfs["Strategy Snapshot"],
+        "Leading Indicators": pdfs["Leading Indicators Brief"],
+        "Financial Conditions Indexes": pdfs["Financial Conditions Indexes"],
+    }
+
+
+def search_locations(pdfs: dict, preview: dict) -> dict:
+    """Where each searchable asset is shown."""
+    gme = pdfs.get("Global Multi-Asset Strategy Evaluation")
+    return {
+        **{fp: "Overview" for fp in pdfs.values()},
+        **{fp: "Framework" for fp in preview.values()},
+        **({gme: "Project Highlights"} if gme else {}),     # its case-study card
+        **{p: "Framework" for p in QUAD_TREEMAPS},
+        **{p: "Dashboards" for p in DASHBOARD_HTML},
+    }
+
+@metrics.timed()
+def centered_image(img_path: Path, caption: str | None = None, width: int = 480, nudge_left_px: int = 0):
+    if not img_path.exists():
+        st.caption(f"⚠ Image not found: {img_path}")
+        return
+    encoded = embeds.image_b64(img_path)
+    st.markdown(
+        f"""
+        <div style="text-align:center; margin-left:{nudge_left_px}px;">
+            <img src="data:image/jpeg;base64,{encoded}"
+                 width="{width}"
+                 style="border-radius:12px;margin-top:10px;"/>
+            {f'<div style="color:#9fb3c8;font-size:13px;margin-top:4px;">{caption}</div>' if caption else ''}
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+
+def render(name: str):
+    spec = variants.get(name)
+    PDFS = spec["pdfs"]
+    FW_PREVIEW = fw_preview(PDFS)
+    # one stylesheet for every page of the variant, sent on the session's first run
+    # (from the bottom of the sidebar, so nothing shifts when later runs leave it out)
+    site_styles = ["theme", "bullet-wrap", "tooltip"] + (["case-card"] if spec["case_card_css"] else [])
+
+    # ──────────────────────────────────────────────────────────────
+    # SIDEBAR
+    # ──────────────────────────────────────────────────────────────
+    if metrics.is_admin(st.query_params.get("admin")):
+        styles.emit(*site_styles, container=st.sidebar)
+        metrics.render_admin()
+        st.stop()
+
+    st.sidebar.markdown("### Portfolio Microsite")
+    page = st.sidebar.radio(
+        "Navigate",
+        ["Overview", "Framework", "Dashboards", "Project Highlights", ],
+        key="nav",
+    )
+    search.sidebar(search_locations(PDFS, FW_PREVIEW), previews={fp: ("fw-preview", label) for label, fp in FW_PREVIEW.items()})
+    with metrics.section("css"):
+        styles.emit(*site_styles, container=st.sidebar)
+
+    # ──────────────────────────────────────────────────────────────
+    # HEADER
+    # ──────────────────────────────────────────────────────────────
+    with metrics.section("header"):
+        st.markdown(
+            """
+            <div class="card" style="padding:28px; text-align:center;">
+              <h1 style="margin-bottom:6px;">Dylan Sturdevant</h1>
+              <div style="color:#9fb3c8; font-size:18px;">
+                Macro & Multi-Asset Research | Systematic Research & Investment Analytics
+              </div>
+              <hr style="margin:14px auto; width:60%; border:0; height:1px; background:rgba(255,255,255,0.1);">
+              <div style="color:#9fb3c8; font-size:14px;">
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+
+
+
+    # ──────────────────────────────────────────────────────────────
+    # PAGES
+    # ──────────────────────────────────────────────────────────────
+    with metrics.section(f"page:{page}"):
+        if page == "Overview":
+            col1, col2 = st.columns([1.1, 1])
+            with col1:
+                st.subheader("What I build")
+                st.markdown(spec["overview_build"])
+
+                if spec["overview_decisions"]:
+                    st.subheader("How this improves investment decisions")
+                    st.markdown(spec["overview_decisions"])
+
+                st.caption("This microsite provides a concise overview of my research frameworks and tools for easy internal review.")
+            with col2:
+                st.subheader("Downloads")
+                for label, fp in PDFS.items():
+                    pdf_button(label, fp, key=f"ov-{label}")
+
+        elif page == "Framework":
+            st.markdown(
+                "<h3 style='text-align:center; margin-top:20px; margin-bottom:10px;'>Quadrant Framework</h3>",
+                unsafe_allow_html=True,
+            )
+            #st.caption("Objective, structured, testable.")
+
+            # paths
+            img_path  = HERO_IMG
+
+            # tuning knobs
+            IMG_WIDTH = 700          # image size
+            IMG_HEIGHT_APPROX = 500   # used to vertically center bullets
+            NUDGE_LEFT_PX = -24       # move image a bit left
+
+            # side-by-side: bullets LEFT (vertically centered), image RIGHT (bigger, nudged left)
+            col1, col2 = st.columns([1.2, 1])
+
+            with col1:
+                st.markdown(
+                    f"""
+                    <div class="bullet-wrap" style="display:flex; align-items:center; min-height:{IMG_HEIGHT_APPROX}px;">
+                      <div>
+                        <h4>How economic regimes are defined</h4>
+                        <ul>
+                          <li>Identify the directional momentum of growth and inflation</li>
+                          <li>Macro environments are classified by whether these signals are accelerating/decelerating</li>
+                          <li>If growth remains strong while inflation momentum fades, <br> we identify Quad 1 (Goldilocks)</li>
+                          <li>When the direction of both growth and inflation is rising, we classify the environment as Quad 2 (Reflation)</li>
+                          <li>When growth is falling and inflation is rising, the regime shifts to Quad 3 (Stagflation)</li>
+                          <li>If both growth and inflation are decelerating, we enter Quad 4 (Deflation)</li>
+                        </ul>
+                      </div>
+                    </div>
+                    """,
+                    unsafe_allow_html=True,
+                )
+
+
+            with col2:
+                centered_image(img_path, width=IMG_WIDTH, nudge_left_px=NUDGE_LEFT_PX)
+
+            st.markdown(
+                "<h3 style='text-align:center; margin-top:30px; margin-bottom:10px;'>Historical Quadrant Performance</h3>",
+                unsafe_allow_html=True,
+            )
+
+            st.markdown(
+                """
+                <div style="text-align:center; margin-top:8px;">
+                  <div class="tooltip">ℹ︎ Note — Treemap Interaction
+                    <span class="tooltiptext">
+                      <b>Plotly Treemap Tips</b><br>
+                      • Size scales with number of observations in quadrant as more observations --> greater confidence in relationship holding<br>
+                      • Click a category (e.g., “Commodities”) to zoom into its components.<br>
+                      • Click the top gray bar to navigate back to the full view.<br>
+                      • Hover over tiles for detailed stats (CAGR, Volatility, Sharpe, Observations).<br>
+                      • Use the color scale to compare performance across assets.
+                    </span>
+                  </div>
+                </div>
+                """,
+                unsafe_allow_html=True,
+            )
+
+            # treemap BELOW both: one native chart, quad picked above it
+            quads.treemap(key="fw-quad")
+
+            st.subheader("Financial Conditions Indexes (FCIs)")
+            st.markdown(
+                "- Forecast growth and inflation using hundreds of economic indicators and market ratios.\n"
+                "- Apply Granger causality and lead–lag filters to isolate truly predictive variables.\n"
+                "- Combine signals through linear regression and nonlinear ML models to form composite leading indexes.\n"
+                "- Emphasize directional accuracy over numeric precision — what matters is anticipating macro turns, not chasing decimal points."
+            )
+            scoreboard.section()
+
+            st.subheader("Data to Allocation")
+
+            st.markdown(spec["allocation"], unsafe_allow_html=True)
+
+
+            st.divider()
+            st.markdown("**PDF Downloads**")
+            pdf_button("Brief Strategy Snapshot", PDFS["Strategy Snapshot"], key="fw-ss")
+            pdf_button("Leading Indicator Examples", PDFS["Leading Indicators Brief"], key="fw-li")
+            pdf_button("Financial Conditions Indexes", PDFS["Financial Conditions Indexes"], key="fw-fci")
+            pdf_preview(FW_PREVIEW, key="fw-preview")
+
+
+        elif page == "Dashboards":
+            st.subheader("Daily Dashboards")
+
+            st.markdown(
+                """
+                Automated dashboards combine **technical analysis** with **macro regime forecasts** to show how markets behave across different economic environments.  
+                They help confirm whether asset trends align with the projected quad, or diverge early.
+
+                <br>
+                Each panel highlights a different layer of market structure: rolling momentum, relative positioning, or cyclical timing.  
+                Together, they create a real-time lens for how liquidity, sentiment, and risk appetite evolve within and between quads.  
+
+                <br>
+                <br>
+                <span style="color:gray; font-size:0.9em;">
+                    These charts represent just a few examples of the dashboards I monitor daily.  
+                    Each snapshot is compared against its historical behavior to infer which economic quad the market is pricing in  
+                    and how far along we are within that regime. Also cross-checked against my Financial Conditions Indexes (FCIs) for confirmation.
+                </span>
+                """,
+                unsafe_allow_html=True,
+            )
+
+
+            # live mode: charts drawn from the data stores, updated in place as rows land
+            is_live = live.available() and st.toggle(
+                "Live data", value=True, key="dash-live",
+                help=f"Check the data stores every {live.POLL_SECONDS:g}s and update the charts in place.",
+            )
+
+            @metrics.timed()
+            def embed_plotly_html_responsive(path: Path, height=520):
+                if is_live and path.stem in live.CHARTS:
+                    live.chart(path.stem, height)
+                    return
+                components.html(embeds.tight_html(path, height), height=height + 20, scrolling=False)
+
+
+            html_path_1, html_path_2, html_path_3, html_path_4 = DASHBOARD_HTML
+
+
+            if html_path_1.exists():
+                st.markdown(
+                    "<h3 style='text-align:center; margin-top:10px; margin-bottom:10px;'>Daily Quad Consensus Counts</h3>",
+                    unsafe_allow_html=True,
+                )
+                embed_plotly_html_responsive(html_path_1, height=520)
+                regime.section()
+
+            st.markdown("""
+            <div style="text-align:center; margin-top:8px;">
+              <div class="tooltip">ℹ︎ Note — Chart Interaction
+                <span class="tooltiptext">
+                  <b>Line Chart Interactivity Tips</b><br>
+                  • Drag to zoom into a custom date range.<br>
+                  • Single-click a legend item to hide that series.<br>
+                  • Double-click a legend item to isolate it.<br>
+                  • Double-click the background to reset view.<br>
+                  • Single/double-click again to toggle lines back on.
+                </span>
+              </div>
+            </div>
+            """, unsafe_allow_html=True)
+
+            if html_path_2.exists():
+                st.markdown(
+                    "<h3 style='text-align:center; margin-top:10px; margin-bottom:10px;'>63-Day Rolling CAGR Snapshot</h3>",
+                    unsafe_allow_html=True,
+                )
+                embed_plotly_html_responsive(html_path_2, height=520)
+
+            st.markdown("""
+            <div style="text-align:center; margin-top:8px;">
+              <div class="tooltip">ℹ︎ MAD 20/50
+                <span class="tooltiptext">
+                  <b>Moving Average Distance (20/50)</b><br>
+                  • Ratio of the 20-day SMA to the 50-day SMA.<br>
+                  • Values >1 indicate short-term momentum above the medium-term trend.<br>
+                  • Highlights assets with strengthening or weakening momentum.
+                </span>
+              </div>
+            </div>
+            """, unsafe_allow_html=True)
+
+            if html_path_3.exists():
+                st.markdown(
+                    "<h3 style='text-align:center; margin-top:10px; margin-bottom:10px;'>Moving-Average Distance (MAD 20/50)</h3>",
+                    unsafe_allow_html=True,
+                )
+                embed_plotly_html_responsive(html_path_3, height=520)
+
+            st.markdown("""
+            <div style="text-align:center; margin-top:8px;">
+              <div class="tooltip">ℹ︎ Stoch %D
+                <span class="tooltiptext">
+                  <b>Stochastic %D</b><br>
+                  • Derived from <b>%K</b>, which tracks where price closes relative to its 14-day high-low range.<br>
+                  • %D = 3-day Simple Moving Average of %K → smoother, less noisy signal.<br>
+                  • Used to confirm momentum shifts: crossovers above/below %D often mark short-term turns.
+                </span>
+              </div>
+            </div>
+            """, unsafe_allow_html=True)
+
+            if html_path_4.exists():
+                st.markdown(
+                    "<h3 style='text-align:center; margin-top:10px; margin-bottom:10px;'>Stochastic %D Snapshot</h3>",
+                    unsafe_allow_html=True,
+                )
+                embed_plotly_html_responsive(html_path_4, height=520)
+
+            percentiles.section()
+            analogs.section()
+
+
+        elif page == "Project Highlights":
+            hl = spec["highlights"]
+            st.markdown(
+                f"<h3 style='text-align:center; margin-top:20px; margin-bottom:{hl['title_margin']}px;'>Case Studies</h3>",
+                unsafe_allow_html=True,
+            )
+
+            cards, per_row = hl["cards"], hl["per_row"]
+            for row in range(0, len(cards), per_row):
+                for col, card in zip(st.columns(per_row), cards[row:row + per_row]):
+                    with col:
+                        st.markdown(hl["heading"].format(card["title"]))
+                        if "pdf" in card:
+                            label, key = card["pdf"]
+                            pdf_button(label, PDFS[label], key=key)
+                        elif "anchor" in card:
+                            label, url = card["anchor"]
+                            st.markdown(LINK_HTML.format(label=label, url=url), unsafe_allow_html=True)
+                        elif "link" in card:
+                            st.link_button(*card["link"])
+                        st.markdown(card["body"])
+
+
+
+    # Footer
+    st.markdown("<hr style='margin-top:30px;'/>", unsafe_allow_html=True)
+
+
+# ──────────────────────────────────────────────────────────────
+# ROUTING
+# ──────────────────────────────────────────────────────────────
+def serve(default: str = variants.DEFAULT):
+    """Render the variant at the ``/v<name>`` route, else the one ``?v=`` asks for, else ``default``."""
+    st.set_page_config(
+        page_title=PAGE_TITLE,
+        layout="wide",
+        menu_items={"Get help": None, "Report a bug": None, "About": None},
+    )
+    # fill the shared caches in the background; never blocks this run
+    specs = variants.VARIANTS.values()
+    warmup.start(
+        dict.fromkeys(fp for s in specs for fp in s["pdfs"].values()),
+        tight=DASHBOARD_HTML, images=[HERO_IMG],
+    )
+    asked = st.query_params.get("v")
+    if asked in variants.VARIANTS:
+        default = asked
+    pages = [
+        st.Page(partial(render, name), title=PAGE_TITLE, default=name == default, url_path=f"v{name}")
+        for name in variants.VARIANTS
+    ]
+    st.navigation(pages, position="hidden").run()
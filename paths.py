@@ -3,6 +3,10 @@ import streamlit as st
 
 APP_DIR = Path(__file__).parent
 ASSETS  = APP_DIR / "assets"
+DATA    = APP_DIR / "data"
+STORE   = DATA / "store"
+REGIMES = DATA / "regimes"
+VINTAGES = DATA / "vintages"
 
 def asset_path(*parts) -> Path:
     """Resolve a file in ./assets, warn if missing."""
@@ -10,3 +14,8 @@ def asset_path(*parts) -> Path:
     if not p.exists():
         st.warning(f"Missing asset: {p}")
     return p
+
+def resolve(p) -> Path:
+    """App-relative paths work regardless of the server's working directory."""
+    p = Path(p)
+    return p if p.is_absolute() or p.exists() else APP_DIR / p
@@ -0,0 +1,161 @@
+"""Split the PDFs into per-page documents plus a text / outline index.
+
+Needs ``pypdf``. The split is gitignored: the app makes it on the first
+preview of a document (``downloads.page_index``), or it can be made ahead of
+a deploy:
+
+    python pdf_pages.py                 # every PDF under assets/pdf
+    python pdf_pages.py --force Strategy_Snapshot.pdf
+
+For ``assets/pdf/<stem>.pdf`` it writes ``assets/pdf/pages/<stem>/p001.pdf``,
+... and ``index.json`` with the outline and each page's title, size and
+extracted text. A document is skipped while its size and mtime match the index.
+"""
+import argparse
+import importlib.util
+import json
+import re
+from pathlib import Path
+
+from datastore import atomic_write_text
+from paths import ASSETS
+
+PDF_DIR = ASSETS / "pdf"
+PAGES_DIR = PDF_DIR / "pages"
+INDEX = "index.json"
+TITLE_CHARS = 80
+GENERIC_TITLE = re.compile(r"^\s*(slide|page)\s*\d+\s*:?\s*$", re.I)
+HAS_PYPDF = importlib.util.find_spec("pypdf") is not None
+
+
+def page_file(n: int) -> str:
+    return f"p{n:03d}.pdf"
+
+
+def out_dir(src: Path) -> Path:
+    return PAGES_DIR / src.stem
+
+
+def load_index(src: Path) -> dict | None:
+    p = out_dir(src) / INDEX
+    if not p.exists():
+        return None
+    return json.loads(p.read_text(encoding="utf-8"))
+
+
+def _outline(reader) -> list[dict]:
+    out = []
+
+    def walk(items, level):
+        for it in items:
+            if isinstance(it, list):
+                walk(it, level + 1)
+                continue
+            try:
+                page = reader.get_destination_page_number(it) + 1
+            except Exception:  # dangling or external destination
+                continue
+            out.append({"title": str(it.title).strip(), "page": page, "level": level})
+    try:
+        walk(reader.outline, 0)
+    except Exception:  # malformed outline tree: the pages are still useful
+        return []
+    return out
+
+
+def _heading(text: str) -> str:
+    """Leading lines of a slide up to its first bullet, whitespace collapsed."""
+    lines = []
+    for line in text.splitlines()[:4]:
+        if line.lstrip().startswith("•"):
+            break
+        lines.append(line)
+    return re.sub(r"\s+", " ", " ".join(lines)).strip()[:TITLE_CHARS]
+
+
+def _title(text: str, outline: list[dict], n: int) -> str:
+    """Outline title unless it is just "Slide 3", else the page's own heading."""
+    for o in outline:
+        if o["page"] == n and not GENERIC_TITLE.match(o["title"]):
+            return re.sub(r"\s+", " ", o["title"])
+    return _heading(text) or f"Page {n}"
+
+
+def _text(page) -> str:
+    try:
+        return page.extract_text() or ""
+    except Exception:
+        return ""
+
+
+def extract(src: Path) -> dict:
+    """Outline and per-page title / text of ``src``, without writing the split."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(src)
+    outline = _outline(reader)
+    pages = []
+    for i, page in enumerate(reader.pages, start=1):
+        text = _text(page)
+        pages.append({"n": i, "title": _title(text, outline, i), "text": text.strip()})
+    return {"source": {"file": src.name}, "outline": outline, "pages": pages}
+
+
+def split(src: Path, force: bool = False) -> dict:
+    """Write the per-page PDFs and index for one document; returns the index."""
+    from pypdf import PdfReader, PdfWriter
+
+    st = src.stat()
+    old = load_index(src)
+    if not force and old and old["source"]["size"] == st.st_size and old["source"]["mtime_ns"] == st.st_mtime_ns:
+        return old
+
+    dest = out_dir(src)
+    dest.mkdir(parents=True, exist_ok=True)
+    reader = PdfReader(src)
+    outline = _outline(reader)
+    pages = []
+    for i, page in enumerate(reader.pages, start=1):
+        w = PdfWriter()
+        w.add_page(page)          # copies only the resources this page references
+        w.compress_identical_objects()
+        for p in w.pages:
+            p.compress_content_streams()
+        out = dest / page_file(i)
+        tmp = out.with_suffix(".tmp")
+        with tmp.open("wb") as f:
+            w.write(f)
+        tmp.replace(out)
+        text = _text(page)
+        pages.append({"n": i, "file": out.name, "size": out.stat().st_size,
+                      "title": _title(text, outline, i), "text": text.strip()})
+
+    for stale in dest.glob("p*.pdf"):
+        if stale.name not in {p["file"] for p in pages}:
+            stale.unlink()
+    index = {
+        "source": {"file": src.name, "size": st.st_size, "mtime_ns": st.st_mtime_ns},
+        "outline": outline,
+        "pages": pages,
+    }
+    atomic_write_text(dest / INDEX, json.dumps(index, indent=1, ensure_ascii=False))
+    return index
+
+
+def sources(names=()) -> list[Path]:
+    if names:
+        return [PDF_DIR / n for n in names]
+    return sorted(PDF_DIR.glob("*.pdf"))
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("names", nargs="*", help="PDF file names under assets/pdf (default: all)")
+    ap.add_argument("--force", action="store_true", help="re-split even if unchanged")
+    args = ap.parse_args()
+    for src in sources(args.names):
+        idx = split(src, args.force)
+        sizes = [p["size"] for p in idx["pages"]]
+        print(f"{src.name}: {src.stat().st_size / 1024:.0f} KB -> {len(sizes)} pages, "
+              f"median {sorted(sizes)[len(sizes) // 2] / 1024:.0f} KB, max {max(sizes) / 1024:.0f} KB, "
+              f"{len(idx['outline'])} outline entries")
@@ -0,0 +1,222 @@
+"""Today's snapshot readings ranked against each asset's own history.
+
+For each Dashboards snapshot indicator (MAD 20/50, Stoch %D, 63-day rolling
+CAGR) every asset's history is kept sorted in one flat array. Each asset owns
+a contiguous segment, and ``starts`` holds the segment offsets. A percentile
+query runs a binary search in every asset's segment at once (``_search``,
+O(log n) per asset). A new day is added with one ``np.insert`` at the
+searched positions, so the history is never re-sorted.
+
+``Engine.refresh`` picks up rows committed to the market store since the last
+call. Only a short tail is recomputed, because every indicator window is
+shorter than ``TAIL``. ``get_engine`` shares one engine per process.
+"""
+import threading
+from dataclasses import dataclass
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import build
+import indicators
+from datastore import MarketStore
+from paths import STORE
+
+SNAPSHOTS = ("Snapshot_MAD_20_50", "Snapshot_Stoch_D", "Snapshot_63d_RollingCAGR")
+TAIL = 300     # rows of context recomputed per update (longest window is 64)
+
+
+def _search(flat: np.ndarray, lo: np.ndarray, hi: np.ndarray, q: np.ndarray, side: str = "left") -> np.ndarray:
+    """``np.searchsorted`` of ``q[i]`` within ``flat[lo[i]:hi[i]]`` for every i at once (absolute positions)."""
+    lo, hi = lo.astype(np.int64), hi.astype(np.int64)
+    while True:
+        open_ = lo < hi
+        if not open_.any():
+            return lo
+        mid = (lo + hi) // 2
+        v = flat[np.minimum(mid, len(flat) - 1)]
+        go_right = (v < q) if side == "left" else (v <= q)
+        go_right &= open_
+        lo = np.where(go_right, mid + 1, lo)
+        hi = np.where(open_ & ~go_right, mid, hi)
+
+
+class PercentileIndex:
+    """Sorted per-asset histories for one indicator, in one flat array."""
+
+    def __init__(self, n_assets: int = 0):
+        self.flat = np.empty(0)
+        self.starts = np.zeros(n_assets + 1, np.int64)
+
+    @classmethod
+    def from_panel(cls, panel: np.ndarray) -> "PercentileIndex":
+        """(days x assets) history; NaNs are left out."""
+        idx = cls(panel.shape[1])
+        cols = [np.sort(c[np.isfinite(c)]) for c in panel.T]
+        idx.flat = np.concatenate(cols) if cols else np.empty(0)
+        idx.starts[1:] = np.cumsum([len(c) for c in cols])
+        return idx
+
+    @property
+    def counts(self) -> np.ndarray:
+        return np.diff(self.starts)
+
+    def grow(self, n_assets: int):
+        """Empty histories for assets added to the store."""
+        if n_assets > len(self.starts) - 1:
+            self.starts = np.concatenate([self.starts, np.full(n_assets + 1 - len(self.starts), self.starts[-1])])
+
+    def insert(self, rows: np.ndarray):
+        """Add (days x assets) readings; each lands at its sorted place in its asset's segment."""
+        rows = np.atleast_2d(rows)
+        asset = np.broadcast_to(np.arange(rows.shape[1]), rows.shape).ravel()
+        vals = rows.ravel()
+        ok = np.isfinite(vals)
+        asset, vals = asset[ok], vals[ok]
+        if not len(vals):
+            return
+        order = np.lexsort((vals, asset))       # equal positions must go in ascending order
+        asset, vals = asset[order], vals[order]
+        pos = _search(self.flat, self.starts[asset], self.starts[asset + 1], vals, "right")
+        self.flat = np.insert(self.flat, pos, vals)
+        added = np.bincount(asset, minlength=len(self.starts) - 1)
+        self.starts[1:] += np.cumsum(added)
+
+    def rank(self, values: np.ndarray) -> np.ndarray:
+        """Percentile (0–100, mid-rank for ties) of each asset's value within its own history.
+
+        Assets beyond the ones indexed so far (registered without rows yet) get NaN.
+        """
+        values = np.asarray(values, float)
+        pct = np.full(len(values), np.nan)
+        n = min(len(values), len(self.starts) - 1)
+        lo, hi = self.starts[:n], self.starts[1:n + 1]
+        v = values[:n]
+        q = np.where(np.isfinite(v), v, 0.0)
+        below = _search(self.flat, lo, hi, q, "left") - lo
+        upto = _search(self.flat, lo, hi, q, "right") - lo
+        count = (hi - lo).astype(float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            pct[:n] = np.where(np.isfinite(v) & (count > 0), 100 * (below + upto) / 2 / count, np.nan)
+        return pct
+
+
+class Spec(NamedTuple):
+    name: str            # build artifact name
+    label: str
+    indicator: str
+    fields: tuple
+    kw: dict
+
+
+@dataclass
+class Series:
+    name: str            # build artifact name
+    label: str
+    indicator: str
+    fields: tuple
+    kw: dict
+    index: PercentileIndex
+    latest: np.ndarray   # today's reading per asset
+
+
+def specs() -> dict[str, Spec]:
+    """One ``Spec`` per snapshot indicator, taken from its build artifact."""
+    out = {}
+    for name in SNAPSHOTS:
+        a = build.ARTIFACTS[name]
+        p = dict(a.params)
+        indicator, label = p.pop("indicator"), p.pop("title").replace("Snapshot ", "")
+        kw = {k: v for k, v in p.items() if k not in ("colorbar", "fmt", "tickformat", "lookback")}
+        out[name] = Spec(name, label, indicator, a.fields, kw)
+    return out
+
+
+def tail_values(store: MarketStore, series: dict, start: int) -> dict[str, np.ndarray]:
+    """(days x assets) indicator rows from ``start`` on for each spec / series, in store asset order.
+
+    Computed over ``TAIL`` extra rows of lead-in, so the result matches a full-history
+    computation; each store field is read once.
+    """
+    first = max(0, start - TAIL)
+    day = store.dates[first]
+    fields = dict.fromkeys(f for s in series.values() for f in s.fields)
+    frames = {f: store.frame(f, start=day) for f in fields}
+    out = {}
+    for name, s in series.items():
+        v = indicators.compute(s.indicator, frames["close"], frames.get("high"), frames.get("low"), **s.kw)
+        out[name] = v.reindex(columns=store.tickers).iloc[start - first:].to_numpy()
+    return out
+
+
+class Engine:
+    """Percentile indexes for every snapshot indicator, kept in step with the store."""
+
+    def __init__(self, store: MarketStore):
+        self.store = store
+        self.rows = 0
+        self.series: dict[str, Series] = {}
+        self._lock = threading.Lock()
+
+    def refresh(self) -> bool:
+        """Index rows committed since the last call; True if there were any."""
+        with self._lock:
+            self.store.refresh()
+            n = len(self.store)
+            if n == self.rows:
+                return False
+            if not self.series:
+                self._build()
+            else:
+                for name, new in tail_values(self.store, self.series, self.rows).items():
+                    s = self.series[name]
+                    s.index.grow(new.shape[1])
+                    s.index.insert(new)
+                    s.latest = new[-1]
+            self.rows = n
+            return True
+
+    def _build(self):
+        self.series = {name: Series(*spec, PercentileIndex(), np.empty(0)) for name, spec in specs().items()}
+        for name, full in tail_values(self.store, self.series, 0).items():
+            s = self.series[name]
+            s.index = PercentileIndex.from_panel(full)
+            s.latest = full[-1] if len(full) else np.empty(0)
+
+    def table(self) -> pd.DataFrame:
+        """One row per asset: today's reading and its percentile for each indicator."""
+        self.refresh()
+        assets = self.store.assets
+        out = pd.DataFrame({
+            "Ticker": [a["ticker"] for a in assets],
+            "Name": [a.get("name") or a["ticker"] for a in assets],
+            "Category": [a.get("category") or "Other" for a in assets],
+        })
+        for s in self.series.values():
+            latest = np.full(len(assets), np.nan)
+            latest[:len(s.latest)] = s.latest
+            out[s.label] = latest
+            out[f"{s.label} pct"] = s.index.rank(latest)
+        return out
+
+
+def available() -> bool:
+    return (STORE / "dates.i4").exists()
+
+
+@st.cache_resource(show_spinner=False)
+def get_engine() -> Engine:
+    return Engine(MarketStore(STORE))
+
+
+def section():
+    """Dashboards expander: today's readings ranked against their own history."""
+    if not available():
+        return
+    with st.expander("Today vs. history — percentile ranks"):
+        t = get_engine().table()
+        pct = {c: st.column_config.ProgressColumn(c, min_value=0, max_value=100, format="%.0f") for c in t if c.endswith(" pct")}
+        st.dataframe(t, hide_index=True, width="stretch", column_config=pct)
+        st.caption("Percentile of today's reading within the asset's own daily history (50 = median day).")
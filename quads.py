@@ -0,0 +1,85 @@
+"""Per-quad CAGR treemaps for the Framework page, drawn natively.
+
+The figures are built from one statistics table, ``data/quad_stats.csv``
+(``build``'s ``quad_stats`` artifact: quad, ticker, name, category, cagr, vol,
+sharpe, n_obs). They are cached per (quad, table version) and shown in a single
+``st.plotly_chart`` with a quad selector. This replaces four iframes that each
+loaded their own copy of plotly.js. The saved ``CAGR_per_quad_nophase_Q*.html``
+files are still built (search indexes them). Without the stores, the table can
+be seeded from those files:
+
+    python quads.py            # write data/quad_stats.csv from assets/html
+"""
+import argparse
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+import charts
+import figures
+import metrics
+import theme
+from build import QUAD_STATS
+from datastore import atomic_write_text
+from indicators import QUADS
+from paths import ASSETS
+
+HEIGHT = 560
+SEED_HTML = [ASSETS / "html" / f"CAGR_per_quad_nophase_Q{q}.html" for q in QUADS]
+
+
+def from_html(paths=SEED_HTML) -> pd.DataFrame:
+    """The stats table recovered from the saved treemap pages."""
+    frames = []
+    for q, p in zip(QUADS, paths):
+        if p.exists():
+            frames += [charts.quad_stats_from_treemap(fig, q) for fig in figures.from_html(p.read_text(encoding="utf-8"))]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def version() -> tuple:
+    """Cache key for the table: the CSV's size / mtime, else the seed pages'."""
+    paths = [QUAD_STATS] if QUAD_STATS.exists() else [p for p in SEED_HTML if p.exists()]
+    return tuple((p.name, p.stat().st_size, p.stat().st_mtime_ns) for p in paths)
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _stats(version: tuple) -> pd.DataFrame:
+    return pd.read_csv(QUAD_STATS) if QUAD_STATS.exists() else from_html()
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def figure(quad: int, version: tuple, height: int = HEIGHT) -> dict:
+    """Themed, compacted figure dict (shared by every session; don't modify it)."""
+    fig = charts.quad_treemap(_stats(version), quad, height=height)
+    spec, _ = figures.emit(fig, f"quad{quad}")
+    return theme.apply(spec)
+
+
+def warm(height: int = HEIGHT):
+    v = version()
+    for q in QUADS:
+        figure(q, v, height)
+
+
+def treemap(key: str = "fw-quad", height: int = HEIGHT):
+    """Quad selector plus the treemap for the selected quad."""
+    v = version()
+    if not v:
+        st.caption("Quad statistics are not available.")
+        return
+    quad = st.radio("Quad", QUADS, format_func=charts.quad_title, horizontal=True,
+                    key=key, label_visibility="collapsed")
+    with metrics.section(f"treemap:Q{quad}"):
+        st.plotly_chart(figure(quad, v, height), theme=None, width="stretch",
+                        config={"displaylogo": False}, key=f"{key}-chart")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--out", default=str(QUAD_STATS), help="CSV to write (default: data/quad_stats.csv)")
+    args = ap.parse_args()
+    table = from_html()
+    atomic_write_text(Path(args.out), table.to_csv(index=False))
+    print(f"{args.out}: {len(table)} rows, {table['ticker'].nunique()} assets, quads {sorted(table['quad'].unique().tolist())}")
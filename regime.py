@@ -0,0 +1,177 @@
+"""Regime progress: how far along the current consensus quad is.
+
+An episode is a run of consecutive days with the same consensus quad
+(``indicators.quad_labels``). Days with no votes carry the previous quad. For
+each quad, ``Progress`` keeps a histogram of the lengths of completed episodes.
+The first episode is left out, because it started before the data did. A new
+day costs O(1): either the current episode gets a day older, or it closes and
+its length is added to one histogram bin.
+
+For an episode of quad q that is ``a`` days old:
+
+* completion percentile: the share of past q-episodes that were over by age a
+  (``P(L <= a)``);
+* expected remaining length: the mean of ``L - a`` over the past q-episodes
+  that lasted longer than a. It is undefined once the episode is older than
+  any before it.
+
+The cumulative sums behind both are rebuilt lazily, only for a quad whose
+histogram changed, so a query costs O(1) on most days.
+"""
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import indicators
+from datastore import MarketStore
+from paths import REGIMES
+
+
+@dataclass
+class Status:
+    asof: pd.Timestamp
+    quad: int
+    start: pd.Timestamp
+    age: int                    # trading days, including today
+    completion: float           # percent of past episodes of this quad over by this age
+    remaining: float            # expected trading days left (NaN: older than any before)
+    episodes: int               # completed past episodes of this quad
+
+
+class Progress:
+    """Episode state plus per-quad histograms of completed episode lengths."""
+
+    def __init__(self):
+        self.quad = None
+        self.start = None
+        self.age = 0
+        self.seen = False                   # a quad change has happened (episodes are complete)
+        self.hist = {q: np.zeros(1, np.int64) for q in indicators.QUADS}
+        self._cum = {}                      # quad -> (ended by age, sum of L for L > age)
+
+    def push(self, day: pd.Timestamp, quad: float):
+        """Add one day's consensus quad (NaN carries the current one)."""
+        if not np.isfinite(quad):
+            if self.quad is not None:
+                self.age += 1
+            return
+        quad = int(quad)
+        if quad == self.quad:
+            self.age += 1
+            return
+        if self.quad is not None:
+            if self.seen:
+                self._close(self.quad, self.age)
+            self.seen = True
+        self.quad, self.start, self.age = quad, day, 1
+
+    def _close(self, quad: int, length: int):
+        h = self.hist[quad]
+        if length >= len(h):
+            h = self.hist[quad] = np.concatenate([h, np.zeros(max(length + 1 - len(h), len(h)), np.int64)])
+        h[length] += 1
+        self._cum.pop(quad, None)
+
+    def _cumulative(self, quad: int) -> tuple[np.ndarray, np.ndarray]:
+        if quad not in self._cum:
+            h = self.hist[quad]
+            lengths = np.arange(len(h))
+            ended = np.cumsum(h)                                    # episodes with L <= a
+            longer = (h * lengths)[::-1].cumsum()[::-1]             # sum of L over L >= a
+            self._cum[quad] = ended, np.append(longer[1:], 0)       # ... over L > a
+        return self._cum[quad]
+
+    def lengths(self, quad: int) -> np.ndarray:
+        """Completed episode lengths of ``quad`` (sorted)."""
+        h = self.hist[quad]
+        return np.repeat(np.arange(len(h)), h)
+
+    def completion(self, quad: int, age: int) -> tuple[float, float, int]:
+        """(completion percentile, expected remaining days, past episodes) at ``age``."""
+        ended, longer_sum = self._cumulative(quad)
+        total = int(ended[-1])
+        if not total:
+            return np.nan, np.nan, 0
+        a = min(age, len(ended) - 1)
+        done = int(ended[a])
+        survivors = total - done
+        remaining = longer_sum[a] / survivors - age if survivors else np.nan
+        return 100 * done / total, remaining, total
+
+
+class Engine:
+    """``Progress`` over the regime store, fed the rows committed since the last call."""
+
+    def __init__(self, regimes: MarketStore):
+        self.regimes = regimes
+        self.rows = 0
+        self.progress = Progress()
+        self._lock = threading.Lock()
+
+    def refresh(self) -> bool:
+        with self._lock:
+            self.regimes.refresh()
+            n = len(self.regimes)
+            if n == self.rows:
+                return False
+            labels = indicators.quad_labels(self.regimes.frame("quad", start=self.regimes.dates[self.rows]))
+            for day, q in zip(labels.index, labels.to_numpy()):
+                self.progress.push(day, q)
+            self.rows = n
+            return True
+
+    def status(self) -> Status | None:
+        self.refresh()
+        p = self.progress
+        if p.quad is None:
+            return None
+        pct, remaining, n = p.completion(p.quad, p.age)
+        return Status(self.regimes.dates[self.rows - 1], p.quad, p.start, p.age, pct, remaining, n)
+
+    def distribution(self) -> pd.DataFrame:
+        """Completed episode length summary per quad."""
+        rows = []
+        for q in indicators.QUADS:
+            L = self.progress.lengths(q)
+            rows.append({
+                "Quad": f"Quad {q} ({indicators.QUAD_NAMES[q]})",
+                "Episodes": len(L),
+                "Median days": float(np.median(L)) if len(L) else np.nan,
+                "75th pct": float(np.percentile(L, 75)) if len(L) else np.nan,
+                "90th pct": float(np.percentile(L, 90)) if len(L) else np.nan,
+                "Longest": int(L[-1]) if len(L) else np.nan,
+            })
+        return pd.DataFrame(rows)
+
+
+def available() -> bool:
+    return (REGIMES / "dates.i4").exists()
+
+
+@st.cache_resource(show_spinner=False)
+def get_engine() -> Engine:
+    return Engine(MarketStore(REGIMES))
+
+
+def section():
+    """Dashboards row under the consensus chart: current quad, its age and progress."""
+    if not available():
+        return
+    engine = get_engine()
+    s = engine.status()
+    if s is None:
+        return
+    cols = st.columns(4)
+    cols[0].metric("Consensus quad", f"Quad {s.quad}", help=indicators.QUAD_NAMES[s.quad])
+    cols[1].metric("Episode age", f"{s.age} days", help=f"Since {s.start:%Y-%m-%d}")
+    cols[2].metric("Completion percentile", "—" if np.isnan(s.completion) else f"{s.completion:.0f}%",
+                   help=f"Share of the {s.episodes} past Quad {s.quad} episodes that had ended by this age")
+    cols[3].metric("Expected remaining", "—" if np.isnan(s.remaining) else f"{s.remaining:.1f} days",
+                   help="Mean days left among past episodes that lasted longer than this")
+    with st.expander("Episode lengths by quad"):
+        st.dataframe(engine.distribution(), hide_index=True, width="stretch")
+        st.caption(f"As of {s.asof:%Y-%m-%d}. An episode is a run of days with the same consensus quad; "
+                   "the first (left-censored) and current episodes are not counted.")
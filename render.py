@@ -0,0 +1,98 @@
+"""Render dashboard artifacts concurrently across CPU cores.
+
+Each worker process opens the stores once (pool initializer) and keeps the
+frames it loads, so artifacts that share inputs on the same worker don't
+re-read them. Artifacts are submitted as soon as their upstream artifacts are
+done, so a full rebuild takes about as long as its slowest chain.
+
+    python render.py                    # render everything
+    python render.py --jobs 4 Snapshot_MAD_20_50 Snapshot_Stoch_D
+"""
+import argparse
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+
+from build import ARTIFACTS, Inputs, blocked, missing, order, write_output
+from figures import EmitReport
+from paths import REGIMES, STORE
+
+_CTX: Inputs | None = None
+
+
+@dataclass
+class Timing:
+    name: str
+    seconds: float
+    bytes: int
+    pid: int
+    emit: EmitReport | None = None   # figure JSON size before / after compaction
+
+
+def _init_worker(store_root: str, regimes_root: str):
+    global _CTX
+    _CTX = Inputs(Path(store_root), Path(regimes_root))
+
+
+def _render_one(name: str) -> Timing:
+    a = ARTIFACTS[name]
+    t0 = time.perf_counter()
+    rep = write_output(a.recipe(_CTX, **a.params), a.output)
+    return Timing(name, time.perf_counter() - t0, a.output.stat().st_size, os.getpid(), rep)
+
+
+def render(names, jobs: int | None = None, store_root: Path = STORE, regimes_root: Path = REGIMES) -> list[Timing]:
+    """Render ``names`` (upstream first), up to ``jobs`` at a time; returns timings in completion order.
+
+    Raises ``FileNotFoundError`` before anything is written when one of them has no input data.
+    """
+    names = list(names)
+    bad = {n: why for n in names if (why := missing(ARTIFACTS[n], store_root, regimes_root))}
+    if bad:
+        raise FileNotFoundError("; ".join(f"{n}: {why}" for n, why in bad.items()))
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(names) or 1))
+    if jobs == 1:
+        _init_worker(str(store_root), str(regimes_root))
+        return [_render_one(n) for n in names]
+
+    pending = {n: {d for d in ARTIFACTS[n].deps if d in names} for n in names}
+    timings = []
+    with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(str(store_root), str(regimes_root))) as pool:
+        running = {}
+        while pending or running:
+            for n in [n for n, deps in pending.items() if not deps]:
+                running[pool.submit(_render_one, n)] = n
+                del pending[n]
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                finished = running.pop(fut)
+                timings.append(fut.result())
+                for deps in pending.values():
+                    deps.discard(finished)
+    return timings
+
+
+def report(timings: list[Timing], wall: float) -> str:
+    width = max([len(t.name) for t in timings] + [8])
+    lines = [f"{'artifact':<{width}}  {'seconds':>8}  {'file KB':>8}  {'json KB before -> after':>24}  pid"]
+    for t in sorted(timings, key=lambda t: -t.seconds):
+        js = f"{t.emit.before / 1024:10.1f} -> {t.emit.after / 1024:9.1f}" if t.emit else f"{'-':>24}"
+        lines.append(f"{t.name:<{width}}  {t.seconds:8.3f}  {t.bytes / 1024:8.1f}  {js}  {t.pid}")
+    total = sum(t.seconds for t in timings)
+    lines.append(f"wall {wall:.3f}s for {len(timings)} artifacts (serial sum {total:.3f}s)")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("names", nargs="*", help="artifacts to render (default: all)")
+    ap.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    args = ap.parse_args()
+    skip = blocked(args.names)
+    for n, why in skip.items():
+        print(f"skipping {n}: {why}")
+    t0 = time.perf_counter()
+    timings = render([n for n in order(args.names) if n not in skip], args.jobs)
+    print(report(timings, time.perf_counter() - t0) if timings else "nothing to render")
@@ -0,0 +1,203 @@
+"""Directional-accuracy scoreboard for forecast series.
+
+Forecasts are scored on direction, not size: a forecast is a hit when its
+sign matches the sign of what was realized. Every (model, indicator, horizon)
+series is one row of a stacked (series x days) array, with NaN where it's
+missing, so thousands of series are scored with whole-array NumPy operations:
+
+* hit rate over the days where both sides are known;
+* turn detection: a turn is a day the direction flips. Each realized turn is
+  matched to the nearest forecast turn in the same direction within
+  ``TURN_WINDOW`` days. Lead is how many days earlier the forecast turned
+  (negative if it turned later);
+* the directional confusion matrix (forecast up/down x realized up/down).
+  ``confusion`` also counts quad-vs-quad when both sides are quads (1..4);
+* accuracy over the last ``WINDOW`` days (``rolling_accuracy`` gives the
+  whole rolling series).
+
+On the Framework page the composite leading index (``composite.py``) is
+scored against the basket's realized forward return, with its trailing
+``WINDOW``-day hit rate charted. Each model is also read as a quad call
+(``predicted_quads``) and checked against the consensus quad ``HORIZON``
+days later. Everything is cached per version of
+``data/composite/composite.csv``.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import composite
+import indicators
+
+WINDOW = 252
+TURN_WINDOW = 21
+SOURCE = composite.ROOT / "composite.csv"
+MODELS = ("ridge", "rff", "composite")
+
+
+def direction(a: np.ndarray) -> np.ndarray:
+    """Sign as int8, with 0 for NaN."""
+    a = np.asarray(a, float)
+    return (a > 0).view(np.int8) - (a < 0).view(np.int8)
+
+
+def confusion(pred: np.ndarray, real: np.ndarray, classes) -> np.ndarray:
+    """(series x predicted x realized) counts; values outside ``classes`` are skipped."""
+    classes = np.asarray(classes)
+    pred, real = np.atleast_2d(pred), np.atleast_2d(real)
+    p = np.searchsorted(classes, pred)
+    r = np.searchsorted(classes, real)
+    k = len(classes)
+    ok = (p < k) & (r < k)
+    ok[ok] &= (classes[p[ok]] == pred[ok]) & (classes[r[ok]] == real[ok])
+    row = np.broadcast_to(np.arange(pred.shape[0])[:, None], pred.shape)
+    flat = (row * k + p) * k + r
+    return np.bincount(flat[ok], minlength=pred.shape[0] * k * k).reshape(pred.shape[0], k, k)
+
+
+def turns(d: np.ndarray) -> np.ndarray:
+    """New direction on days where it flips (0 elsewhere); ``d`` from ``direction``."""
+    out = np.zeros_like(d)
+    flip = (d[:, 1:] != 0) & (d[:, :-1] != 0) & (d[:, 1:] != d[:, :-1])
+    out[:, 1:] = np.where(flip, d[:, 1:], 0)
+    return out
+
+
+def turn_leads(dp: np.ndarray, dr: np.ndarray, window: int = TURN_WINDOW) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Matched realized turns as (series row, lead in days), plus realized turns per row.
+
+    ``dp`` / ``dr`` come from ``direction``. Turns are handled sparsely: for each
+    direction, both sides' turns are keyed by row x days + day (already sorted),
+    and one ``searchsorted`` finds the forecast turns just before and after each
+    realized one.
+    """
+    S, T = dp.shape
+    tp, tr = turns(dp), turns(dr)
+    rows, leads, counts = [], [], np.zeros(S, np.int64)
+    for s in (1, -1):
+        fk = np.flatnonzero(tp == s)                   # row * T + day
+        rk = np.flatnonzero(tr == s)
+        rr, rc = np.divmod(rk, T)
+        counts += np.bincount(rr, minlength=S)
+        if not len(fk) or not len(rk):
+            continue
+        after = np.searchsorted(fk, rk, "left")        # first forecast turn at or after
+        prev = fk[np.maximum(after - 1, 0)]
+        nxt = fk[np.minimum(after, len(fk) - 1)]
+        row0 = rk - rc                                 # key of day 0 in the same row
+        early = np.where((after > 0) & (prev >= row0), rk - prev, 1 << 40)
+        late = np.where((after < len(fk)) & (nxt < row0 + T), nxt - rk, 1 << 40)
+        ok = np.minimum(early, late) <= window
+        rows.append(rr[ok])
+        leads.append(np.where(early <= late, early, -late)[ok])
+    if not rows:
+        return np.empty(0, np.int64), np.empty(0, np.int64), counts
+    return np.concatenate(rows), np.concatenate(leads), counts
+
+
+def _median(rows: np.ndarray, values: np.ndarray, n_rows: int, lo: int, hi: int) -> np.ndarray:
+    """Per-row median of small integers in [lo, hi], from one histogram (NaN for empty rows)."""
+    width = hi - lo + 1
+    hist = np.bincount(rows * width + (values - lo), minlength=n_rows * width).reshape(n_rows, width)
+    cum = hist.cumsum(axis=1)
+    m = cum[:, -1]
+    a = (cum > ((m - 1) // 2)[:, None]).argmax(axis=1)
+    b = (cum > (m // 2)[:, None]).argmax(axis=1)
+    return np.where(m > 0, (a + b) / 2 + lo, np.nan)
+
+
+def rolling_accuracy(dp: np.ndarray, dr: np.ndarray, window: int = WINDOW) -> np.ndarray:
+    """(series x days) share of directional hits over the trailing ``window`` days."""
+    valid = (dp != 0) & (dr != 0)
+    zero = np.zeros((len(dp), 1), np.int32)
+    csum = np.concatenate([zero, np.cumsum(valid & (dp == dr), axis=1, dtype=np.int32)], axis=1)
+    cnt = np.concatenate([zero, np.cumsum(valid, axis=1, dtype=np.int32)], axis=1)
+    lo = np.maximum(np.arange(1, dp.shape[1] + 1) - window, 0)
+    n = cnt[:, 1:] - cnt[:, lo]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(n > 0, (csum[:, 1:] - csum[:, lo]) / n, np.nan)
+
+
+def score(keys: pd.DataFrame, pred: np.ndarray, real: np.ndarray,
+          window: int = WINDOW, turn_window: int = TURN_WINDOW) -> pd.DataFrame:
+    """One row per series: ``keys`` (e.g. model / indicator / horizon) plus its scores."""
+    dp, dr = direction(np.atleast_2d(pred)), direction(np.atleast_2d(real))
+    S = len(dp)
+    c = confusion(dp, dr, (-1, 1))                     # [series, forecast, realized], down first
+    dd, du, ud, uu = c[:, 0, 0], c[:, 0, 1], c[:, 1, 0], c[:, 1, 1]
+    n = uu + dd + du + ud
+    rows, leads, real_turns = turn_leads(dp, dr, turn_window)
+    tp, tr = dp[:, -window:], dr[:, -window:]
+    recent = ((tp != 0) & (tr != 0)).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return keys.reset_index(drop=True).assign(**{
+            "Days": n,
+            "Hit rate": (uu + dd) / n,
+            "Up hit": uu / (uu + du),
+            "Down hit": dd / (dd + ud),
+            "Turns caught": np.bincount(rows, minlength=S) / real_turns,
+            "Median lead (days)": _median(rows, leads, S, -turn_window, turn_window),
+            f"Last {window}d": ((tp == tr) & (tp != 0)).sum(axis=1) / recent,
+        })
+
+
+# ──────────────────────────────────────────────────────────────
+# FRAMEWORK PAGE
+# ──────────────────────────────────────────────────────────────
+def available() -> bool:
+    return SOURCE.exists()
+
+
+def version() -> tuple:
+    return (SOURCE.stat().st_size, SOURCE.stat().st_mtime_ns) if SOURCE.exists() else ()
+
+
+def predicted_quads(pred: np.ndarray, quad_now: np.ndarray) -> np.ndarray:
+    """Quad call per forecast: its sign is the growth leg, today's consensus quad supplies inflation.
+
+    The models forecast growth only, so the inflation direction is carried
+    forward from the quad on the day (up in quads 2 / 3); NaN where either is unknown.
+    """
+    q = np.asarray(quad_now, float)
+    inflation = np.where(np.isin(q, (2, 3)), 1, np.where(np.isfinite(q), -1, 0))
+    return indicators.quad_from_directions(direction(pred), inflation)
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def board(version: tuple) -> tuple[pd.DataFrame, dict[str, pd.DataFrame], pd.DataFrame]:
+    """Score table, quad confusion matrix per model (empty for files without quads), rolling hit rate."""
+    df = pd.read_csv(SOURCE, index_col="date", parse_dates=True).dropna(subset=["target"])
+    keys = pd.DataFrame({"Model": list(MODELS), "Indicator": "Basket fwd return", "Horizon": composite.HORIZON})
+    pred = df[list(MODELS)].to_numpy().T
+    real = np.broadcast_to(df["target"].to_numpy(), pred.shape)
+    rolling = pd.DataFrame(rolling_accuracy(direction(pred), direction(real)).T, index=df.index, columns=list(MODELS))
+    quads = {}
+    if {"quad", "quad_fwd"} <= set(df.columns):
+        c = confusion(predicted_quads(pred, df["quad"].to_numpy()),
+                      np.broadcast_to(df["quad_fwd"].to_numpy(), pred.shape), indicators.QUADS)
+        for m, counts in zip(MODELS, c):
+            quads[m] = pd.DataFrame(counts, index=[f"Pred Q{q}" for q in indicators.QUADS],
+                                    columns=[f"Real Q{q}" for q in indicators.QUADS])
+    return score(keys, pred, real), quads, rolling
+
+
+def section():
+    """Framework page: directional scores of the composite leading index."""
+    if not available():
+        return
+    t, quads, rolling = board(version())
+    pct = {c: st.column_config.ProgressColumn(c, min_value=0, max_value=1, format="percent")
+           for c in ("Hit rate", "Up hit", "Down hit", "Turns caught", f"Last {WINDOW}d")}
+    left, right = st.columns([3, 2]) if quads else (st.container(), None)
+    with left:
+        st.dataframe(t, hide_index=True, width="stretch", column_config=pct)
+    if quads:
+        with right:
+            for tab, c in zip(st.tabs(list(quads)), quads.values()):
+                tab.dataframe(c, width="stretch")
+    st.caption(f"Out-of-sample, walk-forward. A hit is a forecast with the right sign; a turn counts as caught "
+               f"when the forecast flipped the same way within {TURN_WINDOW} days (lead > 0: it flipped first).")
+    if quads:
+        st.caption(f"Quad calls: forecast sign as the growth leg, inflation carried from the day's consensus quad, "
+                   f"against the consensus quad {composite.HORIZON} days later.")
+    st.line_chart(rolling, y_label=f"Hit rate, trailing {WINDOW}d")
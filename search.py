@@ -0,0 +1,275 @@
+"""Full-text search over the PDF briefs and the saved charts.
+
+One document per PDF page (text from the ``pdf_pages`` split, or read from the
+PDF itself while it has no split) and one per chart
+in assets/html (title, axis / colorbar titles, trace names, treemap labels and
+names). Documents are tokenised once per source version; the inverted index is
+a dict of term -> (doc ids, term frequencies) arrays scored with BM25, with the
+last query word also matching as a prefix so results show up while typing.
+
+``get_index`` builds it once per process (``warmup`` does that at start);
+``refresh`` re-reads only sources whose asset-manifest hash (or size / mtime,
+before ``static_assets build`` has run) changed.
+"""
+import bisect
+import json
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+
+from figures import from_html
+from paths import ASSETS, resolve
+from pdf_pages import HAS_PYPDF, INDEX, PAGES_DIR, PDF_DIR, extract
+from static_assets import load_manifest
+
+HTML_DIR = ASSETS / "html"
+K1, B = 1.2, 0.75
+MAX_PREFIX_TERMS = 32
+REFRESH_INTERVAL = 5.0     # seconds between source re-scans during searches
+SNIPPET_CHARS = 70
+_TOKEN = re.compile(r"[0-9a-z]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has in into is it its of on or that the this to was were with".split()
+)
+
+
+def tokens(text: str) -> list[str]:
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode().lower()
+    return [t for t in _TOKEN.findall(text) if t not in STOPWORDS]
+
+
+@dataclass
+class Doc:
+    id: str
+    kind: str          # "pdf" | "chart"
+    source: str        # asset the result opens, relative to ./assets
+    title: str
+    page: int | None
+    text: str          # whitespace-collapsed, for snippets
+    counts: Counter
+    length: int
+
+
+@dataclass
+class Hit:
+    doc: Doc
+    score: float
+    snippet: str
+
+
+def _doc(id, kind, source, title, page, text) -> Doc:
+    toks = tokens(f"{title}\n{text}")
+    return Doc(id, kind, source, title, page, re.sub(r"\s+", " ", text).strip(), Counter(toks), len(toks))
+
+
+# ──────────────────────────────────────────────────────────────
+# EXTRACTION
+# ──────────────────────────────────────────────────────────────
+def _title_text(obj) -> str:
+    if isinstance(obj, dict):
+        obj = obj.get("text", "")
+    return obj if isinstance(obj, str) else ""
+
+
+def _chart_text(fig: dict) -> tuple[str, str]:
+    layout = fig.get("layout", {})
+    title = _title_text(layout.get("title"))
+    parts = [title]
+    for k, v in layout.items():
+        if isinstance(v, dict) and (k.startswith(("xaxis", "yaxis", "coloraxis"))):
+            parts.append(_title_text(v.get("title")))
+            parts.append(_title_text(v.get("colorbar", {}).get("title")))
+    for t in fig.get("data", []):
+        parts.append(str(t.get("name") or ""))
+        for key in ("labels", "text"):
+            v = t.get(key)
+            if isinstance(v, list):
+                parts.extend(x for x in v if isinstance(x, str))
+        cd = t.get("customdata")
+        if isinstance(cd, list):    # treemaps carry the full asset name in column 0
+            parts.extend(row[0] for row in cd if isinstance(row, list) and row and isinstance(row[0], str))
+        parts.append(_title_text(t.get("marker", {}).get("colorbar", {}).get("title")))
+    return title, "\n".join(dict.fromkeys(p for p in parts if p))
+
+
+def chart_docs(path: Path) -> list[Doc]:
+    rel = path.relative_to(ASSETS).as_posix()
+    out = []
+    for i, fig in enumerate(from_html(path.read_text(encoding="utf-8"))):
+        title, text = _chart_text(fig)
+        out.append(_doc(f"chart:{rel}#{i}", "chart", rel, title or path.stem.replace("_", " "), None, text))
+    return out
+
+
+def pdf_docs(path: Path) -> list[Doc]:
+    """Page documents from a split's ``index.json``, or extracted from the PDF itself."""
+    idx = extract(path) if path.suffix == ".pdf" else json.loads(path.read_text(encoding="utf-8"))
+    rel = f"pdf/{idx['source']['file']}"
+    return [_doc(f"pdf:{rel}#{p['n']}", "pdf", rel, p["title"], p["n"], p["text"]) for p in idx["pages"]]
+
+
+# ──────────────────────────────────────────────────────────────
+# INDEX
+# ──────────────────────────────────────────────────────────────
+class SearchIndex:
+    def __init__(self, html_dir: Path = HTML_DIR, pages_dir: Path = PAGES_DIR, pdf_dir: Path = PDF_DIR):
+        self.html_dir = html_dir
+        self.pages_dir = pages_dir
+        self.pdf_dir = pdf_dir
+        self._sources: dict[str, tuple] = {}     # rel path -> (signature, docs)
+        self._lock = threading.Lock()
+        self._checked = 0.0
+        self._state = ([], {}, [], np.zeros(0, np.float32))  # docs, postings, sorted vocab, BM25 length norms
+
+    def _scan(self) -> dict[str, Path]:
+        found = {p.relative_to(ASSETS).as_posix(): p for p in sorted(self.html_dir.glob("*.html"))}
+        split = sorted(self.pages_dir.glob(f"*/{INDEX}"))
+        found.update({p.relative_to(ASSETS).as_posix(): p for p in split})
+        if HAS_PYPDF:   # PDFs without a split (e.g. a fresh clone) are read directly
+            done = {p.parent.name for p in split}
+            found.update({p.relative_to(ASSETS).as_posix(): p for p in sorted(self.pdf_dir.glob("*.pdf"))
+                          if p.stem not in done})
+        return found
+
+    def refresh(self, force: bool = False) -> bool:
+        """Re-extract changed sources and rebuild postings; True if anything changed."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._checked < REFRESH_INTERVAL:
+                return False
+            self._checked = now
+            manifest = load_manifest()
+            changed = False
+            found = self._scan()
+            for rel in set(self._sources) - set(found):
+                del self._sources[rel]
+                changed = True
+            for rel, path in found.items():
+                st_ = path.stat()
+                entry = manifest.get(rel)
+                sig = entry["sha256"] if entry and entry["size"] == st_.st_size else (st_.st_size, st_.st_mtime_ns)
+                if rel in self._sources and self._sources[rel][0] == sig:
+                    continue
+                docs = pdf_docs(path) if path.name == INDEX or path.suffix == ".pdf" else chart_docs(path)
+                self._sources[rel] = (sig, docs)
+                changed = True
+            if changed or not self._state[0]:
+                self._rebuild()
+            return changed
+
+    def _rebuild(self):
+        docs = [d for _, ds in sorted(self._sources.items()) for d in ds[1]]
+        acc: dict[str, tuple[list, list]] = {}
+        for i, d in enumerate(docs):
+            for term, tf in d.counts.items():
+                ids, tfs = acc.setdefault(term, ([], []))
+                ids.append(i)
+                tfs.append(tf)
+        n = len(docs)
+        postings = {}
+        for term, (ids, tfs) in acc.items():
+            idf = np.log(1 + (n - len(ids) + 0.5) / (len(ids) + 0.5))
+            postings[term] = (np.asarray(ids, np.int32), np.asarray(tfs, np.float32), np.float32(idf))
+        lengths = np.asarray([d.length for d in docs], np.float32)
+        norm = K1 * (1 - B + B * lengths / max(float(lengths.mean()), 1.0)) if n else lengths
+        self._state = (docs, postings, sorted(postings), norm.astype(np.float32))
+
+    def _expand(self, vocab: list[str], prefix: str) -> list[str]:
+        i = bisect.bisect_left(vocab, prefix)
+        out = []
+        while i < len(vocab) and vocab[i].startswith(prefix) and len(out) < MAX_PREFIX_TERMS:
+            out.append(vocab[i])
+            i += 1
+        return out
+
+    def search(self, query: str, limit: int = 8) -> list[Hit]:
+        """BM25-ranked documents; the last query word also matches as a prefix."""
+        self.refresh()
+        docs, postings, vocab, norm = self._state
+        q = tokens(query)
+        if not q or not docs:
+            return []
+        scores = np.zeros(len(docs), np.float32)
+        matched = np.zeros(len(docs), np.int16)
+        for j, term in enumerate(q):
+            terms = [term] if j < len(q) - 1 else ([term] if term in postings else []) + \
+                [t for t in self._expand(vocab, term) if t != term]
+            hit = np.zeros(len(docs), bool)
+            for t in terms:
+                ids, tf, idf = postings.get(t, (None, None, None))
+                if ids is None:
+                    continue
+                scores[ids] += idf * tf * (K1 + 1) / (tf + norm[ids])
+                hit[ids] = True
+            matched += hit
+        # every query word must match (AND), ranked by BM25
+        ok = np.flatnonzero(matched == len(q))
+        top = ok[np.argsort(-scores[ok], kind="stable")[:limit]]
+        return [Hit(docs[i], float(scores[i]), snippet(docs[i].text, q)) for i in top]
+
+
+def snippet(text: str, q: list[str]) -> str:
+    low = text.lower()
+    pos = min((p for p in (low.find(t) for t in q) if p >= 0), default=0)
+    start = max(0, pos - SNIPPET_CHARS // 2)
+    cut = text[start:start + SNIPPET_CHARS * 2].strip()
+    return ("…" if start else "") + cut + ("…" if start + SNIPPET_CHARS * 2 < len(text) else "")
+
+
+@st.cache_resource(show_spinner=False)
+def get_index() -> SearchIndex:
+    idx = SearchIndex()
+    idx.refresh(force=True)
+    return idx
+
+
+# ──────────────────────────────────────────────────────────────
+# SIDEBAR
+# ──────────────────────────────────────────────────────────────
+def _asset_rel(p) -> str:
+    return resolve(p).resolve().relative_to(ASSETS.resolve()).as_posix()
+
+
+def _open(nav_key: str, page: str, doc: Doc, preview: tuple[str, str] | None):
+    st.session_state[nav_key] = page
+    if preview and doc.page:
+        key, label = preview
+        st.session_state[f"{key}-on"] = True
+        st.session_state[f"{key}-doc"] = label
+        st.session_state[f"{key}-page-{Path(doc.source).stem}"] = doc.page
+
+
+def sidebar(locations: dict, previews: dict | None = None, nav_key: str = "nav", limit: int = 8):
+    """Search box + ranked results; clicking one switches the ``nav_key`` radio to its page.
+
+    ``locations`` maps asset paths to the page that shows them (assets this app
+    doesn't show are left out of the results); ``previews``
+    maps PDF paths to the ``(key, label)`` of a ``pdf_preview`` to open at the hit.
+    """
+    q = st.sidebar.text_input("Search briefs & charts", key="search-q", placeholder="e.g. Stagflation, Copper")
+    if not q.strip():
+        return
+    where = {_asset_rel(p): page for p, page in locations.items()}
+    pv = {_asset_rel(p): v for p, v in (previews or {}).items()}
+    hits = [h for h in get_index().search(q, limit * 3) if h.doc.source in where][:limit]
+    if not hits:
+        st.sidebar.caption("No matches.")
+        return
+    for i, h in enumerate(hits):
+        page = where[h.doc.source]
+        label = h.doc.title + (f" · p.{h.doc.page}" if h.doc.page else "")
+        st.sidebar.button(
+            f"{'📄' if h.doc.kind == 'pdf' else '📊'} {label}",
+            key=f"search-hit-{i}",
+            help=h.snippet,
+            on_click=_open,
+            args=(nav_key, page, h.doc, pv.get(h.doc.source)),
+            width="stretch",
+        )
@@ -0,0 +1,222 @@
+"""Precompressed, content-addressed static assets.
+
+``build`` writes gzip (and brotli, if the ``brotli`` package is installed)
+variants of every compressible file under ./assets once per content hash, plus
+a manifest. ``respond`` picks the representation a client accepts and returns
+strong ETags / cache headers; ``serve`` runs a small threaded HTTP server on
+top of it that ``downloads`` can point at via ``ASSET_BASE_URL``.
+
+    python static_assets.py build
+    python static_assets.py serve --port 8502
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import mimetypes
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from datastore import atomic_write_bytes, atomic_write_text
+from paths import ASSETS
+
+try:
+    import brotli
+except ImportError:  # optional: gzip-only without it
+    brotli = None
+
+CACHE_DIR = ASSETS / ".compressed"
+MANIFEST = CACHE_DIR / "manifest.json"
+SKIP_SUFFIXES = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".gz", ".br", ".zip"}
+MIN_SAVING = 0.05      # keep a variant only if it is at least 5% smaller
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "public, no-cache"
+ENCODINGS = {"br": ".br", "gzip": ".gz"}   # server preference order
+
+
+# ──────────────────────────────────────────────────────────────
+# BUILD
+# ──────────────────────────────────────────────────────────────
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _compress(data: bytes, encoding: str) -> bytes | None:
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(data, quality=11)
+    return None
+
+
+def build(root: Path = ASSETS) -> dict:
+    """Refresh the manifest; compress only files whose content hash is new."""
+    old = load_manifest()
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    files = {}
+    for p in sorted(root.rglob("*")):
+        if not p.is_file() or CACHE_DIR in p.parents or p.name.startswith("."):
+            continue
+        rel = p.relative_to(root).as_posix()
+        st = p.stat()
+        prev = old.get(rel)
+        digest = prev["sha256"] if prev and prev["size"] == st.st_size and prev["mtime_ns"] == st.st_mtime_ns else _sha256(p)
+        entry = {
+            "sha256": digest,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "type": mimetypes.guess_type(p.name)[0] or "application/octet-stream",
+            "variants": {},
+        }
+        if p.suffix.lower() not in SKIP_SUFFIXES:
+            data = None
+            for enc, ext in ENCODINGS.items():
+                out = CACHE_DIR / f"{digest[:32]}{ext}"
+                if not out.exists():
+                    data = data if data is not None else p.read_bytes()
+                    packed = _compress(data, enc)
+                    if packed is None or len(packed) > (1 - MIN_SAVING) * len(data):
+                        continue
+                    atomic_write_bytes(out, packed)     # a torn write must never look like a variant
+                entry["variants"][enc] = {"file": out.name, "size": out.stat().st_size}
+        files[rel] = entry
+    live = {v["file"] for e in files.values() for v in e["variants"].values()}
+    for stale in CACHE_DIR.glob("*"):
+        if stale.suffix in (".gz", ".br") and stale.name not in live:
+            stale.unlink()
+    atomic_write_text(MANIFEST, json.dumps(files, indent=1, sort_keys=True))
+    return files
+
+
+def load_manifest() -> dict:
+    if MANIFEST.exists():
+        return json.loads(MANIFEST.read_text(encoding="utf-8"))
+    return {}
+
+
+def url_for(rel: str, manifest: dict | None = None, base: str = "") -> str:
+    """Content-addressed URL (``?v=<hash>``) that can be cached forever."""
+    entry = (manifest if manifest is not None else load_manifest()).get(rel)
+    suffix = f"?v={entry['sha256'][:12]}" if entry else ""
+    return f"{base}/{rel}{suffix}"
+
+
+# ──────────────────────────────────────────────────────────────
+# NEGOTIATION
+# ──────────────────────────────────────────────────────────────
+def accepted(accept_encoding: str | None) -> dict[str, float]:
+    """Parse Accept-Encoding into {coding: q}."""
+    out = {}
+    for part in (accept_encoding or "").split(","):
+        bits = [b.strip() for b in part.split(";")]
+        if not bits[0]:
+            continue
+        q = 1.0
+        for b in bits[1:]:
+            if b.startswith("q="):
+                try:
+                    q = float(b[2:])
+                except ValueError:
+                    q = 0.0
+        out[bits[0].lower()] = q
+    return out
+
+
+def negotiate(accept_encoding: str | None, available) -> str | None:
+    """Best available coding the client accepts (None = identity)."""
+    acc = accepted(accept_encoding)
+    best, best_q = None, 0.0
+    for enc in ENCODINGS:
+        if enc not in available:
+            continue
+        q = acc.get(enc, acc.get("*", 0.0))
+        if q > best_q:
+            best, best_q = enc, q
+    return best
+
+
+def etag(entry: dict, encoding: str | None) -> str:
+    return f'"{entry["sha256"][:32]}{"-" + encoding if encoding else ""}"'
+
+
+def respond(rel: str, headers: dict, query: dict | None = None, root: Path = ASSETS,
+            manifest: dict | None = None) -> tuple[int, dict, Path | None]:
+    """(status, response headers, file to send) for one GET of ``rel``."""
+    manifest = manifest if manifest is not None else load_manifest()
+    h = {k.lower(): v for k, v in headers.items()}
+    entry = manifest.get(rel)
+    path = (root / rel).resolve()
+    if entry is None or root.resolve() not in path.parents or not path.is_file():
+        return HTTPStatus.NOT_FOUND, {}, None
+
+    enc = negotiate(h.get("accept-encoding"), entry["variants"])
+    tag = etag(entry, enc)
+    versioned = (query or {}).get("v") == entry["sha256"][:12]
+    out = {
+        "ETag": tag,
+        "Cache-Control": IMMUTABLE if versioned else REVALIDATE,
+        "Vary": "Accept-Encoding",
+        "Content-Type": entry["type"],
+    }
+    inm = h.get("if-none-match")
+    if inm and (inm.strip() == "*" or tag in [t.strip().removeprefix("W/") for t in inm.split(",")]):
+        return HTTPStatus.NOT_MODIFIED, out, None
+    if enc:
+        out["Content-Encoding"] = enc
+        body = CACHE_DIR / entry["variants"][enc]["file"]
+    else:
+        body = path
+    out["Content-Length"] = str(body.stat().st_size)
+    return HTTPStatus.OK, out, body
+
+
+# ──────────────────────────────────────────────────────────────
+# SERVER
+# ──────────────────────────────────────────────────────────────
+class AssetHandler(BaseHTTPRequestHandler):
+    manifest: dict = {}
+
+    def _handle(self, send_body: bool):
+        url = urlsplit(self.path)
+        rel = unquote(url.path).lstrip("/")
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        status, headers, body = respond(rel, dict(self.headers), query, manifest=self.manifest)
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.end_headers()
+        if send_body and body is not None:
+            with body.open("rb") as f:
+                while chunk := f.read(1 << 16):
+                    self.wfile.write(chunk)
+
+    def do_GET(self):
+        self._handle(True)
+
+    def do_HEAD(self):
+        self._handle(False)
+
+
+def serve(port: int = 8502, host: str = "127.0.0.1"):
+    AssetHandler.manifest = build()
+    ThreadingHTTPServer((host, port), AssetHandler).serve_forever()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("command", choices=["build", "serve"])
+    ap.add_argument("--port", type=int, default=8502)
+    ap.add_argument("--host", default="127.0.0.1")
+    args = ap.parse_args()
+    if args.command == "build":
+        for rel, e in build().items():
+            sizes = ", ".join(f"{k} {v['size'] / 1024:.0f} KB" for k, v in e["variants"].items()) or "-"
+            print(f"{rel}: {e['size'] / 1024:.0f} KB -> {sizes}")
+    else:
+        serve(args.port, args.host)
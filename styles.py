@@ -0,0 +1,73 @@
+"""Site stylesheet: named CSS fragments, sent to each browser session once.
+
+Pages used to inject their ``<style>`` blocks with ``st.markdown`` on every
+run, so the same CSS went over the websocket again on each click. Fragments
+are now registered once at import (minified, keyed by a content hash), and
+``emit`` sends only the ones this session hasn't received yet. They go into a
+single ``<style id="site-styles">`` in the page ``<head>``, which Streamlit
+doesn't manage, so they stay applied on later runs that send nothing.
+
+The sent hashes live in ``st.session_state``; a reload starts a new session
+(and a fresh page), so everything is sent again then. Chart iframes are
+separate documents and keep their own CSS (see ``embeds``).
+"""
+import hashlib
+import json
+import re
+
+import streamlit as st
+
+SENT_KEY = "_styles_sent"
+_FRAGMENTS: dict[str, tuple[str, str]] = {}    # name -> (hash, minified css)
+
+_INJECT = """<script>
+(() => {
+  let el = document.getElementById("site-styles");
+  if (!el) {
+    el = document.createElement("style");
+    el.id = "site-styles";
+    el.dataset.hashes = "";
+    document.head.appendChild(el);
+  }
+  const have = new Set(el.dataset.hashes.split(" ").filter(Boolean));
+  for (const [h, css] of %s) {
+    if (!have.has(h)) { el.appendChild(document.createTextNode(css)); have.add(h); }
+  }
+  el.dataset.hashes = [...have].join(" ");
+})();
+</script>"""
+
+
+def minify(css: str) -> str:
+    """Strip ``<style>`` tags and comments, collapse whitespace around punctuation."""
+    css = re.sub(r"</?style[^>]*>", "", css, flags=re.I)
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    return css.replace(";}", "}").strip()
+
+
+def register(name: str, css: str) -> str:
+    """Add (or replace) a named fragment; returns its hash."""
+    body = minify(css)
+    h = hashlib.sha256(body.encode()).hexdigest()[:12]
+    _FRAGMENTS[name] = (h, body)
+    return h
+
+
+def stylesheet(*names: str) -> str:
+    """The named fragments as one minified stylesheet, duplicates dropped."""
+    seen = dict.fromkeys(_FRAGMENTS[n] for n in names)
+    return "".join(body for _, body in seen)
+
+
+def emit(*names: str, container=st):
+    """Send the named fragments this session doesn't have yet (no-op once it has all)."""
+    sent = st.session_state.setdefault(SENT_KEY, set())
+    todo = [frag for frag in dict.fromkeys(_FRAGMENTS[n] for n in names) if frag[0] not in sent]
+    if not todo:
+        return
+    payload = json.dumps(todo).replace("</", "<\\/")
+    container.html(_INJECT % payload, unsafe_allow_javascript=True)
+    sent.update(h for h, _ in todo)
@@ -0,0 +1,81 @@
+"""Shared dark Plotly template matching .streamlit/config.toml.
+
+Figures are stored without a template (``strip``) and get the registered
+``dorian`` template back when they are rendered (``apply``), pruned to the
+trace types the figure actually uses.
+"""
+import copy
+import tomllib
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from paths import APP_DIR
+
+NAME = "dorian"
+
+
+def _config_theme() -> dict:
+    cfg = APP_DIR / ".streamlit" / "config.toml"
+    try:
+        return tomllib.loads(cfg.read_text(encoding="utf-8")).get("theme", {})
+    except (OSError, tomllib.TOMLDecodeError):
+        return {}
+
+
+_theme = _config_theme()
+BG      = _theme.get("backgroundColor", "#0B1220")
+CARD    = _theme.get("secondaryBackgroundColor", "#0f172a")
+PRIMARY = _theme.get("primaryColor", "#60a5fa")
+TEXT    = _theme.get("textColor", "#ffffff")
+MUTED   = "#9fb3c8"
+GRID    = "rgba(255,255,255,.06)"
+
+_axis = dict(color=MUTED, gridcolor=GRID, linecolor=GRID, zerolinecolor=GRID, automargin=True)
+
+TEMPLATE = go.layout.Template(
+    layout=dict(
+        paper_bgcolor=BG,
+        plot_bgcolor=BG,
+        font=dict(color=TEXT, family="Source Sans Pro, sans-serif"),
+        title=dict(x=0.02, font=dict(size=18)),
+        colorway=[PRIMARY, "#f59e0b", "#34d399", "#f87171", "#a78bfa", "#22d3ee", "#f472b6", "#a3e635"],
+        xaxis=_axis,
+        yaxis=_axis,
+        legend=dict(bgcolor="rgba(0,0,0,0)", font=dict(color=MUTED)),
+        hoverlabel=dict(bgcolor=CARD, bordercolor=PRIMARY, font=dict(color=TEXT)),
+        coloraxis=dict(colorbar=dict(outlinewidth=0, tickcolor=MUTED, tickfont=dict(color=MUTED))),
+        margin=dict(l=40, r=20, t=50, b=40),
+    ),
+    data=dict(
+        scatter=[go.Scatter(line=dict(width=1.6))],
+        bar=[go.Bar(marker=dict(line=dict(width=0)))],
+        treemap=[go.Treemap(
+            marker=dict(line=dict(color=BG, width=1), colorbar=dict(outlinewidth=0, tickfont=dict(color=MUTED))),
+            pathbar=dict(textfont=dict(color=TEXT)),
+        )],
+    ),
+)
+pio.templates[NAME] = TEMPLATE
+
+
+def strip(spec: dict) -> dict:
+    """Figure dict without its (usually full default) template."""
+    spec = dict(spec)
+    spec["layout"] = {k: v for k, v in spec.get("layout", {}).items() if k != "template"}
+    return spec
+
+
+def pruned(types) -> dict:
+    """The registered template as a dict, keeping trace defaults only for ``types``."""
+    tpl = copy.deepcopy(pio.templates[NAME].to_plotly_json())
+    tpl["data"] = {t: v for t, v in tpl.get("data", {}).items() if t in set(types)}
+    return tpl
+
+
+def apply(spec: dict) -> dict:
+    """Attach the pruned theme to a stripped figure dict at render time."""
+    spec = strip(spec)
+    types = {t.get("type", "scatter") for t in spec.get("data", [])}
+    spec["layout"]["template"] = pruned(types)
+    return spec
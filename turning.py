@@ -0,0 +1,131 @@
+"""Streaming turning-point detector for growth and inflation momentum.
+
+Quads are defined by whether growth and inflation are accelerating or
+decelerating. Each series keeps a small state:
+
+* its last value and first difference;
+* an exponentially smoothed second difference ``s`` (span ``SPAN``
+  observations) and its smoothed RMS;
+* its current direction (+1 accelerating, -1 decelerating, 0 before warm-up)
+  and the number of observations since it last flipped.
+
+The direction flips to +1 only once ``s`` rises above ``THRESHOLD`` RMS, and
+to -1 only once it falls below ``-THRESHOLD`` RMS (hysteresis). A flip also
+needs the current direction to have held for ``DWELL`` observations. Every
+state is an array over the whole universe, so ``update`` costs O(1) per series
+and never looks back at history. A series with a NaN that day is left alone,
+which lets monthly prints and daily market series share one detector.
+
+``update`` returns the turn events. ``votes`` maps (growth, inflation) series
+pairs to quads with ``indicators.quad_from_directions``, in the same shape as
+the regime store's signal votes. ``save`` / ``load`` carry the state between
+runs, so a nightly job only feeds the new day.
+"""
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+import indicators
+
+SPAN = 6            # smoothing of the second difference, in observations
+THRESHOLD = 0.5     # hysteresis band, in RMS of the smoothed second difference
+DWELL = 3           # observations a direction must hold before it can flip
+WARMUP = 12         # second differences seen before a series gets a direction
+
+
+class Turn(NamedTuple):
+    series: str
+    date: pd.Timestamp
+    direction: int          # new direction: +1 accelerating, -1 decelerating
+    previous: int           # 0 for a series' first direction after warm-up
+    strength: float         # smoothed second difference in RMS units
+
+
+class Detector:
+    """Turning-point state for every series in the universe."""
+
+    _STATE = ("x", "d1", "s", "ms", "n", "direction", "age")
+
+    def __init__(self, names, span: int = SPAN, threshold: float = THRESHOLD,
+                 dwell: int = DWELL, warmup: int = WARMUP):
+        k = len(names)
+        self.names = list(names)
+        self.span, self.threshold, self.dwell, self.warmup = span, threshold, dwell, warmup
+        self.alpha = 2.0 / (span + 1)
+        self.x = np.full(k, np.nan)            # last value
+        self.d1 = np.full(k, np.nan)           # last first difference
+        self.s = np.zeros(k)                   # smoothed second difference
+        self.ms = np.zeros(k)                  # smoothed squared second difference
+        self.n = np.zeros(k, np.int64)         # second differences seen
+        self.direction = np.zeros(k, np.int8)
+        self.age = np.full(k, dwell, np.int64)
+        self.asof = None
+
+    def update(self, date, values) -> list[Turn]:
+        """Feed one observation per series (NaN = none today); returns the turns it caused."""
+        v = np.asarray(values, float)
+        ok = np.isfinite(v)
+        d1 = v - self.x
+        d2 = d1 - self.d1
+        has = ok & np.isfinite(d2)
+        a = self.alpha
+        self.s[has] += a * (d2[has] - self.s[has])
+        self.ms[has] += a * (d2[has] ** 2 - self.ms[has])
+        self.n[has] += 1
+        self.d1[ok] = d1[ok]
+        self.x[ok] = v[ok]
+        self.age[ok] += 1
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            z = self.s / np.sqrt(self.ms)
+        want = np.where(z > self.threshold, 1, np.where(z < -self.threshold, -1, self.direction))
+        flip = has & (self.n >= self.warmup) & (want != self.direction) & (self.age >= self.dwell)
+        self.asof = pd.Timestamp(date)
+        if not flip.any():
+            return []
+        idx = np.flatnonzero(flip)
+        prev = self.direction[idx].copy()
+        self.direction[idx] = want[idx]
+        self.age[idx] = 0
+        return [Turn(self.names[i], self.asof, int(self.direction[i]), int(p), float(z[i])) for i, p in zip(idx, prev)]
+
+    def replay(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Feed a (dates x series) history row by row; returns its turns as a table."""
+        values = frame.reindex(columns=self.names).to_numpy(float)
+        events = []
+        for day, row in zip(frame.index, values):
+            events += self.update(day, row)
+        return pd.DataFrame(events, columns=Turn._fields)
+
+    def directions(self) -> pd.Series:
+        return pd.Series(self.direction, index=self.names, name=self.asof)
+
+    def votes(self, pairs: dict[str, tuple[str, str]]) -> pd.Series:
+        """Quad per signal from ``{signal: (growth series, inflation series)}`` (NaN until both have a direction)."""
+        pos = {n: i for i, n in enumerate(self.names)}
+        g = self.direction[[pos[p[0]] for p in pairs.values()]]
+        i = self.direction[[pos[p[1]] for p in pairs.values()]]
+        return pd.Series(indicators.quad_from_directions(g, i), index=list(pairs), name=self.asof)
+
+    # ── persistence ──────────────────────────────────────────
+    def save(self, path: Path | str):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.stem}.tmp.npz")
+        np.savez(tmp, names=np.array(self.names), asof=np.array(str(self.asof or "")),
+                 params=np.array([self.span, self.threshold, self.dwell, self.warmup], float),
+                 **{k: getattr(self, k) for k in self._STATE})
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path | str) -> "Detector":
+        with np.load(path) as z:
+            span, threshold, dwell, warmup = z["params"]
+            det = cls(z["names"].tolist(), int(span), float(threshold), int(dwell), int(warmup))
+            for k in cls._STATE:
+                setattr(det, k, z[k].copy())
+            det.asof = pd.Timestamp(str(z["asof"])) if str(z["asof"]) else None
+        return det
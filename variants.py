@@ -0,0 +1,174 @@
+"""Layout specs for the microsite variants.
+
+Everything that differs between the versions of the site lives here; the
+page code in ``microsite`` is shared. ``"1"`` is the full site (app.py),
+``"2"`` the three-column case-study layout without the strategy evaluation
+(app2.py), ``"3"`` the regime-definition wording of the overview and
+allocation notes (app3.py).
+"""
+import copy
+
+DEFAULT = "1"
+
+_PDFS = {
+    "Resume": "assets/pdf/Dylan_Sturdevant_Resume.pdf",
+    "Strategy Snapshot": "assets/pdf/Strategy_Snapshot.pdf",
+    "Leading Indicators Brief": "assets/pdf/Leading_Indicators.pdf",
+    "Financial Conditions Indexes": "assets/pdf/Financial_Conditions_Indexes.pdf",
+}
+_GLOBAL_EVAL = {"Global Multi-Asset Strategy Evaluation": "assets/pdf/Global_Multi_Asset_Strategy_Evaluation.pdf"}
+
+# ──────────────────────────────────────────────────────────────
+# OVERVIEW / FRAMEWORK TEXT
+# ──────────────────────────────────────────────────────────────
+BUILD_DECISIONS = (
+    "- Empirical frameworks that identify when growth and inflation momentum are turning, helping guide pro-cycle vs. defensive positioning.\n"
+    "- Dashboards that connect leading indicators, market behavior, and financial conditions to real portfolio decisions.\n"
+    "- Tools for testing investment hypotheses: which signals lead which assets, how factors react in each regime, and where risks are building.\n"
+    "- Models that translate macro signals into tilts, timing, and risk allocation, not academic forecasts."
+)
+BUILD_REGIMES = (
+    "- Empirical frameworks that quantify how shifts in growth and inflation momentum define economic regimes.\n"
+    "- Dashboards and analytics that monitor leading indicators, financial conditions, and asset behavior through each regime.\n"
+    "- Data-driven tools for testing hypotheses about macro drivers and forecasting regime transitions."
+)
+DECISIONS = (
+    "- Identifies when markets are transitioning between regimes, allowing for timely pro-cycle or defensive tilts.\n"
+    "- Highlights which assets have historically outperformed in similar macro environments, improving return per unit of risk.\n"
+    "- Flags divergences between price action, liquidity, and leading indicators, providing early warning before positioning breaks.\n"
+    "- Simplifies complex macro data into a small set of actionable signals that PMs can apply in daily or weekly decision cycles."
+)
+
+ALLOCATION_EVIDENCE = """
+        - Regime signals translate directly into positioning: overweight assets that tend to perform well in the current quad and underweight those that tend to struggle.  
+        - Backtests show how each asset class behaves when growth and inflation are accelerating or decelerating. This supports tactical tilts based on evidence rather than opinion.  
+        - Leading indicators and FCIs help identify regime shifts early, which gives time to rotate positions before consensus adjusts.  
+        - Emphasis on risk-aware allocation: reduce drawdown risk during transitions and redeploy capital when signals confirm stability.  
+        <br>
+        <span style="color:gray; font-size:0.9em;">
+            More methodology and examples are included in the PDFs below.
+        </span>
+        """
+ALLOCATION_EDGE = """
+            - The economic quad framework directly informs portfolio tilts and risk allocation.  
+            - Tilt toward asset classes with favorable risk/reward profiles in each regime, guided by backtests and live signals.  
+            - Prioritize capital preservation during regime transitions; reduce exposure to vulnerable assets.  
+            - The real edge lies in anticipating regime shifts before they become consensus.  
+            <br>
+            <span style="color:gray; font-size:0.9em;">
+                More detail and methodology can be seen in the PDF downloads below
+            </span>
+            """
+
+# ──────────────────────────────────────────────────────────────
+# CASE STUDIES
+# ──────────────────────────────────────────────────────────────
+# a card is a title, one way in (``pdf`` button, ``anchor`` styled <a>, or
+# ``link`` button) and a markdown body
+FACTOR_URL = "https://factor-attribution.streamlit.app/"
+BVOL_URL = "https://dylan-s-blackwater-case-study.streamlit.app/"
+BEHAVIORAL_URL = "https://behavorialperformancestudy.streamlit.app/"
+
+CARDS_GRID = [
+    dict(
+        title="Global Multi-Asset Strategy Evaluation",
+        pdf=("Global Multi-Asset Strategy Evaluation", "ph-3"),
+        body="""
+                - Define a clear, practical measure of investment success aligned with mandate & history.  
+                - Review a 65/35 model portfolio and recommend allocation changes with supporting visuals.
+                """,
+    ),
+    dict(
+        title="Factor Attribution & Regime Analysis",
+        anchor=("🌐 Open Factor Attribution App", FACTOR_URL),
+        body="""
+                - Decomposes fund and ETF returns into exposures across 20+ macro, style, and cross-asset factors.  
+                - Tracks rolling betas to show how exposures shift across market regimes.  
+                - Highlights top performance drivers with Plotly visuals and automated factor rankings.
+                """,
+    ),
+    dict(
+        title="Deviation & BVOL Case Study: Regime-Conditioned Signal Behavior",
+        anchor=("🌐 Open BVOL Case Study", BVOL_URL),
+        body="""
+                - Analyzes extreme deviation readings & BVOL spikes vs. forward returns.  
+                - Backtests +2.0 deviation triggers with a cooldown and evaluates Sharpe & pre/post performance.  
+                - Builds a BVOL-driven short-horizon XRT strategy and optimizes stop-loss rules.
+                """,
+    ),
+    dict(
+        title="Behavioral Performance Study: Persistence vs. Reversal Dynamics",
+        link=("🌐 Open Behavioral Performance App", BEHAVIORAL_URL),
+        body="""
+                - Tests momentum vs. mean-reversion dynamics in S&P 500 constituents.  
+                - Compares whether recent outperformers continue outperforming or revert.
+                """,
+    ),
+]
+
+CARDS_ROW = [
+    dict(
+        title="Factor Attribution & Regime-Aware Exposures",
+        anchor=("🌐 Open Factor Attribution App", FACTOR_URL),
+        body=(
+            "- Decomposes fund and ETF returns into exposures across 20+ macro, style, and cross-asset factors..\n"
+            "- Tracks static and rolling betas to show how exposures shift across market regimes..\n"
+            "- Highlights key drivers of performance with Plotly visuals and automated ranking of the most influential factors."
+        ),
+    ),
+    dict(
+        title="Deviation & BVOL Case Study: Regime-Conditioned Signal Behavior",
+        anchor=("🌐 Open BVOL Case Study", BVOL_URL),
+        body=(
+            " Analyze how extreme deviation readings and BVOL spikes relate to short-term forward returns, and test whether these signals can form a systematic trading strategy on XRT.\n"
+            "- **Deviation analysis:** Built scatterplots of 20-day forward returns vs. deviation levels, fitted trend lines, and calculated hit rates across deviation buckets.\n"
+            "- **Deviation backtest:** Tested +2.0 deviation triggers with a 30-day cooldown, evaluating 60-day event-aligned performance, hit rates, and trade-level Sharpe ratios.\n"
+            "- **BVOL strategy:** Designed a short-horizon XRT strategy using BVOL percentile/z-score signals and optimized stop-loss rules (fixed % and ATR-based) with historical statistics."
+        ),
+    ),
+    dict(
+        title="Behavioral Performance Study: Persistence vs. Reversal Dynamics",
+        link=("🌐 Open Behavorial Performance App", BEHAVIORAL_URL),
+        body=(
+            " Test two competing theories of market behavior among S&P 500 constituents (as of Oct 2024) between Q4 2024 and Q1 2025\n"
+            "- **Momentum hypothesis:** Stocks that recently outperformed will continue to outperform\n"
+            "- **Mean reversion hypothesis:** Stocks that recently outperformed will underperform"
+        ),
+    ),
+]
+
+# ──────────────────────────────────────────────────────────────
+# VARIANTS
+# ──────────────────────────────────────────────────────────────
+VARIANTS = {
+    "1": dict(
+        pdfs={**_PDFS, "Resume": "assets/pdf/Dylan_Sturdevant - Resume.pdf", **_GLOBAL_EVAL},
+        case_card_css=True,
+        overview_build=BUILD_DECISIONS,
+        overview_decisions=DECISIONS,
+        allocation=ALLOCATION_EVIDENCE,
+        # cards per row, heading markup, space under the "Case Studies" title
+        highlights=dict(per_row=2, heading="### {}", title_margin=30, cards=CARDS_GRID),
+    ),
+    "2": dict(
+        pdfs=dict(_PDFS),
+        case_card_css=False,
+        overview_build=BUILD_DECISIONS,
+        overview_decisions=DECISIONS,
+        allocation=ALLOCATION_EVIDENCE,
+        highlights=dict(per_row=3, heading="**{}**", title_margin=10, cards=CARDS_ROW),
+    ),
+    "3": dict(
+        pdfs={**_PDFS, **_GLOBAL_EVAL},
+        case_card_css=True,
+        overview_build=BUILD_REGIMES,
+        overview_decisions=None,
+        allocation=ALLOCATION_EDGE,
+        highlights=dict(per_row=2, heading="### {}", title_margin=30, cards=CARDS_GRID),
+    ),
+}
+
+
+def get(name: str | None) -> dict:
+    """Spec for ``name`` (falls back to ``DEFAULT``); a copy, safe to modify."""
+    return copy.deepcopy(VARIANTS.get(str(name), VARIANTS[DEFAULT]))
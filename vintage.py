@@ -0,0 +1,208 @@
+"""Point-in-time (vintage-aware) indicator store.
+
+Leading indicators are revised after they are first published. A backtest that
+reads the final vintage sees numbers nobody had on the day. This store keeps
+every release:
+
+    vintages.json        indicator dictionary, row count and current generation
+    ind.<gen>.i4         int32 indicator code    } one row per (indicator,
+    obs.<gen>.i4         int32 observation day   }  observation, release),
+    rel.<gen>.i4         int32 release day       }  sorted in that order
+    val.<gen>.f8         float64 value           }
+
+An append merges the new releases into the sorted arrays, writes the next
+generation and then swaps ``vintages.json`` (the commit marker). Readers
+keep mapping the generation they opened until they ``refresh``; the one
+before the current generation is kept on disk, older ones are removed.
+
+To answer "what was known on day D", a second ordering is built on refresh:
+every indicator's rows by release day, each tagged with the best row known so
+far (a running max of (observation, release), so a late revision of an old
+month never displaces a newer month). ``panel`` then answers a (days x
+indicators) grid with one ``np.searchsorted`` over (indicator, release) keys.
+"""
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from datastore import DAY_DTYPE, VALUE_DTYPE, atomic_write_text, fcntl, to_day
+from paths import VINTAGES
+
+_COLS = {"ind": DAY_DTYPE, "obs": DAY_DTYPE, "rel": DAY_DTYPE, "val": VALUE_DTYPE}
+_EXT = {"ind": "i4", "obs": "i4", "rel": "i4", "val": "f8"}
+
+
+def _days(values) -> np.ndarray:
+    return pd.DatetimeIndex(pd.to_datetime(values)).to_numpy("datetime64[D]").astype(np.int64).astype(DAY_DTYPE)
+
+
+class VintageStore:
+    """Every release of every indicator, for as-of queries."""
+
+    def __init__(self, root: Path | str = VINTAGES):
+        self.root = Path(root)
+        self._names: list[str] = []
+        self._codes: dict[str, int] = {}
+        self._cols = {k: np.empty(0, t) for k, t in _COLS.items()}
+        self._stamp = None
+        self._by_release = None
+        self.refresh()
+
+    # ── reading ──────────────────────────────────────────────
+    def refresh(self):
+        """Pick up releases committed by a writer since the last call."""
+        meta_path = self.root / "vintages.json"
+        stamp = (meta_path.stat().st_size, meta_path.stat().st_mtime_ns) if meta_path.exists() else None
+        if stamp == self._stamp:
+            return
+        if stamp is not None:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            self._names = meta["indicators"]
+            self._codes = {n: i for i, n in enumerate(self._names)}
+            n, gen = meta["rows"], meta["generation"]
+            self._cols = {
+                k: np.memmap(self.root / f"{k}.{gen}.{_EXT[k]}", dtype=t, mode="r", shape=(n,)) if n else np.empty(0, t)
+                for k, t in _COLS.items()
+            }
+        self._by_release = None
+        self._stamp = stamp
+
+    def __len__(self) -> int:
+        return len(self._cols["ind"])
+
+    @property
+    def indicators(self) -> list[str]:
+        return list(self._names)
+
+    @property
+    def version(self) -> tuple:
+        return self._stamp
+
+    def records(self, indicator: str | None = None) -> pd.DataFrame:
+        """Stored rows (one indicator, or all) as a long table."""
+        c = self._cols
+        sl = self._segment(indicator) if indicator is not None else slice(0, len(self))
+        return pd.DataFrame({
+            "indicator": np.asarray(self._names, dtype=object)[c["ind"][sl]] if len(self) else [],
+            "obs": c["obs"][sl].astype("datetime64[D]"),
+            "release": c["rel"][sl].astype("datetime64[D]"),
+            "value": c["val"][sl],
+        })
+
+    def _segment(self, indicator: str) -> slice:
+        code = self._codes[indicator]
+        ind = self._cols["ind"]
+        return slice(int(np.searchsorted(ind, code, "left")), int(np.searchsorted(ind, code, "right")))
+
+    def vintage(self, indicator: str, asof) -> pd.Series:
+        """The whole series as it was known on ``asof``: latest release <= asof of each observation."""
+        sl = self._segment(indicator)
+        obs, rel, val = (self._cols[k][sl] for k in ("obs", "rel", "val"))
+        known = rel <= to_day(asof)
+        obs, val = obs[known], val[known]
+        last = np.r_[obs[1:] != obs[:-1], True] if len(obs) else np.empty(0, bool)   # rows sorted by (obs, rel)
+        return pd.Series(val[last], index=pd.DatetimeIndex(obs[last].astype("datetime64[D]")), name=indicator)
+
+    def _release_order(self) -> dict[str, np.ndarray]:
+        """(indicator, release)-sorted keys and, per row, the best row known by then."""
+        if self._by_release is None:
+            c = self._cols
+            ind = c["ind"].astype(np.int64)
+            order = np.lexsort((c["obs"], c["rel"], ind))
+            ind, obs, rel = ind[order], c["obs"][order].astype(np.int64), c["rel"][order].astype(np.int64)
+            # running max of (indicator, obs, rel) within each indicator; the indicator
+            # is the leading key, so the running max never crosses into the next one
+            rank = (ind << 42) | ((obs + (1 << 20)) << 21) | (rel + (1 << 20))
+            best = np.maximum.accumulate(np.where(rank >= np.maximum.accumulate(rank), np.arange(len(rank)), -1))
+            self._by_release = {"key": (ind << 32) | (rel + (1 << 31)), "row": order[best] if len(best) else best}
+        return self._by_release
+
+    def panel(self, days, indicators=None, what: str = "value") -> pd.DataFrame:
+        """(days x indicators): the latest observation known on each day.
+
+        ``what`` picks ``value``, ``obs`` (its observation date) or ``release`` (when
+        that value was published). Indicators with nothing released yet are NaN / NaT.
+        """
+        days = pd.DatetimeIndex(pd.to_datetime(days))
+        names = self.indicators if indicators is None else list(indicators)
+        idx = self._release_order()
+        codes = np.array([self._codes.get(n, -1) for n in names], np.int64)
+        d = _days(days).astype(np.int64)
+        # indicator-major queries arrive in key order, so the search walks memory forwards
+        q = ((codes[:, None] << 32) | (d[None, :] + (1 << 31))).ravel()
+        pos = np.searchsorted(idx["key"], q, "right") - 1
+        hit = pos >= 0
+        hit[hit] = (idx["key"][pos[hit]] >> 32) == (q[hit] >> 32)
+        hit &= np.repeat(codes >= 0, len(d))
+        row = idx["row"][np.where(hit, pos, 0)] if len(self) else np.zeros(len(q), np.int64)
+        if what == "value":
+            out = np.where(hit, self._cols["val"][row] if len(self) else np.nan, np.nan)
+        else:
+            col = {"obs": "obs", "release": "rel"}[what]
+            raw = self._cols[col][row].astype("datetime64[D]") if len(self) else np.zeros(len(q), "datetime64[D]")
+            out = np.where(hit, raw, np.datetime64("NaT"))
+        return pd.DataFrame(out.reshape(len(names), len(days)).T, index=days, columns=names)
+
+    # ── writing ──────────────────────────────────────────────
+    @contextmanager
+    def _locked(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / ".lock", "a+") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                self._stamp = None
+                self.refresh()
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def append(self, records: pd.DataFrame):
+        """Add releases: a frame with ``indicator, obs, release, value`` columns.
+
+        A row for an existing (indicator, obs, release) replaces the stored value.
+        """
+        if not len(records):
+            return
+        with self._locked():
+            names = list(self._names)
+            codes = dict(self._codes)
+            for n in pd.unique(records["indicator"]):
+                if n not in codes:
+                    codes[n] = len(names)
+                    names.append(n)
+            new = {
+                "ind": records["indicator"].map(codes).to_numpy(DAY_DTYPE),
+                "obs": _days(records["obs"]),
+                "rel": _days(records["release"]),
+                "val": records["value"].to_numpy(VALUE_DTYPE),
+            }
+            if (new["rel"] < new["obs"]).any():
+                raise ValueError("a value can't be released before its observation date")
+            cols = {k: np.concatenate([np.asarray(self._cols[k]), new[k]]) for k in _COLS}
+            # stable sort: among duplicates the appended row comes last and is kept
+            order = np.lexsort((cols["rel"], cols["obs"], cols["ind"]))
+            cols = {k: v[order] for k, v in cols.items()}
+            keep = np.r_[(np.diff(cols["ind"]) != 0) | (np.diff(cols["obs"]) != 0) | (np.diff(cols["rel"]) != 0), True]
+            cols = {k: v[keep] for k, v in cols.items()}
+
+            old = json.loads((self.root / "vintages.json").read_text(encoding="utf-8")) if self._stamp else None
+            gen = old["generation"] + 1 if old else 0
+            for k, v in cols.items():
+                path = self.root / f"{k}.{gen}.{_EXT[k]}"
+                with open(path, "wb") as f:
+                    f.write(v.tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+            atomic_write_text(self.root / "vintages.json",
+                              json.dumps({"indicators": names, "rows": len(cols["ind"]), "generation": gen}))
+            if old:   # keep the previous generation for readers that just read the old marker
+                for k in _COLS:
+                    (self.root / f"{k}.{old['generation'] - 1}.{_EXT[k]}").unlink(missing_ok=True)
+            self._stamp = None
+            self.refresh()
@@ -0,0 +1,78 @@
+"""Warm the shared caches in the background at server start.
+
+``start`` is called from the app script on every run but launches its worker
+thread only once per process. The thread builds the search index and the quad
+treemap figures, loads the PDFs into the shared download buffers, and pre-runs
+the chart HTML rewrites and image encoding with the same arguments the pages
+use, so the first visitor after a deploy hits warm caches. The script never
+waits on it: a page that needs an item before the thread gets there computes
+it itself (the per-key cache lock makes the thread reuse that result rather
+than doing the work twice).
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+
+import embeds
+import metrics
+import quads
+import search
+from downloads import shared_bytes, static_manifest
+from paths import resolve
+
+
+@dataclass
+class Warmup:
+    ready: threading.Event = field(default_factory=threading.Event)
+    done: list = field(default_factory=list)      # (item, seconds)
+    errors: list = field(default_factory=list)    # (item, message)
+    seconds: float | None = None
+
+
+_state: Warmup | None = None
+_lock = threading.Lock()
+
+
+def _jobs(pdfs, tight, images, height):
+    yield "static manifest", static_manifest
+    yield "search index", search.get_index
+    yield "quad treemaps", quads.warm
+    # biggest first: they are the ones a cold visitor would notice
+    for p in sorted(tight, key=lambda p: -resolve(p).stat().st_size if resolve(p).exists() else 0):
+        yield f"html:{resolve(p).name}", lambda p=p: embeds.tight_html(p, height)
+    for p in images:
+        yield f"img:{resolve(p).name}", lambda p=p: embeds.image_b64(p)
+    for p in pdfs:
+        def load(p=resolve(p)):
+            shared_bytes(str(p), p.stat().st_mtime_ns)
+        yield f"pdf:{resolve(p).name}", load
+
+
+def _run(state: Warmup, jobs):
+    t0 = time.perf_counter()
+    for name, job in jobs:
+        t = time.perf_counter()
+        try:
+            with metrics.section(f"warmup:{name}"):
+                job()
+        except Exception as e:  # a missing asset must not stop the rest
+            state.errors.append((name, f"{type(e).__name__}: {e}"))
+            continue
+        state.done.append((name, time.perf_counter() - t))
+    state.seconds = time.perf_counter() - t0
+    state.ready.set()
+
+
+def start(pdfs=(), tight=(), images=(), height: int = 520) -> Warmup:
+    """Start the warm-up thread if it isn't running yet; returns its state."""
+    global _state
+    with _lock:
+        if _state is None:
+            _state = Warmup()
+            jobs = list(_jobs(list(pdfs), list(tight), list(images), height))
+            threading.Thread(target=_run, args=(_state, jobs), name="cache-warmup", daemon=True).start()
+    return _state
+
+
+def is_ready() -> bool:
+    return _state is not None and _state.ready.is_set()